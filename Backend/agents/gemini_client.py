@@ -1,11 +1,18 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
 import google.generativeai as genai
+from langchain_core.messages import BaseMessage
 from ..core.config import get_settings
 
 settings = get_settings()
 
+@lru_cache()
 def configure_genai():
     genai.configure(api_key=settings.GOOGLE_API_KEY)
 
+# Models are reused across calls so the client transport stays warm
+@lru_cache(maxsize=32)
 def get_gemini_model(model_name: str = "gemini-1.5-flash", system_instruction: str = None):
     configure_genai()
     generation_config = {
@@ -24,3 +31,45 @@ async def generate_response(prompt: str, system_instruction: str = None):
     model = get_gemini_model(system_instruction=system_instruction)
     response = await model.generate_content_async(prompt)
     return response.text
+
+class ChatSessions:
+    """Per-session Gemini chat handles, so a turn only adds its new message.
+
+    The conversation is kept in the ChatSession's history instead of being
+    re-rendered into one prompt string every turn. Bounded LRU over active
+    sessions; an evicted (or out-of-sync) session is rebuilt from the graph's
+    message list on its next turn.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._chats: "OrderedDict[str, Tuple[Optional[str], genai.ChatSession]]" = OrderedDict()
+
+    def _chat(self, session_id: str, system_instruction: Optional[str], history: List[BaseMessage]) -> genai.ChatSession:
+        entry = self._chats.get(session_id)
+        # A failed send leaves the handle's history behind the graph's messages; rebuild then
+        if entry and entry[0] == system_instruction and len(entry[1].history) == len(history):
+            self._chats.move_to_end(session_id)
+            return entry[1]
+
+        model = get_gemini_model(system_instruction=system_instruction)
+        chat = model.start_chat(history=[_content(m) for m in history])
+        self._chats[session_id] = (system_instruction, chat)
+        self._chats.move_to_end(session_id)
+        while len(self._chats) > self.maxsize:
+            self._chats.popitem(last=False)
+        return chat
+
+    async def send(self, session_id: str, messages: List[BaseMessage], system_instruction: str = None) -> str:
+        """Sends the last of `messages`; the ones before it are the session's history."""
+        chat = self._chat(session_id, system_instruction, messages[:-1])
+        response = await chat.send_message_async(messages[-1].content)
+        return response.text
+
+    def discard(self, session_id: str):
+        self._chats.pop(session_id, None)
+
+def _content(message: BaseMessage) -> dict:
+    return {"role": "model" if message.type == "ai" else "user", "parts": [message.content]}
+
+chat_sessions = ChatSessions(settings.CHAT_SESSION_CACHE_SIZE)
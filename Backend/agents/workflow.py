@@ -2,10 +2,11 @@ from typing import TypedDict, List, Annotated
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 import operator
-from .gemini_client import generate_response
+from .gemini_client import chat_sessions
 
 class InterviewState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
+    session_id: str # Keys the cached chat handle
     candidate_id: int
     current_stage: str # "introduction", "technical", "behavioral", "conclusion"
     question_count: int
@@ -25,12 +26,8 @@ async def interviewer_node(state: InterviewState):
     If 'conclusion', thank them and wrap up.
     """
     
-    # Construct prompt from history
-    # For Gemini, we might need to format history carefully, but simple concatenation works for now
-    conversation = "\n".join([f"{m.type}: {m.content}" for m in messages])
-    prompt = f"{conversation}\nInterviewer:"
-    
-    response_text = await generate_response(prompt, system_instruction=system_prompt)
+    # Only the new answer is added; earlier turns are already in the session's chat history
+    response_text = await chat_sessions.send(state["session_id"], messages, system_instruction=system_prompt)
     
     return {"messages": [AIMessage(content=response_text)], "question_count": state.get("question_count", 0) + 1}
 
@@ -21,6 +21,7 @@ async def chat_endpoint(request: ChatRequest):
     if session_id not in session_store:
         session_store[session_id] = {
             "messages": [],
+            "session_id": session_id,
             "candidate_id": 1, # Mock
             "current_stage": "introduction",
             "question_count": 0
@@ -1,14 +1,16 @@
+import json
+from functools import lru_cache
 from typing import TypedDict, List, Dict, Any, Optional
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 
+from app.agents.turn_log import Turn, TurnLog
+from app.core.usage import SessionUsage, over_budget
 from app.services.gemini_service import gemini_service
-from app.core.logging_config import logger
+from app.core.logging_config import logger, turn_logger
 
 class InterviewState(TypedDict):
-    # Chat history
-    messages: List[BaseMessage]
-    history: List[str]
+    # Conversation: answered turns, plus the answer awaiting analysis
+    turns: TurnLog
+    pending_answer: Optional[str]
     
     # State tracking
     current_question: Optional[str]
@@ -26,16 +28,15 @@ class InterviewState(TypedDict):
     resume_text: Optional[str] # New field
     
     # Results
-    analysis_data: List[Dict[str, Any]]
     final_report: Optional[str]
+    report_error: Optional[str] # Why generating the final report failed
+    usage: SessionUsage # Tokens, audio and spend so far
 
 # --- Nodes ---
 
-async def generate_question_node(state: InterviewState):
-    """Node: Generates the next question or ends interview."""
-    logger.info(f"Generating question {state['current_question_num'] + 1}/{state['total_questions']}")
-    
-    question = await gemini_service.generate_question(
+def question_request(state: InterviewState) -> Dict[str, Any]:
+    """Arguments for gemini_service.generate_question / stream_question."""
+    return dict(
         target_company=state["target_company"],
         interview_style=state["interview_style"],
         job_role=state["job_role"],
@@ -43,28 +44,32 @@ async def generate_question_node(state: InterviewState):
         topic=state["topic"],
         question_num=state["current_question_num"] + 1,
         total_questions=state["total_questions"],
-        history=state["history"],
+        history=state["turns"].history(),
         resume_text=state.get("resume_text")
     )
-    
+
+def record_question(state: InterviewState, question: str) -> InterviewState:
     # Update state
     state["current_question"] = question
     state["current_question_num"] += 1
     
-    # Add to message history (as AI)
-    state["messages"].append(AIMessage(content=question))
-    
     # Reset follow-up count for new question
     state["follow_up_count"] = 0
     
     return state
 
+async def generate_question_node(state: InterviewState):
+    """Node: Generates the next question or ends interview."""
+    turn_logger.info(f"Generating question {state['current_question_num'] + 1}/{state['total_questions']}")
+    
+    question = await gemini_service.generate_question(**question_request(state))
+    return record_question(state, question)
+
 async def generate_follow_up_node(state: InterviewState):
     """Node: Generates a follow-up question."""
-    logger.info("Generating Follow-up Question...")
+    turn_logger.info("Generating Follow-up Question...")
     
-    last_user_msg = state["messages"][-1]
-    last_answer = last_user_msg.content if isinstance(last_user_msg, HumanMessage) else ""
+    last_answer = state["turns"][-1].answer if state["turns"] else ""
     
     question = await gemini_service.generate_followup_question(
         target_company=state["target_company"],
@@ -77,22 +82,17 @@ async def generate_follow_up_node(state: InterviewState):
     # Do NOT increment current_question_num, as it's the same topic
     state["follow_up_count"] += 1
     
-    # Add to message history
-    state["messages"].append(AIMessage(content=question))
-    
     return state
 
 async def analyze_answer_node(state: InterviewState):
     """Node: Analyzes the user's latest response."""
-    last_message = state["messages"][-1]
+    user_answer = state.get("pending_answer")
     
-    if not isinstance(last_message, HumanMessage):
+    if not user_answer:
         # Should not happen in normal flow
         return state
-        
-    user_answer = last_message.content
     
-    logger.info("Analyzing user answer...")
+    turn_logger.info("Analyzing user answer...")
     analysis = await gemini_service.analyze_response(
         question=state["current_question"],
         answer=user_answer,
@@ -100,27 +100,21 @@ async def analyze_answer_node(state: InterviewState):
         difficulty=state["difficulty"]
     )
     
-    # Append analysis to list
-    if "analysis_data" not in state:
-        state["analysis_data"] = []
-    
-    # Store complete analysis object
-    analysis_record = {
-        "question": state["current_question"],
-        "answer": user_answer,
-        "analysis": analysis,
-        "question_num": state["current_question_num"]
-    }
-    state["analysis_data"].append(analysis_record)
-    
-    # Add context to history for the next question generator
-    # We include a brief summary so the AI knows how the user did, but not the full JSON
-    feedback_short = f"Question: {state['current_question']}\nAnswer: {user_answer}\nFeedback: {analysis.get('feedback', '')}"
-    state["history"].append(feedback_short)
+    # Single record per turn; prompt history and report input are derived from it
+    state["turns"].append(Turn(
+        question=state["current_question"],
+        answer=user_answer,
+        analysis=analysis,
+        question_num=state["current_question_num"]
+    ))
+    state["pending_answer"] = None
     
     # Adaptive Difficulty Logic
     # If strongly positive, increase difficulty. If negative, decrease.
     # Simple implementation for now.
+    if analysis.get("error"):
+        # Placeholder scores from a failed analysis say nothing about the candidate
+        return state
     score = analysis.get("sentiment_score", 0)
     current_diff = state["difficulty"]
     
@@ -140,7 +134,7 @@ async def generate_report_node(state: InterviewState):
     logger.info("Generating Final Report...")
     
     # Prepare data for the prompt
-    interview_data_str = json.dumps(state["analysis_data"], indent=2)
+    interview_data_str = json.dumps(state["turns"].records(), indent=2)
     
     report = await gemini_service.generate_final_report(
         target_company=state["target_company"],
@@ -151,15 +145,13 @@ async def generate_report_node(state: InterviewState):
     state["final_report"] = report
     return state
 
-import json
-
 # --- Routing ---
 
 def route_interview(state: InterviewState):
     """Decides whether to continue questioning, follow-up, or end."""
     
     # 1. Check if we should ask a follow-up
-    if state.get("follow_up_count", 0) < state.get("max_follow_ups", 0):
+    if state.get("follow_up_count", 0) < state.get("max_follow_ups", 0) and not over_budget("follow_up"):
         return "generate_follow_up"
 
     if state["current_question_num"] >= state["total_questions"]:
@@ -168,50 +160,71 @@ def route_interview(state: InterviewState):
 
 # --- Graph Definition ---
 
-workflow = StateGraph(InterviewState)
-
-workflow.add_node("generate_question", generate_question_node)
-workflow.add_node("generate_follow_up", generate_follow_up_node)
-workflow.add_node("analyze_answer", analyze_answer_node)
-workflow.add_node("generate_report", generate_report_node)
-
-# Entry point
-workflow.set_entry_point("generate_question")
-
-# Transition from Question extraction -> Wait for user input
-# NOTE: In a real API, we would pause here. 
-# For this graph, we assume the HumanMessage is injected into state 
-# externally before resuming. 
-# BUT `StateGraph` in basic form runs until END or interrupt.
-# Since we are building an API, we will likely run one step at a time or use `interrupt`.
-# For MVP simplicity: 
-# The "cycle" is: Generate Question -> END (Return to user) -> (User calls API) -> Analyze Answer -> Route
-
-# However, to visualize the logic:
-# generate_question -> END (user sees question)
-# ... User inputs answer ...
-# (Resume with answer) -> analyze_answer -> route -> generate_question/report
-
-# We will define the edge from analyze to route
-workflow.add_conditional_edges(
-    "analyze_answer",
-    route_interview,
-    {
-        "generate_question": "generate_question",
-        "generate_follow_up": "generate_follow_up",
-        "generate_report": "generate_report"
-    }
-)
-
-workflow.add_edge("generate_report", END)
-
-# We define the edge that "ends" a turn to wait for user input.
-# In LangGraph terms, `generate_question` finishes, and we return state to the caller.
-# The caller (FastAPI) will persist state.
-# When user replies, we invoke `analyze_answer` directly?
-# OR we define the full loop and use `interrupt_before`.
-
-# Let's use the explicit loop for clarity and compilation,
-# but at runtime we might use it differently.
-# Ideally: generate_question -> END.
-# Then user submits answer -> analyze_answer -> check condition.
+def build_workflow():
+    """Builds the (uncompiled) interview graph.
+
+    langgraph is imported here rather than at module load: it is the slowest
+    import in the app and only needed once the graph is first compiled.
+    """
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(InterviewState)
+
+    workflow.add_node("generate_question", generate_question_node)
+    workflow.add_node("generate_follow_up", generate_follow_up_node)
+    workflow.add_node("analyze_answer", analyze_answer_node)
+    workflow.add_node("generate_report", generate_report_node)
+
+    # Entry point
+    workflow.set_entry_point("generate_question")
+
+    # Transition from Question extraction -> Wait for user input
+    # NOTE: In a real API, we would pause here. 
+    # For this graph, we assume the HumanMessage is injected into state 
+    # externally before resuming. 
+    # BUT `StateGraph` in basic form runs until END or interrupt.
+    # Since we are building an API, we will likely run one step at a time or use `interrupt`.
+    # For MVP simplicity: 
+    # The "cycle" is: Generate Question -> END (Return to user) -> (User calls API) -> Analyze Answer -> Route
+
+    # However, to visualize the logic:
+    # generate_question -> END (user sees question)
+    # ... User inputs answer ...
+    # (Resume with answer) -> analyze_answer -> route -> generate_question/report
+
+    # We will define the edge from analyze to route
+    workflow.add_conditional_edges(
+        "analyze_answer",
+        route_interview,
+        {
+            "generate_question": "generate_question",
+            "generate_follow_up": "generate_follow_up",
+            "generate_report": "generate_report"
+        }
+    )
+
+    workflow.add_edge("generate_report", END)
+
+    # We define the edge that "ends" a turn to wait for user input.
+    # In LangGraph terms, `generate_question` finishes, and we return state to the caller.
+    # The caller (FastAPI) will persist state.
+    # When user replies, we invoke `analyze_answer` directly?
+    # OR we define the full loop and use `interrupt_before`.
+
+    # Let's use the explicit loop for clarity and compilation,
+    # but at runtime we might use it differently.
+    # Ideally: generate_question -> END.
+    # Then user submits answer -> analyze_answer -> check condition.
+
+    return workflow
+
+@lru_cache(maxsize=None)
+def get_interview_app():
+    """The compiled graph, built once per process (on first use or during warm-up)."""
+    return build_workflow().compile()
+
+def __getattr__(name: str):
+    # Backwards compatible `from app.agents.interview_graph import workflow`
+    if name == "workflow":
+        return build_workflow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,57 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+class Turn:
+    """One answered question. Slotted: sessions hold many of these for their whole lifetime."""
+    __slots__ = ("question", "answer", "analysis", "question_num")
+
+    def __init__(self, question: Optional[str], answer: str, analysis: Dict[str, Any], question_num: int):
+        self.question = question
+        self.answer = answer
+        self.analysis = analysis
+        self.question_num = question_num
+
+    def as_record(self) -> Dict[str, Any]:
+        return {
+            "question": self.question,
+            "answer": self.answer,
+            "analysis": self.analysis,
+            "question_num": self.question_num
+        }
+
+class TurnLog:
+    """Append-only log of answered turns.
+
+    The single copy of the conversation in a session. The prompt history and the
+    report input are derived from it on demand instead of being stored alongside.
+    """
+    __slots__ = ("_turns",)
+
+    def __init__(self, turns: Optional[List[Turn]] = None):
+        self._turns: List[Turn] = turns or []
+
+    def append(self, turn: Turn):
+        self._turns.append(turn)
+
+    def copy(self) -> "TurnLog":
+        """A log with the same turns that can be appended to independently."""
+        return TurnLog(list(self._turns))
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __iter__(self) -> Iterator[Turn]:
+        return iter(self._turns)
+
+    def __getitem__(self, index: int) -> Turn:
+        return self._turns[index]
+
+    def history(self) -> List[str]:
+        """Short per-turn summaries for the question generator (no full analysis JSON)."""
+        return [
+            f"Question: {t.question}\nAnswer: {t.answer}\nFeedback: {t.analysis.get('feedback', '')}"
+            for t in self._turns
+        ]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Full per-turn records for the final report."""
+        return [t.as_record() for t in self._turns]
@@ -1,11 +1,36 @@
 import shutil
 import os
+import hashlib
+import math
+import re
+import json
+import asyncio
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Optional, Union
 from uuid import uuid4
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import ValidationError
 from app.schemas import InterviewStartRequest, InterviewStartResponse, ChatResponse
-from app.agents.interview_graph import workflow
+from app.agents.interview_graph import (
+    get_interview_app, analyze_answer_node, route_interview, generate_question_node, generate_report_node,
+    question_request, record_question
+)
+from app.agents.turn_log import TurnLog
+from app.services.gemini_service import gemini_service
+from app.services.report_pdf import iter_chunks, report_digest, report_pdf_exporter
+from app.services.resume_service import resume_service
+from app.services.streaming_stt import StreamingTranscription
 from app.services.voice_service import voice_service
-from app.core.logging_config import logger
+from app.services.tts_stream import tts_streams
+from app.services.video_jobs import JobQueueFull, video_jobs
+from app.core.admission import AdmissionRejected, admission
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, deadline_scope, without_deadline
+from app.core.http_cache import NO_STORE, REVALIDATE, etag_for, etag_matches, immutable, not_modified
+from app.core.idempotency import TurnRecording, session_turns
+from app.core.logging_config import candidate, logger, turn_logger
+from app.core.usage import SessionUsage, over_budget, usage_scope
 
 router = APIRouter()
 
@@ -13,15 +38,29 @@ router = APIRouter()
 # In production, use Redis or the SQL database to persist LangGraph state
 SESSION_STORE = {}
 
+# Final reports being generated after the last answer (see GET /report); an entry
+# is removed once its report (or report_error) is in the session state
+REPORT_TASKS: Dict[str, asyncio.Task] = {}
+
 @router.post("/start", response_model=InterviewStartResponse)
 async def start_interview(request: InterviewStartRequest):
-    session_id = str(uuid4())
+    session_id = await open_session(request)
+    return InterviewStartResponse(
+        session_id=session_id,
+        message="Interview initialized.",
+        first_question=SESSION_STORE[session_id]["current_question"]
+    )
+
+async def open_session(request: InterviewStartRequest, session_id: Optional[str] = None) -> str:
+    """Admits a new interview, generates Q1 and stores the session; returns its ID."""
+    session_id = session_id or str(uuid4())
     logger.info(f"Starting session {session_id} for {request.target_company}")
+    await admit(session_id)
     
     # Initialize State
     initial_state = {
-        "messages": [],
-        "history": [],
+        "turns": TurnLog(),
+        "pending_answer": None,
         "current_question": None,
         "current_question_num": 0,
         "total_questions": 5, # Default to 5 questions
@@ -30,23 +69,22 @@ async def start_interview(request: InterviewStartRequest):
         "job_role": request.job_role,
         "difficulty": request.difficulty,
         "topic": request.topic or "General",
-        "analysis_data": []
+        "usage": SessionUsage()
     }
     
-    # Compile graph
-    app = workflow.compile()
-    
     # Run first step to get Q1
-    result = await app.ainvoke(initial_state)
+    try:
+        # Compiled once per process
+        app = get_interview_app()
+        with usage_scope(initial_state["usage"]):
+            result = await app.ainvoke(initial_state)
+    except Exception:
+        admission.release(session_id, reason="failed")
+        raise
     
     # Store state
     SESSION_STORE[session_id] = result
-    
-    return InterviewStartResponse(
-        session_id=session_id,
-        message="Interview initialized.",
-        first_question=result["current_question"]
-    )
+    return session_id
 
 @router.post("/start_with_resume", response_model=InterviewStartResponse)
 async def start_interview_with_resume(
@@ -59,17 +97,18 @@ async def start_interview_with_resume(
     session_id = str(uuid4())
     logger.info(f"Starting Resume Session {session_id} for {target_company}")
     logger.info(f"Received file: {resume_file.filename}, Size: unknown bytes")
+    await admit(session_id)
     
+    usage = SessionUsage()
     try:
         # 1. Parsing Resume
-        from app.services.resume_service import resume_service
         resume_text = await resume_service.extract_text(resume_file)
-        logger.info(f"Resume text extracted (First 50 chars): {resume_text[:50]}...")
+        logger.info(f"Resume text extracted: {candidate(resume_text)}")
         
         # 2. Init State
         initial_state = {
-            "messages": [],
-            "history": [],
+            "turns": TurnLog(),
+            "pending_answer": None,
             "current_question": None,
             "current_question_num": 0,
             "total_questions": 5, 
@@ -79,12 +118,13 @@ async def start_interview_with_resume(
             "difficulty": difficulty,
             "topic": "Resume Review", # Override topic
             "resume_text": resume_text,
-            "analysis_data": []
+            "usage": usage
         }
         
-        # 3. Compile & Run
-        app = workflow.compile()
-        result = await app.ainvoke(initial_state)
+        # 3. Run
+        app = get_interview_app()
+        with usage_scope(usage):
+            result = await app.ainvoke(initial_state)
         
         SESSION_STORE[session_id] = result
         
@@ -95,121 +135,696 @@ async def start_interview_with_resume(
         )
     except Exception as e:
         logger.error(f"Error in start_with_resume: {str(e)}")
+        admission.release(session_id, reason="failed")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
+async def admit(session_id: str):
+    """Reserves an interview slot for a new (or released) session; 429 with Retry-After when overloaded."""
+    try:
+        await admission.acquire(session_id)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_interview(
     session_id: str = Form(...),
     text_input: str = Form(None),
-    audio_file: UploadFile = File(None)
+    audio_file: UploadFile = File(None),
+    idempotency_key: Optional[str] = Header(None)
 ):
+    """One interview turn. Resending an answer (same Idempotency-Key) returns the same response."""
     if session_id not in SESSION_STORE:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    current_state = SESSION_STORE[session_id]
-    
-    # 1. Handle Input (Text or Audio)
-    user_response_text = ""
-    
-    if audio_file:
+    recording = await start_answer(session_id, text_input, audio_file, idempotency_key)
+    return await turn_response(session_id, recording.iter_events())
+
+@router.post("/chat/stream")
+async def chat_interview_stream(
+    session_id: str = Form(...),
+    text_input: str = Form(None),
+    audio_file: UploadFile = File(None),
+    idempotency_key: Optional[str] = Header(None)
+):
+    """Same turn as /chat, sent as newline-delimited JSON events while it runs.
+
+    Events: transcript, feedback, question_delta (question text as it is
+    generated), question (full text + audio_url), then done with the
+    ChatResponse, or error. A resent answer gets the same events.
+    """
+    if session_id not in SESSION_STORE:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    recording = await start_answer(session_id, text_input, audio_file, idempotency_key, stream_text=True)
+
+    async def events():
+        try:
+            async for event in recording.iter_events():
+                if event["type"] == "done":
+                    event = {"type": "done", "response": event["response"].model_dump()}
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.error(f"Error in chat stream: {e}", exc_info=True)
+            yield json.dumps({"type": "error", "detail": f"Chat Error: {str(e)}"}) + "\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        # Keep reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def start_answer(
+    session_id: str, text_input: Optional[str], audio_file: Optional[UploadFile],
+    idempotency_key: Optional[str], stream_text: bool = False
+) -> TurnRecording:
+    """Starts the turn for an answer, or joins (or replays) it if this answer was already sent.
+
+    Without an Idempotency-Key, the key is derived from the answer and the
+    question it answers: a double-submitted answer is recognized until the
+    interview moves on to the next question.
+    """
+    audio = (await audio_file.read() or None) if audio_file else None
+    if audio is None and not text_input:
+        raise HTTPException(status_code=400, detail="No input provided")
+
+    state = SESSION_STORE[session_id]
+    key = idempotency_key or hashlib.sha256(
+        f"{state['current_question_num']}|{state['current_question']}|".encode() + (audio or text_input.encode())
+    ).hexdigest()
+
+    async def produce():
+        user_response_text = await read_answer(session_id, text_input, audio)
+        yield {"type": "transcript", "text": user_response_text}
+        async for event in turn_events(session_id, user_response_text, stream_text=stream_text):
+            yield event
+
+    return session_turns.start(session_id, key, produce)
+
+async def read_answer(session_id: str, text_input: Optional[str], audio: Optional[bytes]) -> str:
+    """The candidate's answer: the text input, or the transcript of the uploaded audio."""
+    if audio is not None:
         # Save temp file
         temp_filename = f"temp_{session_id}_{uuid4()}.wav"
         with open(temp_filename, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
+            buffer.write(audio)
             
         try:
             # Transcribe
-            user_response_text = await voice_service.transcribe_audio(temp_filename)
+            with usage_scope(SESSION_STORE[session_id].get("usage")):
+                return await voice_service.transcribe_audio(temp_filename)
         finally:
             if os.path.exists(temp_filename):
                 os.remove(temp_filename)
     elif text_input:
-        user_response_text = text_input
+        return text_input
     else:
         raise HTTPException(status_code=400, detail="No input provided")
 
-    logger.info(f"User Response: {user_response_text}")
+async def run_turn(session_id: str, user_response_text: str) -> ChatResponse:
+    """Runs one interview turn (Analyze -> Route -> Generate/Report) for a given answer."""
+    return await turn_response(session_id, turn_events(session_id, user_response_text))
 
-    # 2. Update Context with User Answer
-    from langchain_core.messages import HumanMessage
-    current_state["messages"].append(HumanMessage(content=user_response_text))
-    
+async def turn_response(session_id: str, events: AsyncIterator[Dict[str, Any]]) -> ChatResponse:
+    """The ChatResponse a turn's events end with; failures become HTTP errors."""
     try:
+        async for event in events:
+            if event["type"] == "done":
+                return event["response"]
+    except HTTPException:
+        raise
+    except DeadlineExceeded as e:
+        logger.error(f"Chat turn for {session_id} ran out of time: {e}")
+        raise HTTPException(status_code=504, detail="The interviewer took too long to respond. Please try again.")
+    except Exception as e:
+        logger.error(f"Error in chat_interview logic: {e}", exc_info=True)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Chat Error: {str(e)}")
+
+async def turn_events(
+    session_id: str, user_response_text: str, stream_text: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """One interview turn as a sequence of events, ending with {"type": "done", "response": ChatResponse}.
+
+    With `stream_text`, the next question is also yielded as question_delta
+    events while the model writes it. The final report is generated in the
+    background; clients poll GET /report/{session_id}. The whole turn shares one
+    deadline (CHAT_TURN_DEADLINE_S) that every LLM call is bounded by. Spend
+    is recorded on the session's usage; past its budget, question audio is skipped.
+    A session's turns run one at a time, each on the state the previous one left.
+    A session whose slot was released (idle or finished) is admitted again first.
+    """
+    if not admission.admitted(session_id):
+        await admit(session_id)
+    async with session_turns.lock(session_id):
+        async for event in _turn_events(session_id, user_response_text, stream_text):
+            yield event
+
+async def _turn_events(session_id: str, user_response_text: str, stream_text: bool) -> AsyncIterator[Dict[str, Any]]:
+    # The turn works on a copy; the session only moves on once the whole turn succeeded,
+    # so a failed turn can be retried on the state it started from
+    current_state = {**SESSION_STORE[session_id], "turns": SESSION_STORE[session_id]["turns"].copy()}
+    admission.touch(session_id)
+    with deadline_scope(settings.CHAT_TURN_DEADLINE_S), usage_scope(current_state.get("usage")):
+
+        turn_logger.info(f"Session {session_id} answer: {candidate(user_response_text)}")
+
+        # 2. Update Context with User Answer
+        current_state["pending_answer"] = user_response_text
+    
         # 3. Run Graph (Analyze -> Route -> Generate/Report)
-        from app.agents.interview_graph import analyze_answer_node, route_interview, generate_question_node, generate_report_node
-        
         # A. Analyze
-        logger.info("Running analyze_answer_node...")
+        turn_logger.info("Running analyze_answer_node...")
         state = await analyze_answer_node(current_state)
-        feedback_item = state["analysis_data"][-1]
-        
+        feedback_item = state["turns"][-1]
+        yield {"type": "feedback", "feedback": feedback_item.analysis}
+    
         # B. Route
         next_step = route_interview(state)
-        logger.info(f"Next step routed: {next_step}")
-        
+        turn_logger.info(f"Next step routed: {next_step}")
+    
         response_data = ChatResponse(
-            feedback=feedback_item["analysis"],
+            feedback=feedback_item.analysis,
             user_transcript=user_response_text
         )
-        
+    
         if next_step == "generate_question":
             # C. Generate Next Question
-            logger.info("Running generate_question_node...")
-            state = await generate_question_node(state)
+            turn_logger.info("Running generate_question_node...")
+            if stream_text:
+                parts = []
+                async for delta in gemini_service.stream_question(**question_request(state)):
+                    parts.append(delta)
+                    yield {"type": "question_delta", "text": delta}
+                state = record_question(state, "".join(parts))
+            else:
+                state = await generate_question_node(state)
             response_data.question = state["current_question"]
-            
-            # D. Audio for Question (TTS)
-            os.makedirs("static/audio", exist_ok=True)
-            filename = f"q_{session_id}_{state['current_question_num']}.mp3"
-            filepath = os.path.join("static/audio", filename)
-            
-            try:
-                await voice_service.generate_audio(state["current_question"], filepath)
-                response_data.audio_url = f"/static/audio/{filename}"
-            except Exception as e:
-                logger.error(f"TTS failed: {e}")
         
+            # D. Audio for Question (TTS) - synthesized in the background and streamed from /audio.
+            # No audio_url when no TTS provider could serve it (unconfigured, or all breakers open)
+            audio_id = None if over_budget("tts") else tts_streams.start(state["current_question"])
+            if audio_id:
+                response_data.audio_url = f"{settings.API_V1_STR}/audio/{audio_id}"
+            yield {"type": "question", "text": response_data.question, "audio_url": response_data.audio_url}
+    
         elif next_step == "generate_report":
-            # C. Generate Report
-            logger.info("Running generate_report_node...")
+            # C. Generate Report - in the background, polled via GET /report
             response_data.is_finished = True
-            state = await generate_report_node(state)
-            
-        # Update Store
-        SESSION_STORE[session_id] = state
+            admission.release(session_id) # The report is background work; the slot can go to a waiting candidate
+            start_report(session_id, state)
         
-        return response_data
+        # Update Store (only now: every step of the turn succeeded)
+        SESSION_STORE[session_id] = state
+    
+        yield {"type": "done", "response": response_data}
 
-    except Exception as e:
-        logger.error(f"Error in chat_interview logic: {e}", exc_info=True)
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Chat Error: {str(e)}")
+def start_report(session_id: str, state: dict):
+    async def generate():
+        # Not bound by the turn's deadline; the report route has its own latency budget
+        with without_deadline():
+            logger.info("Running generate_report_node...")
+            try:
+                await generate_report_node(state)
+            except Exception as e:
+                logger.error(f"Report generation failed for {session_id}: {e}", exc_info=True)
+                state["report_error"] = str(e)
+            finally:
+                if REPORT_TASKS.get(session_id) is asyncio.current_task():
+                    del REPORT_TASKS[session_id]
+
+    state.pop("report_error", None)
+    REPORT_TASKS[session_id] = asyncio.create_task(generate())
+
+@router.websocket("/ws/transcribe/{session_id}")
+async def transcribe_stream(websocket: WebSocket, session_id: str, sample_rate: int = None):
+    """Live transcription while the candidate speaks.
+
+    Client -> server: binary frames of 16-bit mono PCM, then {"type": "stop"}.
+    Server -> client: {"type": "partial"} while audio arrives, {"type": "final"}
+    once the candidate stops, then {"type": "turn"} with the ChatResponse.
+    """
+    await websocket.accept()
+    if session_id not in SESSION_STORE:
+        await websocket.send_json({"type": "error", "detail": "Session not found"})
+        await websocket.close(code=4404)
+        return
+
+    with usage_scope(SESSION_STORE[session_id].get("usage")):
+        stream = await voice_service.open_transcription_stream(sample_rate or settings.STREAMING_STT_SAMPLE_RATE)
+        last_partial = ""
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    await stream.abort()
+                    return
+                if message.get("bytes"):
+                    partial = await stream.feed(message["bytes"])
+                    if partial != last_partial:
+                        last_partial = partial
+                        await websocket.send_json({"type": "partial", "text": partial})
+                elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                    break
+
+            transcript = await stream.finish()
+            await websocket.send_json({"type": "final", "text": transcript})
+            if not transcript.strip():
+                await websocket.send_json({"type": "error", "detail": "No speech detected"})
+            else:
+                try:
+                    response_data = await run_turn(session_id, transcript)
+                    await websocket.send_json({"type": "turn", "data": response_data.model_dump()})
+                except HTTPException as e:
+                    await websocket.send_json({"type": "error", "detail": e.detail})
+        except WebSocketDisconnect:
+            await stream.abort()
+            return
+        except Exception as e:
+            logger.error(f"Streaming transcription failed: {e}", exc_info=True)
+            await stream.abort()
+            await websocket.send_json({"type": "error", "detail": str(e)})
+
+    await websocket.close()
+
+# Turns started over /ws/interview, by session; they outlive a dropped connection
+SOCKET_TURNS: Dict[str, asyncio.Task] = {}
+
+@router.websocket("/ws/interview")
+async def interview_socket(websocket: WebSocket):
+    """The whole interview over one persistent connection.
+
+    Client -> server (JSON): {"type": "start", ...InterviewStartRequest} or
+    {"type": "resume", "session_id"}, then per turn either {"type": "answer",
+    "text"} or {"type": "audio_start", "sample_rate"}, binary 16-bit mono PCM
+    frames and {"type": "audio_end"}.
+    Server -> client: session, partial, transcript, feedback, question_delta,
+    question, done, then the question audio as audio_start / binary MP3 frames /
+    audio_end; report_ready after the last turn; error.
+    """
+    await websocket.accept()
+    await InterviewSocket(websocket).run()
+
+def _forget_turn(session_id: str, task: asyncio.Task):
+    if SOCKET_TURNS.get(session_id) is task:
+        del SOCKET_TURNS[session_id]
+
+class _Outbox:
+    """Sends for one WebSocket, written in order by a single task.
+
+    The queue is bounded, so a slow client makes the turn wait instead of
+    buffering its events and audio without limit. Sends after a disconnect are dropped.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.closed = False
+        self._queue: asyncio.Queue = asyncio.Queue(settings.WS_SEND_QUEUE_SIZE)
+
+    async def send(self, message: Union[Dict[str, Any], bytes]):
+        if not self.closed:
+            await self._queue.put(message)
+
+    async def run(self):
+        try:
+            while True:
+                message = await self._queue.get()
+                if isinstance(message, bytes):
+                    await self.websocket.send_bytes(message)
+                else:
+                    await self.websocket.send_json(message)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self.closed = True
+        # Unblock producers waiting on a full queue
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+class InterviewSocket:
+    """Protocol state of one /ws/interview connection."""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.outbox = _Outbox(websocket)
+        self.session_id: Optional[str] = None
+        self.transcription: Optional[StreamingTranscription] = None
+        self.last_partial = ""
+        self.tasks = set()
+
+    async def run(self):
+        writer = asyncio.create_task(self.outbox.run())
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                with usage_scope(self._usage()):
+                    if message.get("bytes") is not None:
+                        await self.on_audio(message["bytes"])
+                        continue
+                    try:
+                        data = json.loads(message.get("text") or "{}")
+                    except ValueError:
+                        await self.error("Messages must be JSON", status=400)
+                        continue
+                    await self.on_message(data)
+        except WebSocketDisconnect:
+            return
+        finally:
+            if self.transcription is not None:
+                await self.transcription.abort()
+            self.outbox.close()
+            writer.cancel()
+            # Turns keep running (see SOCKET_TURNS); only this connection's sends stop
+            for task in self.tasks:
+                task.cancel()
+
+    async def on_message(self, data: Dict[str, Any]):
+        kind = data.get("type")
+        if kind in ("start", "resume"):
+            if self.session_id is not None:
+                return await self.error("This connection already has a session")
+            session_id = str(uuid4()) if kind == "start" else data.get("session_id")
+            try:
+                if kind == "start":
+                    fields = {k: v for k, v in data.items() if k != "type"}
+                    self.session_id = await open_session(InterviewStartRequest(**fields), session_id)
+                elif session_id in SESSION_STORE:
+                    self.session_id = session_id
+                    turn = SOCKET_TURNS.get(self.session_id)
+                    if turn is not None and not turn.done():
+                        await asyncio.shield(turn) # Finish the turn the dropped connection started
+                else:
+                    return await self.error("Session not found", status=404)
+            except ValidationError as e:
+                return await self.error(str(e), status=422)
+            except HTTPException as e:
+                return await self.error(e.detail, status=e.status_code)
+            except Exception as e:
+                # The connection stays usable; the client can send start or resume again
+                logger.error(f"Interview socket {kind} failed for {session_id}: {e}", exc_info=True)
+                if kind == "start":
+                    admission.release(session_id, reason="failed")
+                self.session_id = None
+                return await self.error(f"Could not {kind} the interview: {e}", status=500)
+            await self.send_session()
+        elif self.session_id is None:
+            await self.error("Send start or resume first")
+        elif kind == "answer":
+            text = (data.get("text") or "").strip()
+            if not text:
+                return await self.error("No input provided", status=400)
+            self.start_turn(text)
+        elif kind == "audio_start":
+            if self.transcription is not None:
+                await self.transcription.abort()
+            self.last_partial = ""
+            try:
+                self.transcription = await voice_service.open_transcription_stream(
+                    data.get("sample_rate") or settings.STREAMING_STT_SAMPLE_RATE
+                )
+            except Exception as e:
+                return await self.transcription_failed(e)
+        elif kind == "audio_end":
+            if self.transcription is None:
+                return await self.error("No audio_start before audio_end")
+            try:
+                transcript = (await self.transcription.finish()).strip()
+            except Exception as e:
+                return await self.transcription_failed(e)
+            self.transcription = None
+            if not transcript:
+                return await self.error("No speech detected")
+            self.start_turn(transcript)
+        else:
+            await self.error(f"Unknown message type: {kind}")
+
+    async def on_audio(self, chunk: bytes):
+        if self.transcription is None:
+            return await self.error("Send audio_start before audio frames")
+        try:
+            partial = await self.transcription.feed(chunk)
+        except Exception as e:
+            return await self.transcription_failed(e)
+        if partial != self.last_partial:
+            self.last_partial = partial
+            await self.outbox.send({"type": "partial", "text": partial})
+
+    async def transcription_failed(self, e: Exception):
+        """STT errors end the current answer's audio, not the connection; the client can resend or type."""
+        logger.error(f"Streaming transcription failed for {self.session_id}: {e}", exc_info=True)
+        transcription, self.transcription = self.transcription, None
+        if transcription is not None:
+            try:
+                await transcription.abort()
+            except Exception:
+                pass
+        await self.error(f"Transcription failed: {e}", status=502)
+
+    def start_turn(self, text: str):
+        turn = SOCKET_TURNS.get(self.session_id)
+        if turn is not None and not turn.done():
+            self.spawn(self.error("A turn is already in progress", status=409))
+            return
+        # Not tied to this connection: a disconnect mid-turn still stores the next question
+        turn = asyncio.create_task(self.turn(text))
+        SOCKET_TURNS[self.session_id] = turn
+        turn.add_done_callback(partial(_forget_turn, self.session_id))
+
+    async def turn(self, text: str):
+        await self.outbox.send({"type": "transcript", "text": text})
+        response = None
+        try:
+            async for event in turn_events(self.session_id, text, stream_text=True):
+                if event["type"] == "done":
+                    response = event["response"]
+                    event = {"type": "done", "response": response.model_dump()}
+                await self.outbox.send(event)
+        except HTTPException as e:
+            return await self.error(e.detail, status=e.status_code)
+        except DeadlineExceeded:
+            return await self.error("The interviewer took too long to respond. Please try again.", status=504)
+        except Exception as e:
+            logger.error(f"Error in interview socket turn: {e}", exc_info=True)
+            return await self.error(f"Chat Error: {str(e)}", status=500)
+
+        if response.audio_url:
+            self.spawn(self.send_audio(response.audio_url.rsplit("/", 1)[-1]))
+        if response.is_finished:
+            self.spawn(self.send_report())
+
+    async def send_session(self):
+        state = SESSION_STORE[self.session_id]
+        finished = bool(state.get("final_report") or state.get("report_error")) or self.session_id in REPORT_TASKS
+        await self.outbox.send({
+            "type": "session",
+            "session_id": self.session_id,
+            "question": state["current_question"],
+            "question_num": state["current_question_num"],
+            "total_questions": state["total_questions"],
+            "is_finished": finished
+        })
+        if finished:
+            self.spawn(self.send_report())
+        elif not over_budget("tts"):
+            audio_id = tts_streams.start(state["current_question"])
+            if audio_id:
+                self.spawn(self.send_audio(audio_id))
+
+    async def send_audio(self, audio_id: str):
+        """Streams question audio as binary frames, while it is being synthesized if need be."""
+        stream = tts_streams.get(audio_id)
+        if stream is not None:
+            await self.outbox.send({"type": "audio_start", "audio_id": audio_id, "media_type": "audio/mpeg"})
+            async for chunk in stream.iter_chunks():
+                await self.outbox.send(chunk)
+            error = stream.error
+        else:
+            try:
+                f = open(tts_streams.path_for(audio_id), "rb")
+            except FileNotFoundError:
+                # The stream was pruned and its file removed; the question text was already sent
+                return await self.error("Question audio is no longer available", status=404)
+            error = None
+            await self.outbox.send({"type": "audio_start", "audio_id": audio_id, "media_type": "audio/mpeg"})
+            with f:
+                while chunk := f.read(64 * 1024):
+                    await self.outbox.send(chunk)
+        await self.outbox.send({"type": "audio_end", "audio_id": audio_id, "error": error})
+
+    async def send_report(self):
+        state = SESSION_STORE[self.session_id]
+        task = REPORT_TASKS.get(self.session_id)
+        if not state.get("final_report") and task is not None:
+            await asyncio.shield(task)
+        if state.get("report_error"):
+            return await self.error(f"Report generation failed: {state['report_error']}", status=500)
+        await self.outbox.send({"type": "report_ready", "report": state.get("final_report")})
+
+    async def error(self, detail: str, status: Optional[int] = None):
+        await self.outbox.send({"type": "error", "detail": detail, "status": status})
+
+    def spawn(self, coro):
+        if self.outbox.closed:
+            coro.close() # Nobody left to send to
+            return
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def _usage(self) -> Optional[SessionUsage]:
+        state = SESSION_STORE.get(self.session_id) if self.session_id else None
+        return state.get("usage") if state else None
+
+@router.get("/audio/{audio_id}")
+async def get_audio(audio_id: str, request: Request):
+    """Streams question audio while it is synthesized; serves byte ranges once finished.
+
+    Audio IDs are content-addressed, so finished audio is cached as immutable.
+    """
+    if not re.fullmatch(r"[0-9a-f]{32}", audio_id):
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    range_header = request.headers.get("range")
+    stream = tts_streams.get(audio_id)
+    if stream and not stream.done:
+        if not range_header:
+            # May still fail part-way; only the finished file is cacheable
+            return StreamingResponse(stream.iter_chunks(), media_type="audio/mpeg", headers={"Cache-Control": NO_STORE})
+        # Replays/seeks need the complete file
+        await stream.wait_done()
+
+    if stream and stream.error:
+        raise HTTPException(status_code=502, detail=f"TTS failed: {stream.error}")
+
+    path = tts_streams.path_for(audio_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Audio not found")
+    etag = etag_for(audio_id, weak=False)
+    if etag_matches(request, etag):
+        return not_modified(etag, immutable(), os.path.getsize(path), route="audio")
+    return ranged_file_response(path, range_header, "audio/mpeg", headers={"ETag": etag, "Cache-Control": immutable()})
+
+def ranged_file_response(path: str, range_header: str, media_type: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serves a file honoring a single `Range: bytes=...` request."""
+    headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    size = os.path.getsize(path)
+    if not range_header:
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+    if not match or not (match[1] or match[2]):
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    if match[1]:
+        start = int(match[1])
+        end = min(int(match[2]), size - 1) if match[2] else size - 1
+    else:
+        # Suffix range: last N bytes
+        start = max(0, size - int(match[2]))
+        end = size - 1
+    if start > end:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        content = f.read(end - start + 1)
+    return Response(
+        content=content,
+        status_code=206,
+        media_type=media_type,
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"}
+    )
 
 @router.get("/report/{session_id}")
-async def get_report(session_id: str):
+async def get_report(session_id: str, request: Request, response: Response):
+    """The final report once ready. Clients revalidate with If-None-Match and get a 304 while it is unchanged."""
     if session_id not in SESSION_STORE:
         raise HTTPException(status_code=404, detail="Session not found")
         
     state = SESSION_STORE[session_id]
     if not state.get("final_report"):
+        if state.get("report_error"):
+            raise HTTPException(status_code=500, detail=f"Report generation failed: {state['report_error']}")
+        response.headers["Cache-Control"] = NO_STORE
         return {"status": "in_progress"}
         
-    return {"report": state["final_report"]}
+    report = state["final_report"]
+    etag = etag_for(report_digest(report))
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE, len(report.encode()), route="report")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
+    return {"status": "ready", "report": report}
+
+@router.get("/report/{session_id}/pdf")
+async def get_report_pdf(session_id: str, request: Request):
+    """The final report as a PDF, rendered off the event loop and cached until the report changes."""
+    if session_id not in SESSION_STORE:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    state = SESSION_STORE[session_id]
+    if not state.get("final_report"):
+        raise HTTPException(status_code=409, detail="Report is not ready yet", headers={"Retry-After": "5"})
+
+    etag = etag_for(f"pdf-{report_digest(state['final_report'])}")
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE, report_pdf_exporter.cached_size(session_id, state["final_report"]), route="report_pdf")
 
-@router.post("/analyze_video")
+    title = f"{state.get('job_role', 'Interview')} at {state.get('target_company', '')} - Interview Report"
+    try:
+        pdf = await report_pdf_exporter.export(session_id, state["final_report"], title=title)
+    except Exception as e:
+        logger.error(f"PDF export failed for {session_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"PDF export failed: {e}")
+
+    return StreamingResponse(
+        iter_chunks(pdf),
+        media_type="application/pdf",
+        headers={
+            "Content-Length": str(len(pdf)),
+            "ETag": etag,
+            "Cache-Control": REVALIDATE,
+            "Content-Disposition": f'attachment; filename="report-{session_id}.pdf"'
+        }
+    )
+
+@router.get("/sessions/{session_id}/usage")
+async def get_session_usage(session_id: str):
+    """Tokens, audio and estimated USD a session has used so far, per task."""
+    if session_id not in SESSION_STORE:
+        raise HTTPException(status_code=404, detail="Session not found")
+    usage = SESSION_STORE[session_id].get("usage") or SessionUsage()
+    return usage.as_dict()
+
+@router.post("/analyze_video", status_code=202)
 async def analyze_video(video_file: UploadFile = File(...)):
+    """Queues a video for behavior analysis; poll GET /analyze_video/{job_id} for the result."""
     temp_filename = f"temp_video_{uuid4()}.mp4"
     with open(temp_filename, "wb") as buffer:
         shutil.copyfileobj(video_file.file, buffer)
-        
+
     try:
-        from app.services.gemini_service import gemini_service
-        analysis = await gemini_service.analyze_video_behavior(temp_filename)
-        return {"analysis": analysis}
-    except Exception as e:
-        logger.error(f"Video analysis failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if os.path.exists(temp_filename):
-            os.remove(temp_filename)
+        job = video_jobs.submit(temp_filename)
+    except JobQueueFull as e:
+        os.remove(temp_filename)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return job.as_dict()
+
+@router.get("/analyze_video/{job_id}")
+async def get_video_job(job_id: str):
+    job = video_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.as_dict()
+
+@router.delete("/analyze_video/{job_id}")
+async def cancel_video_job(job_id: str):
+    job = video_jobs.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.as_dict()
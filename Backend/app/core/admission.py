@@ -0,0 +1,154 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+class AdmissionRejected(Exception):
+    """No interview slot is free and the waiting queue is full or was waited out."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Too many interviews in progress ({reason}); estimated wait {math.ceil(retry_after)}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Caps concurrently active interviews; new ones wait in a FIFO queue.
+
+    A session holds its slot from /start until its last answer, or until it has
+    been idle for ADMISSION_IDLE_TIMEOUT_S. Sessions already admitted are never
+    queued, so their turns keep the upstream capacity they were sized for; a
+    released session that answers again queues like a new interview.
+    """
+
+    def __init__(self):
+        self._active: Dict[str, Tuple[float, float]] = {} # session_id -> (admitted at, last activity)
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+        self._durations: Deque[float] = deque(maxlen=50) # Lengths of recently finished interviews
+
+    @property
+    def _limit(self) -> int:
+        return settings.ADMISSION_MAX_ACTIVE
+
+    def _has_room(self) -> bool:
+        return self._limit <= 0 or len(self._active) < self._limit
+
+    async def acquire(self, session_id: str):
+        """Admits `session_id`, waiting in line if needed. Raises AdmissionRejected."""
+        self._expire_idle()
+        if self._has_room() and not self._waiters:
+            self._admit(session_id)
+            metrics.observe("admission_wait_seconds", 0.0)
+            return
+        if len(self._waiters) >= settings.ADMISSION_QUEUE_SIZE:
+            self._reject("queue_full", len(self._waiters) + 1)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((session_id, future))
+        started = time.monotonic()
+        deadline = started + settings.ADMISSION_QUEUE_TIMEOUT_S
+        try:
+            while not future.done():
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                # Wake up when an abandoned session's slot is due to expire
+                await asyncio.wait({future}, timeout=min(left, self._next_expiry()))
+                self._expire_idle()
+        except asyncio.CancelledError:
+            if future.done():
+                self.release(session_id) # Admitted just as the client went away
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+                self._remove_waiter(future)
+
+        if future.cancelled():
+            self._reject("timeout", len(self._waiters) + 1) # A retry joins at the back
+        metrics.observe("admission_wait_seconds", time.monotonic() - started)
+
+    def touch(self, session_id: str):
+        """Marks activity on an admitted interview.
+
+        Sessions that were released (finished, or idle past the timeout) are not
+        re-added: that could exceed ADMISSION_MAX_ACTIVE. They go through
+        `acquire` again before their next turn (see api_routes.turn_events).
+        """
+        entry = self._active.get(session_id)
+        if entry is not None:
+            self._active[session_id] = (entry[0], time.monotonic())
+
+    def admitted(self, session_id: str) -> bool:
+        return session_id in self._active
+
+    def release(self, session_id: str, reason: str = "finished"):
+        """Frees the session's slot and hands it to the longest-waiting request."""
+        entry = self._active.pop(session_id, None)
+        if entry is None:
+            return
+        metrics.incr("admission_released", reason=reason)
+        if reason == "finished":
+            self._durations.append(time.monotonic() - entry[0])
+        self._wake()
+
+    def estimated_wait(self, position: int) -> float:
+        """Seconds until the `position`-th waiting request should get a slot."""
+        if self._limit <= 0:
+            return 0.0
+        average = sum(self._durations) / len(self._durations) if self._durations else settings.ADMISSION_DEFAULT_SESSION_S
+        # Slots free up at roughly limit / average-interview-length per second
+        return position * average / self._limit
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "active": len(self._active),
+            "limit": self._limit,
+            "queued": len(self._waiters),
+            "estimated_wait_s": self.estimated_wait(len(self._waiters) + 1) if not self._has_room() else 0.0,
+        }
+
+    def _admit(self, session_id: str):
+        now = time.monotonic()
+        self._active[session_id] = (now, now)
+        metrics.incr("admission_admitted")
+
+    def _wake(self):
+        while self._waiters and self._has_room():
+            session_id, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._admit(session_id)
+            future.set_result(None)
+
+    def _reject(self, reason: str, position: int):
+        retry_after = self.estimated_wait(position)
+        metrics.incr("admission_rejected", reason=reason)
+        logger.warning(f"Interview rejected ({reason}): {len(self._active)} active, {len(self._waiters)} waiting")
+        raise AdmissionRejected(reason, retry_after)
+
+    def _remove_waiter(self, future: asyncio.Future):
+        for i, (_, waiter) in enumerate(self._waiters):
+            if waiter is future:
+                del self._waiters[i]
+                return
+
+    def _next_expiry(self) -> float:
+        if not self._active:
+            return settings.ADMISSION_IDLE_TIMEOUT_S
+        oldest = min(last for _, last in self._active.values())
+        return max(0.05, oldest + settings.ADMISSION_IDLE_TIMEOUT_S - time.monotonic())
+
+    def _expire_idle(self):
+        cutoff = time.monotonic() - settings.ADMISSION_IDLE_TIMEOUT_S
+        for session_id, (_, last) in list(self._active.items()):
+            if last < cutoff:
+                logger.info(f"Session {session_id} idle; releasing its interview slot")
+                self.release(session_id, reason="idle")
+
+admission = AdmissionController()
+metrics.register_collector("admission", admission.stats)
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+class BreakerState(str, Enum):
+    CLOSED = "closed" # Normal traffic
+    OPEN = "open" # Provider considered down; calls are skipped
+    HALF_OPEN = "half_open" # Cool-down over; a single probe call decides
+
+class CircuitOpen(Exception):
+    """No provider could be tried: every candidate's breaker is open."""
+
+class CircuitBreaker:
+    """Per-provider breaker over a rolling error-rate window.
+
+    Opens when at least `min_calls` calls in the last `window_s` seconds fail
+    at `error_rate` or more. After `open_s` it lets one probe through
+    (half-open): success closes it, failure re-opens it for another `open_s`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_s: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        open_s: Optional[float] = None
+    ):
+        self.name = name
+        self.window_s = window_s or settings.BREAKER_WINDOW_S
+        self.min_calls = min_calls or settings.BREAKER_MIN_CALLS
+        self.error_rate = error_rate or settings.BREAKER_ERROR_RATE
+        self.open_s = open_s or settings.BREAKER_OPEN_S
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, bool]] = deque() # (timestamp, succeeded)
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None # Set while the half-open probe is outstanding
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> BreakerState:
+        if self._state == BreakerState.OPEN and time.monotonic() - self._opened_at >= self.open_s:
+            self._transition(BreakerState.HALF_OPEN)
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to this provider now. In half-open, admits one probe."""
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.CLOSED:
+                return True
+            # A probe that never reported back (e.g. cancelled) stops blocking after open_s
+            now = time.monotonic()
+            if state == BreakerState.HALF_OPEN and (self._probe_started is None or now - self._probe_started >= self.open_s):
+                self._probe_started = now
+                return True
+            return False
+
+    def failure_rate(self) -> float:
+        """Failed fraction of the calls in the window; 0 until there are `min_calls` to judge by."""
+        with self._lock:
+            self._trim(time.monotonic())
+            total, failures = self._counts()
+            return failures / total if total >= self.min_calls else 0.0
+
+    def record_success(self):
+        with self._lock:
+            self._add(True)
+            if self._state == BreakerState.HALF_OPEN:
+                self._probe_started = None
+                self._calls.clear()
+                self._transition(BreakerState.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._add(False)
+            if self._state == BreakerState.HALF_OPEN:
+                self._probe_started = None
+                self._open()
+            elif self._state == BreakerState.CLOSED:
+                total, failures = self._counts()
+                if total >= self.min_calls and failures / total >= self.error_rate:
+                    self._open()
+
+    def _add(self, succeeded: bool):
+        now = time.monotonic()
+        self._calls.append((now, succeeded))
+        self._trim(now)
+        metrics.incr("breaker_calls", provider=self.name, outcome="ok" if succeeded else "error")
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_s:
+            self._calls.popleft()
+
+    def _counts(self) -> Tuple[int, int]:
+        return len(self._calls), sum(1 for _, ok in self._calls if not ok)
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._transition(BreakerState.OPEN)
+
+    def _transition(self, state: BreakerState):
+        if state != self._state:
+            logger.warning(f"Circuit breaker '{self.name}': {self._state.value} -> {state.value}")
+            metrics.incr("breaker_transitions", provider=self.name, state=state.value)
+        self._state = state
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            total, failures = self._counts()
+            return {
+                "state": state.value,
+                "calls_in_window": total,
+                "error_rate": failures / total if total else 0.0,
+                "retry_in_s": max(0.0, self.open_s - (time.monotonic() - self._opened_at)) if state == BreakerState.OPEN else 0.0,
+            }
+
+class BreakerRegistry:
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name)
+            return self._breakers[name]
+
+    def ordered(self, names: List[str]) -> List[str]:
+        """Providers to try, best first; those whose breaker is open are left out.
+
+        Closed providers are ranked by rolling error rate, keeping the configured
+        order among equals. Half-open ones come last, so a request only pays for
+        a probe when nothing healthier is left (see voice_service._healthy for
+        probing them in the background). Raises CircuitOpen if every breaker is open.
+        """
+        ranked = []
+        for position, name in enumerate(names):
+            breaker = self.get(name)
+            state = breaker.state
+            if state != BreakerState.OPEN:
+                ranked.append((state == BreakerState.HALF_OPEN, breaker.failure_rate(), position, name))
+        if not ranked:
+            raise CircuitOpen(f"All providers unavailable: {', '.join(names)}")
+        return [name for *_, name in sorted(ranked)]
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.as_dict() for name, breaker in breakers.items()}
+
+breakers = BreakerRegistry()
+metrics.register_collector("circuit_breakers", breakers.states)
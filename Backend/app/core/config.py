@@ -1,7 +1,15 @@
 import os
-from typing import List, Union
+from typing import Dict, List, Optional, Tuple, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import AnyHttpUrl, field_validator
+from pydantic import AnyHttpUrl, BaseModel, field_validator
+
+class ModelRoute(BaseModel):
+    """Which OpenRouter model serves an LLM task, and its limits."""
+    primary: str
+    fallback: Optional[str] = None # Used when the primary errors or exceeds the latency budget
+    max_tokens: int = 1024
+    latency_budget_s: float = 30.0
+    temperature: float = 0.7
 
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
@@ -24,15 +32,135 @@ class Settings(BaseSettings):
     # OpenRouter
     OPENROUTER_API_KEY: str
     GOOGLE_API_KEY: str = "" # Optional fallback or for Multimodal if valid
+
+    # LLM routing per task; override with a JSON object, e.g.
+    # MODEL_ROUTES='{"report": {"primary": "anthropic/claude-sonnet-4", "max_tokens": 6000, "latency_budget_s": 120}}'
+    MODEL_ROUTES: Dict[str, ModelRoute] = {
+        "question": ModelRoute(primary="google/gemini-2.0-flash-001", fallback="openai/gpt-4o-mini", max_tokens=300, latency_budget_s=8),
+        "follow_up": ModelRoute(primary="google/gemini-2.0-flash-lite-001", fallback="google/gemini-2.0-flash-001", max_tokens=200, latency_budget_s=6),
+        "analysis": ModelRoute(primary="google/gemini-2.0-flash-001", fallback="openai/gpt-4o-mini", max_tokens=600, latency_budget_s=12, temperature=0.3),
+        "report": ModelRoute(primary="google/gemini-2.5-pro", fallback="google/gemini-2.0-flash-001", max_tokens=4000, latency_budget_s=90),
+        "video": ModelRoute(primary="google/gemini-2.0-flash-001", max_tokens=600, latency_budget_s=60),
+    }
+    # USD per million (input, output) tokens, for cost metrics
+    MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+        "google/gemini-2.0-flash-001": (0.10, 0.40),
+        "google/gemini-2.0-flash-lite-001": (0.075, 0.30),
+        "google/gemini-2.5-pro": (1.25, 10.0),
+        "openai/gpt-4o-mini": (0.15, 0.60),
+    }
+    CACHED_INPUT_PRICE_RATIO: float = 0.25 # Cached prompt tokens cost this fraction of the input price
+
+    @field_validator("MODEL_ROUTES", mode="after")
+    def merge_model_routes(cls, v: Dict[str, ModelRoute]) -> Dict[str, ModelRoute]:
+        # Overrides replace individual tasks; unspecified tasks keep their defaults
+        return {**cls.model_fields["MODEL_ROUTES"].default, **v}
     
+    # Per-session spend (GET /sessions/{id}/usage)
+    SESSION_BUDGET_USD: Optional[float] = None # Past this, TTS and follow-ups are skipped; None = unlimited
+    BUDGET_MODEL: str = "google/gemini-2.0-flash-lite-001" # Serves every LLM task once over budget
+    STT_PRICES_PER_MINUTE: Dict[str, float] = {"assemblyai": 0.0062}
+    TTS_PRICES_PER_1K_CHARS: Dict[str, float] = {"elevenlabs": 0.30} # gTTS is free
+
+    # Admission control for new interviews (/start, /start_with_resume)
+    ADMISSION_MAX_ACTIVE: int = 50 # Concurrently active interviews; 0 = unlimited
+    ADMISSION_QUEUE_SIZE: int = 100 # Waiting starts beyond this get 429 right away
+    ADMISSION_QUEUE_TIMEOUT_S: float = 20.0 # Longest a start request waits for a slot before 429
+    ADMISSION_IDLE_TIMEOUT_S: float = 900.0 # An interview idle this long gives up its slot
+    ADMISSION_DEFAULT_SESSION_S: float = 600.0 # Interview length assumed for wait estimates until measured
+
+    # /chat idempotency (Idempotency-Key header, or derived from the answer)
+    IDEMPOTENCY_REPLAY_TURNS: int = 4 # Finished turns per session kept to answer a resent request
+    IDEMPOTENCY_SESSION_RETENTION_S: float = 3600.0 # A session's turn records are dropped after this long without a turn
+
+    # Request deadlines and hedged LLM calls
+    CHAT_TURN_DEADLINE_S: float = 45.0 # Whole /chat turn: analysis + next question
+    LLM_HEDGING_ENABLED: bool = True
+    LLM_HEDGE_PERCENTILE: float = 95.0 # Hedge once a call runs past this latency percentile
+    LLM_HEDGE_MIN_SAMPLES: int = 20 # No hedging until the percentile is based on this many calls
+    LLM_HEDGE_MAX_RATE: float = 0.1 # At most this fraction of recent calls get a duplicate
+    LLM_HEDGE_TO_FALLBACK: bool = True # Send the duplicate to the route's fallback model
+
     # Voice Services
     ASSEMBLYAI_API_KEY: str = ""
     ELEVENLABS_API_KEY: str = ""
+    ELEVENLABS_VOICE_ID: str = "21m00Tcm4TlvDq8ikWAM" # "Rachel"
+    ELEVENLABS_MODEL_ID: str = "eleven_monolingual_v1"
+
+    # Voice provider circuit breakers
+    BREAKER_WINDOW_S: float = 60.0 # Rolling window the error rate is computed over
+    BREAKER_MIN_CALLS: int = 5 # Calls in the window before a breaker may open
+    BREAKER_ERROR_RATE: float = 0.5 # Failure fraction that opens the breaker
+    BREAKER_OPEN_S: float = 30.0 # Skip an open provider this long, then send one probe
+    VOICE_PROVIDER_TIMEOUT_S: float = 30.0 # A hung provider counts as failed after this
+
+    # Streaming TTS
+    TTS_PARALLEL_SEGMENTS: int = 3 # Sentence groups synthesized concurrently
+    TTS_MIN_SEGMENT_CHARS: int = 120 # Short questions stay a single request
+    TTS_STREAMS_RETAINED: int = 128 # Finished in-memory streams kept for late listeners
+
+    # Resume extraction; tried in order, next one on error or empty text
+    PDF_EXTRACTION_BACKENDS: List[str] = ["pymupdf", "pypdf", "text"]
+
+    # PDF export of final reports (GET /report/{session_id}/pdf)
+    REPORT_PDF_WORKERS: int = 2 # Process pool size, 0 = default thread pool
+    REPORT_PDF_CACHE_MAX_BYTES: int = 64 * 1024 * 1024 # Rendered PDFs kept in memory (LRU)
+
+    # HTTP compression and caching
+    COMPRESSION_MIN_BYTES: int = 1024 # Smaller JSON/text responses are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5 # Used when the brotli package is installed
+    AUDIO_CACHE_MAX_AGE_S: int = 365 * 24 * 3600 # Content-addressed audio is cached as immutable
+
+    # Audio Preprocessing (applied to answers before STT)
+    AUDIO_PREPROCESSING_ENABLED: bool = True
+    AUDIO_TARGET_SAMPLE_RATE: int = 16000
+    AUDIO_MAX_SILENCE_MS: int = 300 # Longer internal pauses are shortened to this
+    AUDIO_PREPROCESS_WORKERS: int = 2 # Process pool size, 0 = default thread pool
+
+    # Live transcription over WebSocket ("assemblyai" or "buffered")
+    STREAMING_STT_BACKEND: str = "assemblyai"
+    STREAMING_STT_SAMPLE_RATE: int = 16000 # Default PCM rate if the client doesn't send one
+    WS_SEND_QUEUE_SIZE: int = 64 # Outgoing /ws/interview messages buffered before the turn waits for the client
     
+    # Video analysis (local keyframe extraction)
+    VIDEO_ANALYSIS_PROVIDER: str = "openrouter" # "openrouter" or "gemini"
+    VIDEO_KEYFRAME_FPS: float = 0.5
+    VIDEO_KEYFRAME_MAX_WIDTH: int = 512
+    VIDEO_KEYFRAME_JPEG_QUALITY: int = 70
+    VIDEO_KEYFRAME_MAX_FRAMES: int = 24
+    VIDEO_KEYFRAME_DEDUPE_DISTANCE: int = 6 # dHash Hamming distance treated as "same frame"
+    VIDEO_PREPROCESS_WORKERS: int = 2
+
+    # Video analysis jobs
+    VIDEO_JOB_WORKERS: int = 2 # Concurrent analyses
+    VIDEO_JOB_QUEUE_SIZE: int = 50
+    VIDEO_JOB_RETENTION_S: int = 3600 # Finished jobs stay queryable this long
+    VIDEO_POLL_INITIAL_DELAY_S: float = 0.5
+    VIDEO_POLL_MAX_DELAY_S: float = 8.0
+    VIDEO_PROCESSING_TIMEOUT_S: float = 600.0
+
+    # Provider HTTP clients (shared, keep-alive)
+    PROVIDER_POOL_MAX_CONNECTIONS: int = 20
+    PROVIDER_POOL_MAX_KEEPALIVE: int = 10
+    PROVIDER_POOL_SIZES: Dict[str, int] = {} # Per-provider max_connections, e.g. {"openrouter": 50}
+    PROVIDER_KEEPALIVE_EXPIRY: float = 60.0
+    PROVIDER_TIMEOUT: float = 60.0
+    PROVIDER_WARMUP_ENABLED: bool = True
+    PROVIDER_WARMUP_CONNECTIONS: int = 2 # Connections opened per provider at startup
+
     # Environment
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
 
+    # Logging pipeline (callers enqueue; a background thread formats and writes)
+    LOG_QUEUE_SIZE: int = 10000 # Records waiting for the writer; more are dropped and counted
+    LOG_SAMPLE_RATES: Dict[str, float] = {"talenttalk.turn": 0.1} # Fraction kept below WARNING, per logger
+    LOG_MAX_MESSAGE_CHARS: int = 2000
+    LOG_REDACT_PII: bool = True # Mask e-mail addresses and phone numbers
+    LOG_CANDIDATE_CONTENT: bool = False # Log answer/resume text (previews) instead of just its size
+    LOG_CANDIDATE_PREVIEW_CHARS: int = 80
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Absolute time.monotonic() by which the current request must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The request's overall deadline passed; further provider calls are pointless."""
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Sets a deadline for everything awaited inside the block.
+
+    Nested scopes can only tighten an outer deadline, never extend it.
+    """
+    current = _deadline.get()
+    deadline = None if seconds is None else time.monotonic() + seconds
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+    _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        # set() rather than reset(token): async generators may be closed from another context
+        _deadline.set(current)
+
+@contextmanager
+def without_deadline():
+    """Lifts the current deadline, e.g. for background work started from a request."""
+    current = _deadline.get()
+    _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.set(current)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (None when no deadline is set)."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def bounded_timeout(timeout: Optional[float]) -> Optional[float]:
+    """`timeout` capped by the time left; raises DeadlineExceeded if none is left."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,154 @@
+import gzip
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError: # Optional; gzip only without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+# Revalidated on every use (ETag), never stored by shared caches: reports are candidate data
+REVALIDATE = "private, no-cache"
+NO_STORE = "no-store"
+
+def immutable(max_age: Optional[int] = None) -> str:
+    """Cache-Control for content-addressed URLs, whose bytes never change."""
+    return f"public, max-age={max_age or settings.AUDIO_CACHE_MAX_AGE_S}, immutable"
+
+# --- Conditional requests ---
+
+def etag_for(digest: str, weak: bool = True) -> str:
+    # Weak: the same report is sent gzip, brotli or identity encoded
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match against `etag`, with the weak comparison RFC 9110 uses for GET."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+def not_modified(etag: str, cache_control: str, saved_bytes: int, route: str) -> Response:
+    """A 304 for a client that already holds this representation."""
+    metrics.incr("http_not_modified", route=route)
+    metrics.incr("http_bytes_saved", saved_bytes, reason="not_modified")
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+# --- Compression ---
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """"br" or "gzip" per Accept-Encoding q-values (br on a tie), or None for identity."""
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class CompressionMiddleware:
+    """
+    Compresses complete JSON and text responses of at least COMPRESSION_MIN_BYTES.
+
+    Only bodies sent in a single message are compressed: streamed responses
+    (NDJSON turns, audio, PDFs) pass through untouched, so their chunks still
+    reach the client as soon as they are produced.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        started = False
+
+        async def send_compressed(message):
+            nonlocal start, started
+            if message["type"] == "http.response.start":
+                start = message # Held until the body shows whether it can be compressed
+                return
+            if started:
+                await send(message)
+                return
+            started = True
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if message["type"] != "http.response.body" or message.get("more_body") or not self._compressible(start["status"], headers, body):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers.add_vary_header("Accept-Encoding")
+            if len(compressed) >= len(body):
+                metrics.incr("http_compression_skipped", reason="incompressible")
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            metrics.incr("http_compressed_responses", encoding=encoding)
+            metrics.incr("http_compression_bytes_in", len(body), encoding=encoding)
+            metrics.incr("http_compression_bytes_out", len(compressed), encoding=encoding)
+            metrics.incr("http_bytes_saved", len(body) - len(compressed), reason=encoding)
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, status: int, headers: MutableHeaders, body: bytes) -> bool:
+        minimum = settings.COMPRESSION_MIN_BYTES if self.minimum_size is None else self.minimum_size
+        return (
+            status == 200
+            and len(body) >= minimum
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        )
+
+# --- Static files ---
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for content-addressed files (TTS audio is named by a hash of its text)."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = immutable()
+        return response
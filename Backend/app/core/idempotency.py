@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+
+class TurnRecording:
+    """The events of one turn, kept as they are produced so duplicates can tail or replay them."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.events: List[Dict[str, Any]] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+
+    async def append(self, event: Dict[str, Any]):
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def close(self, error: Optional[BaseException] = None):
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def iter_events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yields every event from the beginning, then new ones as they arrive; re-raises a failure."""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.events) or self.done)
+                pending = self.events[index:]
+                finished = self.done
+            for event in pending:
+                yield event
+            index += len(pending)
+            if finished and index >= len(self.events):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class _Session:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.turns: "OrderedDict[str, TurnRecording]" = OrderedDict()
+        self.last_used = time.monotonic()
+
+    def idle(self) -> bool:
+        return not self.lock.locked() and all(recording.done for recording in self.turns.values())
+
+
+class SessionTurns:
+    """
+    Per-session turn serialization and deduplication.
+
+    Turns of one session run one at a time (`lock`), so concurrent answers
+    can't race on the session state. A turn started under an idempotency key
+    that is already running is joined rather than run again, and one that
+    finished recently is replayed from its recording
+    (IDEMPOTENCY_REPLAY_TURNS per session). Failed turns are forgotten, so a
+    retry runs them again; a failed turn leaves the session state as it was
+    (see api_routes._turn_events), so the retry starts from the same place.
+    Sessions without a turn for IDEMPOTENCY_SESSION_RETENTION_S are forgotten.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, _Session] = {}
+        self._tasks = set()
+
+    def _session(self, session_id: str) -> _Session:
+        if session_id not in self._sessions:
+            self._sessions[session_id] = _Session()
+        session = self._sessions[session_id]
+        session.last_used = time.monotonic()
+        return session
+
+    def lock(self, session_id: str) -> asyncio.Lock:
+        return self._session(session_id).lock
+
+    def start(self, session_id: str, key: str, produce: Callable[[], AsyncIterator[Dict[str, Any]]]) -> TurnRecording:
+        """The recording for `key`: an existing one, or a new turn driving `produce()` in the background."""
+        self._expire()
+        session = self._session(session_id)
+        recording = session.turns.get(key)
+        if recording is not None:
+            outcome = "replayed" if recording.done else "coalesced"
+            metrics.incr("chat_turns", outcome=outcome)
+            logger.info(f"Session {session_id}: duplicate answer {outcome} (key {key[:12]})")
+            session.turns.move_to_end(key)
+            return recording
+
+        metrics.incr("chat_turns", outcome="run")
+        recording = TurnRecording(key)
+        session.turns[key] = recording
+        # Not tied to the request: a client that drops mid-turn can retry and get the result
+        task = asyncio.create_task(self._record(session_id, recording, produce))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return recording
+
+    async def _record(self, session_id: str, recording: TurnRecording, produce: Callable[[], AsyncIterator[Dict[str, Any]]]):
+        try:
+            async for event in produce():
+                await recording.append(event)
+        except Exception as e:
+            self._session(session_id).turns.pop(recording.key, None)
+            await recording.close(error=e)
+            return
+        await recording.close()
+        self._prune(session_id)
+
+    def _prune(self, session_id: str):
+        turns = self._session(session_id).turns
+        finished = [key for key, recording in turns.items() if recording.done]
+        for key in finished[: max(0, len(finished) - settings.IDEMPOTENCY_REPLAY_TURNS)]:
+            del turns[key]
+
+    def _expire(self):
+        cutoff = time.monotonic() - settings.IDEMPOTENCY_SESSION_RETENTION_S
+        for session_id, session in list(self._sessions.items()):
+            # A held lock or running turn keeps the session, so its turns stay serialized
+            if session.last_used < cutoff and session.idle():
+                del self._sessions[session_id]
+
+    def discard(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+
+session_turns = SessionTurns()
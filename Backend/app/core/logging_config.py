@@ -1,7 +1,23 @@
+import atexit
+import copy
 import logging
+import queue
+import random
+import re
 import sys
 import json
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
 from .config import settings
+from .metrics import metrics
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+# Phone-shaped: "+" and 10-14 digits, or digit groups split by spaces, dots, dashes or an
+# area code in parentheses. Plain digit runs (byte counts, sizes, ids) are left alone.
+PHONE_RE = re.compile(
+    r"(?<![\w-])(?:\+\d{10,14}|(?:\+\d{1,3}[ .-]?)?(?:\(\d{2,4}\)[ .-]?|\d{2,4}[ .-])\d{3,4}[ .-]?\d{3,4})(?![\w-])"
+)
 
 class JsonFormatter(logging.Formatter):
     def format(self, record):
@@ -12,16 +28,98 @@ class JsonFormatter(logging.Formatter):
             "module": record.module,
             "line": record.lineno,
         }
-        if record.exc_info:
-            log_obj["exception"] = self.formatException(record.exc_info)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_obj["exception"] = record.exc_text
         return json.dumps(log_obj)
 
-def setup_logging():
-    logger = logging.getLogger("talenttalk")
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of records below WARNING, per logger (LOG_SAMPLE_RATES).
+
+    A rate set for a logger also applies to its children. Runs on the calling
+    thread, so sampled-out records never reach the queue.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = Counter() # Per logger; read by the metrics collector
+
+    def _rate(self, name: str) -> Optional[float]:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or random.random() < rate:
+            return True
+        self.dropped[record.name] += 1
+        return False
+
+def redact(text: str) -> str:
+    return PHONE_RE.sub("<phone>", EMAIL_RE.sub("<email>", text))
+
+class RedactingFilter(logging.Filter):
+    """Masks e-mail addresses and phone numbers in messages and tracebacks, and caps message size (writer thread)."""
+
+    def filter(self, record):
+        message = record.getMessage()
+        if settings.LOG_REDACT_PII:
+            message = redact(message)
+            # Exception messages often quote their input (str(e) of a parse error, say)
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text:
+                record.exc_text = redact(record.exc_text)
+        if len(message) > settings.LOG_MAX_MESSAGE_CHARS:
+            cut = len(message) - settings.LOG_MAX_MESSAGE_CHARS
+            message = f"{message[:settings.LOG_MAX_MESSAGE_CHARS]}... [{cut} chars truncated]"
+        record.msg, record.args = message, None
+        return True
+
+class DroppingQueueHandler(QueueHandler):
+    """Hands records to the writer thread; never blocks the caller when the queue is full."""
+
+    def __init__(self, queue_):
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only resolve the message here; formatting (and json.dumps) happens on the writer thread
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None # Tracebacks hold frames; don't keep them alive in the queue
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def candidate(text: Optional[str]) -> str:
+    """Candidate content (answers, resumes) for a log line: its size only, unless LOG_CANDIDATE_CONTENT."""
+    if text is None:
+        return "<none>"
+    if not settings.LOG_CANDIDATE_CONTENT:
+        return f"<{len(text)} chars redacted>"
+    preview = text[:settings.LOG_CANDIDATE_PREVIEW_CHARS]
+    return preview + ("..." if len(text) > len(preview) else "")
+
+def setup_logging(name: str = "talenttalk", stream=None):
+    logger = logging.getLogger(name)
     logger.setLevel(settings.LOG_LEVEL)
-    
-    console_handler = logging.StreamHandler(sys.stdout)
-    
+
+    console_handler = logging.StreamHandler(stream or sys.stdout)
+
     if settings.ENVIRONMENT == "production":
         console_handler.setFormatter(JsonFormatter())
     else:
@@ -30,14 +128,30 @@ def setup_logging():
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         console_handler.setFormatter(formatter)
-        
-    logger.addHandler(console_handler)
-    
+    console_handler.addFilter(RedactingFilter())
+
+    # Callers only enqueue; a listener thread formats and writes
+    queue_handler = DroppingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    sampler = SamplingFilter(settings.LOG_SAMPLE_RATES)
+    queue_handler.addFilter(sampler)
+    listener = QueueListener(queue_handler.queue, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop) # Flushes what is still queued
+
+    logger.addHandler(queue_handler)
+
     # Also capture uvicorn logs if in prod
     if settings.ENVIRONMENT == "production":
         uvicorn_logger = logging.getLogger("uvicorn.access")
-        uvicorn_logger.handlers = [console_handler]
+        uvicorn_logger.handlers = [queue_handler]
 
-    return logger
+    metrics.register_collector(f"logging.{name}", lambda: {
+        "queued": queue_handler.queue.qsize(),
+        "dropped_queue_full": queue_handler.dropped,
+        "sampled_out": dict(sampler.dropped),
+    })
+    return logger, listener
 
-logger = setup_logging()
+logger, log_listener = setup_logging()
+# Per-turn progress messages; high volume, sampled via LOG_SAMPLE_RATES
+turn_logger = logger.getChild("turn")
@@ -0,0 +1,80 @@
+import threading
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in sorted(labels.items())) + "}"
+
+class Metrics:
+    """In-process counters, gauges and rolling-window summaries, served at /metrics.
+
+    Components with their own state (connection pools, breakers, queues) register
+    a collector callback instead of pushing values on every change.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._window = window
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._samples: Dict[str, deque] = {}
+        self._collectors: Dict[str, Callable[[], Any]] = {}
+
+    def incr(self, name: str, value: float = 1.0, **labels):
+        with self._lock:
+            self._counters[_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self._samples:
+                self._samples[key] = deque(maxlen=self._window)
+            self._samples[key].append(value)
+
+    def counter(self, name: str, **labels) -> float:
+        return self._counters.get(_key(name, labels), 0.0)
+
+    def percentile(self, name: str, q: float, min_samples: int = 1, **labels) -> Optional[float]:
+        """q-th percentile of the rolling window, or None with too few samples."""
+        samples = self._samples.get(_key(name, labels))
+        if not samples or len(samples) < min_samples:
+            return None
+        with self._lock:
+            values = list(samples)
+        return float(np.percentile(values, q))
+
+    def register_collector(self, name: str, collector: Callable[[], Any]):
+        self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            samples = {k: list(v) for k, v in self._samples.items()}
+
+        summaries = {}
+        for key, values in samples.items():
+            arr = np.asarray(values, dtype=np.float64)
+            summaries[key] = {
+                "count": int(arr.size),
+                "mean": float(arr.mean()),
+                "p50": float(np.percentile(arr, 50)),
+                "p95": float(np.percentile(arr, 95)),
+                "p99": float(np.percentile(arr, 99)),
+                "max": float(arr.max()),
+            }
+
+        snapshot = {"counters": counters, "gauges": gauges, "summaries": summaries}
+        for name, collector in self._collectors.items():
+            snapshot[name] = collector()
+        return snapshot
+
+metrics = Metrics()
@@ -1,14 +1,13 @@
 from langchain_core.prompts import PromptTemplate
 
-# Prompt for generating the next interview question
-QUESTION_PROMPT_TEMPLATE = """
+# Prompts for the next interview question.
+# Providers cache matching prompt prefixes, so everything fixed for the session
+# (company, role, style, resume) is in the system message and the per-turn values
+# go last. History is append-only, so each turn also extends the previous prefix.
+QUESTION_SYSTEM_PROMPT_TEMPLATE = """
 You are an expert technical interviewer for {target_company}. 
 You are conducting a {interview_style} interview for the role of {job_role}.
-
-Context:
-- Current Difficulty Level: {difficulty}
-- specific Topic (if any): {topic}
-- Question Number: {question_num} of {total_questions}
+The interview has {total_questions} questions. Specific Topic (if any): {topic}
 
 Candidate's Resume Context:
 {resume_context}
@@ -20,32 +19,35 @@ If "HR", focus on behavioral and situational questions.
 If "Technical", focus on coding, system design, and deep technical concepts.
 If "Visual", assume the candidate can see you (describe your expression/gesture in brackets if needed).
 
-Previous Conversation History:
-{history}
-
-Generate the next interview question. 
+Each turn you receive the conversation so far and the number and difficulty of the next question.
+Generate that question. 
 Keep it concise and clear. 
 Do not greet the candidate again if you have already done so in the history.
 Just output the question text.
 """
 
-QUESTION_PROMPT = PromptTemplate(
-    input_variables=["target_company", "interview_style", "job_role", "difficulty", "topic", "question_num", "total_questions", "history", "resume_context"],
-    template=QUESTION_PROMPT_TEMPLATE
+QUESTION_SYSTEM_PROMPT = PromptTemplate(
+    input_variables=["target_company", "interview_style", "job_role", "topic", "total_questions", "resume_context"],
+    template=QUESTION_SYSTEM_PROMPT_TEMPLATE
 )
 
+QUESTION_TURN_PROMPT_TEMPLATE = """
+Previous Conversation History:
+{history}
 
-# Prompt for analyzing the candidate's response
-ANALYSIS_PROMPT_TEMPLATE = """
-You are an AI Interview Evaluator. 
-Analyze the candidate's response to the following question.
+Next: question {question_num} of {total_questions}. Current Difficulty Level: {difficulty}
+"""
+
+QUESTION_TURN_PROMPT = PromptTemplate(
+    input_variables=["history", "question_num", "total_questions", "difficulty"],
+    template=QUESTION_TURN_PROMPT_TEMPLATE
+)
 
-Question: {question}
-Candidate's Answer: {answer}
 
-Context:
-- Role: {job_role}
-- Difficulty: {difficulty}
+# Prompts for analyzing the candidate's response (stable instructions first, as above)
+ANALYSIS_SYSTEM_PROMPT_TEMPLATE = """
+You are an AI Interview Evaluator for the role of {job_role}. 
+Analyze the candidate's response to the question you are given.
 
 Provide your analysis in the following JSON format ONLY:
 {{
@@ -57,9 +59,38 @@ Provide your analysis in the following JSON format ONLY:
 }}
 """
 
-ANALYSIS_PROMPT = PromptTemplate(
-    input_variables=["question", "answer", "job_role", "difficulty"],
-    template=ANALYSIS_PROMPT_TEMPLATE
+ANALYSIS_SYSTEM_PROMPT = PromptTemplate(
+    input_variables=["job_role"],
+    template=ANALYSIS_SYSTEM_PROMPT_TEMPLATE
+)
+
+ANALYSIS_TURN_PROMPT_TEMPLATE = """
+Difficulty: {difficulty}
+Question: {question}
+Candidate's Answer: {answer}
+"""
+
+ANALYSIS_TURN_PROMPT = PromptTemplate(
+    input_variables=["question", "answer", "difficulty"],
+    template=ANALYSIS_TURN_PROMPT_TEMPLATE
+)
+
+# Short correction request, used only when a structured reply can't be repaired locally
+STRUCTURED_REPAIR_PROMPT_TEMPLATE = """
+Your previous reply could not be parsed as the required JSON object.
+
+Problems: {error}
+Required keys: {fields}
+
+Previous reply:
+{output}
+
+Return ONLY the corrected JSON object, with no comments or extra text.
+"""
+
+STRUCTURED_REPAIR_PROMPT = PromptTemplate(
+    input_variables=["error", "fields", "output"],
+    template=STRUCTURED_REPAIR_PROMPT_TEMPLATE
 )
 
 
@@ -101,11 +132,10 @@ FINAL_REPORT_PROMPT = PromptTemplate(
     template=FINAL_REPORT_PROMPT_TEMPLATE
 )
 
-# Prompt for generating a follow-up question
-FOLLOWUP_PROMPT_TEMPLATE = """
+# Prompts for generating a follow-up question (stable instructions first, as above)
+FOLLOWUP_SYSTEM_PROMPT_TEMPLATE = """
 You are an expert technical interviewer for {target_company}.
-The candidate just answered your question: "{question}"
-Candidate's Answer: "{answer}"
+You will be given your last question and the candidate's answer.
 
 Your goal is to dig deeper. Generate a short, sharp follow-up question.
 - If the answer was vague, ask for clarification.
@@ -115,7 +145,27 @@ Your goal is to dig deeper. Generate a short, sharp follow-up question.
 Just output the follow-up question text.
 """
 
-FOLLOWUP_PROMPT = PromptTemplate(
-    input_variables=["target_company", "question", "answer"],
-    template=FOLLOWUP_PROMPT_TEMPLATE
+FOLLOWUP_SYSTEM_PROMPT = PromptTemplate(
+    input_variables=["target_company"],
+    template=FOLLOWUP_SYSTEM_PROMPT_TEMPLATE
 )
+
+FOLLOWUP_TURN_PROMPT_TEMPLATE = """
+Your question: "{question}"
+Candidate's Answer: "{answer}"
+"""
+
+FOLLOWUP_TURN_PROMPT = PromptTemplate(
+    input_variables=["question", "answer"],
+    template=FOLLOWUP_TURN_PROMPT_TEMPLATE
+)
+
+# Prompts for video behavior analysis
+VIDEO_ANALYSIS_PROMPT = "Analyze this interview video clip. Describe the candidate's facial expressions, body language, and apparent confidence level. Be concise."
+
+VIDEO_KEYFRAMES_PROMPT = """
+The following images are keyframes sampled from an interview video clip, in order,
+each preceded by its timestamp. Near-identical frames have been removed.
+Analyze the candidate's facial expressions, body language, and apparent confidence level,
+noting any changes over time. Be concise.
+"""
@@ -0,0 +1,97 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+class SessionUsage:
+    """Tokens, audio and spend of one interview, broken down by task.
+
+    LLM tasks are the MODEL_ROUTES keys; speech is recorded under "stt" and
+    "tts". Lives in the session state, so it is stored (and dropped) with it.
+    """
+
+    def __init__(self, budget_usd: Optional[float] = None):
+        self.budget_usd = settings.SESSION_BUDGET_USD if budget_usd is None else budget_usd
+        self._lock = threading.Lock() # TTS segments record from concurrent tasks
+        self.tasks: Dict[str, Dict[str, float]] = {}
+
+    def _task(self, task: str) -> Dict[str, float]:
+        if task not in self.tasks:
+            self.tasks[task] = {"calls": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0, "seconds": 0.0, "characters": 0, "cost_usd": 0.0}
+        return self.tasks[task]
+
+    def add_llm(self, task: str, input_tokens: int, output_tokens: int, cost_usd: float, cached_tokens: int = 0):
+        with self._lock:
+            totals = self._task(task)
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens
+            totals["cached_tokens"] += cached_tokens
+            totals["output_tokens"] += output_tokens
+            totals["cost_usd"] += cost_usd
+
+    def add_stt(self, provider: str, seconds: float):
+        cost = seconds / 60 * settings.STT_PRICES_PER_MINUTE.get(provider, 0.0)
+        with self._lock:
+            totals = self._task("stt")
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            totals["cost_usd"] += cost
+
+    def add_tts(self, provider: str, characters: int):
+        cost = characters / 1000 * settings.TTS_PRICES_PER_1K_CHARS.get(provider, 0.0)
+        with self._lock:
+            totals = self._task("tts")
+            totals["calls"] += 1
+            totals["characters"] += characters
+            totals["cost_usd"] += cost
+
+    @property
+    def cost_usd(self) -> float:
+        with self._lock:
+            return sum(totals["cost_usd"] for totals in self.tasks.values())
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget_usd is not None and self.cost_usd >= self.budget_usd
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            tasks = {task: dict(totals) for task, totals in self.tasks.items()}
+        cost = sum(totals["cost_usd"] for totals in tasks.values())
+        return {
+            "tasks": tasks,
+            "input_tokens": sum(totals["input_tokens"] for totals in tasks.values()),
+            "cached_tokens": sum(totals["cached_tokens"] for totals in tasks.values()),
+            "output_tokens": sum(totals["output_tokens"] for totals in tasks.values()),
+            "cost_usd": cost,
+            "budget_usd": self.budget_usd,
+            "over_budget": self.budget_usd is not None and cost >= self.budget_usd,
+        }
+
+# Usage record of the session the current request is serving
+_current: ContextVar[Optional[SessionUsage]] = ContextVar("session_usage", default=None)
+
+@contextmanager
+def usage_scope(usage: Optional[SessionUsage]):
+    """Attributes provider usage inside the block (and tasks it starts) to `usage`."""
+    current = _current.get()
+    _current.set(usage)
+    try:
+        yield usage
+    finally:
+        # set() rather than reset(token): async generators may be closed from another context
+        _current.set(current)
+
+def current_usage() -> Optional[SessionUsage]:
+    return _current.get()
+
+def over_budget(stage: str) -> bool:
+    """Whether the current session has spent its budget, so `stage` should degrade."""
+    usage = _current.get()
+    if usage is not None and usage.over_budget:
+        metrics.incr("session_budget_degraded", stage=stage)
+        return True
+    return False
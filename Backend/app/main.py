@@ -1,20 +1,73 @@
+import os
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.core.circuit_breaker import breakers
 from app.core.config import settings
+from app.core.http_cache import CompressionMiddleware, ImmutableStaticFiles
 from app.core.logging_config import logger
+from app.core.metrics import metrics
 from app.db.database import init_db
+from app.agents.interview_graph import get_interview_app
+from app.services.audio_preprocessing import audio_preprocessor
+from app.services.gemini_service import gemini_service
+from app.services.provider_clients import provider_clients
+from app.services.report_pdf import report_pdf_exporter
+from app.services.video_preprocessing import video_preprocessor
+from app.services.video_jobs import video_jobs
+from app.services.voice_service import voice_service
+
+# Startup steps that must finish before /health/ready reports ready
+readiness = {"database": False, "warm_up": False}
+
+async def warm_up():
+    """Builds provider clients and the interview graph, then opens provider connections.
+
+    Runs in the background after startup: the process is live (and can answer
+    /health/live) while this is in progress. Anything not warmed up here is
+    still created lazily by the first request that needs it.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.wait_for(asyncio.gather(
+            loop.run_in_executor(None, gemini_service.warm_up),
+            loop.run_in_executor(None, voice_service.warm_up),
+            loop.run_in_executor(None, get_interview_app),
+            provider_clients.warm_up()
+        ), timeout=settings.PROVIDER_TIMEOUT)
+        logger.info("Startup: Providers warmed up")
+    except asyncio.TimeoutError:
+        logger.warning("Startup: Provider warm-up timed out")
+    except Exception as e:
+        logger.warning(f"Startup: Provider warm-up failed: {e}")
+    finally:
+        readiness["warm_up"] = True
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Startup: Initializing Application")
     await init_db()
+    readiness["database"] = True
     logger.info("Startup: Database initialized")
+    warm_up_task = None
+    if settings.PROVIDER_WARMUP_ENABLED:
+        warm_up_task = asyncio.create_task(warm_up())
+    else:
+        readiness["warm_up"] = True
     yield
     # Shutdown
     logger.info("Shutdown: Application stopping")
+    if warm_up_task and not warm_up_task.done():
+        warm_up_task.cancel()
+    await video_jobs.stop()
+    audio_preprocessor.shutdown()
+    video_preprocessor.shutdown()
+    report_pdf_exporter.shutdown()
+    await provider_clients.aclose()
 
 from fastapi.staticfiles import StaticFiles
 from app.api_routes import router as api_router
@@ -25,9 +78,14 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Mount static files for audio
+# Mount static files for audio (content-addressed file names, cached as immutable)
+os.makedirs("static/audio", exist_ok=True)
+app.mount("/static/audio", ImmutableStaticFiles(directory="static/audio"), name="static_audio")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# JSON responses (reports, transcripts) above COMPRESSION_MIN_BYTES go out gzip/brotli encoded
+app.add_middleware(CompressionMiddleware)
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -41,9 +99,31 @@ if settings.BACKEND_CORS_ORIGINS:
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
+    """Liveness: the process is up and serving. No dependency checks."""
     return {"status": "healthy", "environment": settings.ENVIRONMENT}
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: startup (database, provider warm-up) has finished."""
+    checks = {
+        **readiness,
+        "llm_clients": gemini_service.ready,
+        "voice_clients": voice_service.ready,
+        "interview_graph": get_interview_app.cache_info().currsize > 0
+    }
+    ready = all(readiness.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        # Provider breakers are informational: an open one is failed over, not fatal
+        content={"status": "ready" if ready else "starting", "checks": checks, "providers": breakers.states()}
+    )
+
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to TalentTalk Pro API", "docs": "/docs"}
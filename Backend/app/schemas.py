@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
@@ -36,3 +36,25 @@ class ChatResponse(BaseModel):
 
 class ReportResponse(BaseModel):
     report_content: str
+
+# --- LLM Output Models ---
+
+class AnswerAnalysis(BaseModel):
+    """Structured output of ANALYSIS_SYSTEM_PROMPT."""
+    model_config = ConfigDict(extra="ignore")
+
+    feedback: str
+    sentiment_score: float # -1.0 (Negative) to 1.0 (Positive)
+    technical_accuracy: float # 0.0 to 1.0
+    suggested_improvement: str = ""
+    is_correct: bool = False
+
+    @field_validator("sentiment_score")
+    @classmethod
+    def clamp_sentiment(cls, value: float) -> float:
+        return max(-1.0, min(1.0, value))
+
+    @field_validator("technical_accuracy")
+    @classmethod
+    def clamp_accuracy(cls, value: float) -> float:
+        return max(0.0, min(1.0, value))
@@ -0,0 +1,208 @@
+import io
+import os
+import wave
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+# VAD frame size. 20ms at 16 kHz = 320 samples.
+FRAME_MS = 20
+# Speech frames are padded on both sides so word onsets/tails are not clipped.
+SPEECH_PAD_MS = 100
+# A frame is voiced if it is this far above the estimated noise floor...
+NOISE_MARGIN_DB = 10.0
+# ...and never below this absolute level (dBFS).
+MIN_SPEECH_DBFS = -50.0
+
+
+@dataclass
+class PreprocessResult:
+    data: bytes
+    sample_rate: int
+    original_bytes: int
+    original_seconds: float
+    processed_seconds: float
+
+    @property
+    def bytes_removed(self) -> int:
+        return self.original_bytes - len(self.data)
+
+    @property
+    def seconds_removed(self) -> float:
+        return self.original_seconds - self.processed_seconds
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decodes PCM WAV bytes into float32 samples shaped (frames, channels)."""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = (ints << 8) >> 8  # sign-extend 24 -> 32 bit
+        samples = ints.astype(np.float32) / float(1 << 23)
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / float(1 << 31)
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width}")
+
+    return samples.reshape(-1, channels), rate
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encodes mono float32 samples as 16-bit PCM WAV."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Resamples mono audio with a windowed-sinc low-pass and linear interpolation."""
+    if src_rate == dst_rate or samples.size == 0:
+        return samples
+
+    if dst_rate < src_rate:
+        # Anti-aliasing filter at the new Nyquist frequency
+        cutoff = 0.5 * dst_rate / src_rate
+        taps = np.arange(-32, 33, dtype=np.float32)
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * taps) * np.hamming(taps.size).astype(np.float32)
+        kernel /= kernel.sum()
+        samples = np.convolve(samples, kernel, mode="same").astype(np.float32)
+
+    duration = samples.size / src_rate
+    n_out = int(round(duration * dst_rate))
+    positions = np.arange(n_out, dtype=np.float64) * (src_rate / dst_rate)
+    return np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+
+
+def speech_frame_mask(frames: np.ndarray, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """Energy-based VAD. Returns a boolean mask of voiced frames (padded)."""
+    energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(noise_floor + NOISE_MARGIN_DB, MIN_SPEECH_DBFS)
+    speech = energy_db > threshold
+
+    pad = max(1, SPEECH_PAD_MS // frame_ms)
+    if speech.any():
+        speech = np.convolve(speech.astype(np.int32), np.ones(2 * pad + 1, dtype=np.int32), mode="same") > 0
+    return speech
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, max_silence_ms: int) -> np.ndarray:
+    """Drops leading/trailing silence and shortens internal pauses to max_silence_ms."""
+    frame_len = sample_rate * FRAME_MS // 1000
+    n_frames = samples.size // frame_len
+    if n_frames == 0:
+        return samples
+
+    frames = samples[: n_frames * frame_len].reshape(n_frames, frame_len)
+    speech = speech_frame_mask(frames)
+    if not speech.any():
+        # Nothing looks like speech; let the STT provider decide.
+        return samples
+
+    # Position of each frame inside its run of silence (0 for voiced frames)
+    idx = np.arange(n_frames)
+    silent = ~speech
+    run_start = np.where(silent & ~np.r_[False, silent[:-1]], idx, 0)
+    run_pos = idx - np.maximum.accumulate(run_start)
+    keep = speech | (run_pos < max(0, max_silence_ms // FRAME_MS))
+
+    voiced = np.flatnonzero(speech)
+    keep[: voiced[0]] = False
+    keep[voiced[-1] + 1:] = False
+
+    return frames[keep].ravel()
+
+
+def preprocess_wav_bytes(data: bytes, target_rate: int, max_silence_ms: int) -> PreprocessResult:
+    """Decode -> mono -> resample -> VAD trim -> 16-bit mono WAV."""
+    samples, rate = decode_wav(data)
+    original_seconds = samples.shape[0] / rate if rate else 0.0
+
+    mono = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    mono = resample(mono, rate, target_rate)
+    trimmed = trim_silence(mono, target_rate, max_silence_ms)
+
+    return PreprocessResult(
+        data=encode_wav(trimmed, target_rate),
+        sample_rate=target_rate,
+        original_bytes=len(data),
+        original_seconds=original_seconds,
+        processed_seconds=trimmed.size / target_rate,
+    )
+
+
+class AudioPreprocessor:
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if settings.AUDIO_PREPROCESS_WORKERS <= 0:
+            return None  # Default thread pool
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=settings.AUDIO_PREPROCESS_WORKERS)
+        return self._executor
+
+    async def preprocess(self, data: bytes) -> PreprocessResult:
+        """Runs the preprocessing pipeline off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            preprocess_wav_bytes,
+            data,
+            settings.AUDIO_TARGET_SAMPLE_RATE,
+            settings.AUDIO_MAX_SILENCE_MS,
+        )
+
+    async def preprocess_file(self, file_path: str) -> Optional[str]:
+        """Writes a compact 16 kHz mono copy of `file_path` and returns its path.
+
+        Returns None if the input can't be decoded (e.g. not a PCM WAV), in which
+        case the caller should upload the original file unchanged.
+        """
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+        try:
+            result = await self.preprocess(data)
+        except (wave.Error, ValueError, EOFError) as e:
+            logger.warning(f"Audio preprocessing skipped for {file_path}: {e}")
+            return None
+
+        output_path = f"{os.path.splitext(file_path)[0]}_{result.sample_rate // 1000}k.wav"
+        with open(output_path, "wb") as f:
+            f.write(result.data)
+
+        logger.info(
+            f"Audio preprocessed: removed {result.bytes_removed} bytes "
+            f"({result.original_bytes} -> {len(result.data)}) and "
+            f"{result.seconds_removed:.2f}s ({result.original_seconds:.2f}s -> {result.processed_seconds:.2f}s)"
+        )
+        return output_path
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+audio_preprocessor = AudioPreprocessor()
@@ -1,63 +1,400 @@
-import json
-from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
+import base64
+import asyncio
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import AsyncIterator, Deque, Dict, Any, List, Optional, Tuple, Type
 
-from app.core.config import settings
-from app.core.prompts import QUESTION_PROMPT, ANALYSIS_PROMPT, FINAL_REPORT_PROMPT, FOLLOWUP_PROMPT
+from pydantic import BaseModel
+
+from app.core.config import ModelRoute, settings
+from app.core.deadline import DeadlineExceeded, bounded_timeout, remaining
+from app.core.prompts import (
+    QUESTION_SYSTEM_PROMPT, QUESTION_TURN_PROMPT, ANALYSIS_SYSTEM_PROMPT, ANALYSIS_TURN_PROMPT,
+    FOLLOWUP_SYSTEM_PROMPT, FOLLOWUP_TURN_PROMPT, FINAL_REPORT_PROMPT,
+    STRUCTURED_REPAIR_PROMPT, VIDEO_ANALYSIS_PROMPT, VIDEO_KEYFRAMES_PROMPT
+)
 from app.core.logging_config import logger # Added for video analysis and error logging
+from app.core.metrics import metrics
+from app.core.usage import current_usage, over_budget
+from app.schemas import AnswerAnalysis
+from app.services.provider_clients import provider_clients
+from app.services.structured_output import parse_or_reask
+from app.services.video_preprocessing import KeyframeSet, video_preprocessor
+
+class HedgeBudget:
+    """Caps hedged duplicates to a fraction of recent LLM calls."""
+
+    def __init__(self, max_rate: float, window: int = 200):
+        self.max_rate = max_rate
+        self._recent: Deque[bool] = deque(maxlen=window)
+
+    def allow(self) -> bool:
+        return (sum(self._recent) + 1) / (len(self._recent) + 1) <= self.max_rate
+
+    def record(self, hedged: bool):
+        self._recent.append(hedged)
+        metrics.set_gauge("llm_hedge_rate", sum(self._recent) / len(self._recent))
 
 class GeminiService:
+    """LLM calls for the interview.
+
+    Each call names a task ("question", "analysis", "report", ...) that
+    settings.MODEL_ROUTES maps to a primary and fallback model, a max-token cap
+    and a latency budget. OpenRouter chat clients are created on first use (or
+    by `warm_up` at startup), so importing this module doesn't pull in
+    langchain_openai.
+    """
+
     def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, Any] = {}
+        self._warm = False
+        self._hedges = HedgeBudget(settings.LLM_HEDGE_MAX_RATE)
+
+    def _client(self, model: str, route: ModelRoute, json_mode: bool = False):
+        key = (model, route.temperature, route.max_tokens, json_mode)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = self._build_llm(model, route, json_mode)
+        return client
+
+    def _build_llm(self, model: str, route: ModelRoute, json_mode: bool):
+        from langchain_openai import ChatOpenAI
+
         # OpenRouter Configuration
-        self.llm = ChatOpenAI(
-            model="google/gemini-2.0-flash-001",
+        return ChatOpenAI(
+            model=model,
             openai_api_key=settings.OPENROUTER_API_KEY,
             openai_api_base="https://openrouter.ai/api/v1",
-            temperature=0.7
+            temperature=route.temperature,
+            max_tokens=route.max_tokens,
+            stream_usage=True,
+            model_kwargs={"response_format": {"type": "json_object"}} if json_mode else {},
+            http_client=provider_clients.sync_client("openrouter"),
+            http_async_client=provider_clients.async_client("openrouter")
         )
-        self.json_llm = ChatOpenAI(
-            model="google/gemini-2.0-flash-001", 
-            openai_api_key=settings.OPENROUTER_API_KEY,
-            openai_api_base="https://openrouter.ai/api/v1",
-            temperature=0.3,
-            model_kwargs={"response_format": {"type": "json_object"}}
+
+    @staticmethod
+    def _models(task: str) -> Tuple[ModelRoute, List[str]]:
+        route = settings.MODEL_ROUTES[task]
+        if over_budget(f"llm.{task}"):
+            # The session has spent its budget: the cheapest model only, no fallback or hedge
+            return route, [settings.BUDGET_MODEL]
+        return route, [m for m in (route.primary, route.fallback) if m]
+
+    @property
+    def ready(self) -> bool:
+        return self._warm
+
+    def warm_up(self):
+        """Builds the primary chat clients ahead of the first request (blocking; run in an executor)."""
+        for task in settings.MODEL_ROUTES:
+            route, models = self._models(task)
+            self._client(models[0], route, json_mode=(task == "analysis"))
+        self._warm = True
+
+    async def _invoke(self, task: str, prompt, json_mode: bool = False) -> str:
+        """Runs `prompt` on the task's primary model, falling back on error or when over budget.
+
+        Every attempt is bounded by the request deadline (see app.core.deadline)
+        and hedged once it runs past the model's observed p95.
+        """
+        route, models = self._models(task)
+        for i, model in enumerate(models):
+            last = i == len(models) - 1
+            started = time.perf_counter()
+            hedge_model = route.fallback if settings.LLM_HEDGE_TO_FALLBACK and route.fallback else model
+            try:
+                # The last model gets the full provider timeout rather than the budget
+                timeout = bounded_timeout(None if last else route.latency_budget_s)
+                response, answered_by, answer_started = await asyncio.wait_for(
+                    self._hedged(task, model, hedge_model, route, prompt, json_mode), timeout=timeout
+                )
+            except Exception as e:
+                out_of_time = isinstance(e, DeadlineExceeded) or (remaining() is not None and remaining() <= 0)
+                self._record(task, model, started, "deadline" if out_of_time else "timeout" if isinstance(e, asyncio.TimeoutError) else "error")
+                if out_of_time:
+                    raise DeadlineExceeded(f"Request deadline exceeded during '{task}'") from e
+                if last:
+                    raise
+                logger.warning(f"LLM task '{task}' failed on {model} ({type(e).__name__}); falling back to {models[i + 1]}")
+                continue
+            self._record(task, answered_by, answer_started, "ok", getattr(response, "usage_metadata", None), route)
+            return response.content
+
+    async def _hedged(self, task: str, model: str, hedge_model: str, route: ModelRoute, prompt, json_mode: bool):
+        """Calls `model`; if it hasn't answered by its observed p95, races a duplicate on `hedge_model`.
+
+        Returns (response, model that answered, when that call started). The
+        slower call is cancelled and awaited; if it finished anyway, its tokens
+        are still counted.
+        """
+        calls = {}
+
+        def call(name: str) -> asyncio.Future:
+            future = asyncio.ensure_future(self._client(name, route, json_mode).ainvoke(prompt))
+            calls[future] = (name, time.perf_counter())
+            return future
+
+        primary = call(model)
+        winner = None
+        try:
+            delay = self._hedge_delay(task, model)
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and self._hedges.allow():
+                    call(hedge_model)
+                    metrics.incr("llm_hedges_fired", task=task, model=model)
+                    logger.info(f"LLM task '{task}': {model} past p95 ({delay:.2f}s); hedging on {hedge_model}")
+            self._hedges.record(hedged=len(calls) > 1)
+
+            pending = set(calls)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        winner = future
+                        if len(calls) > 1:
+                            metrics.incr("llm_hedges_won" if future is not primary else "llm_hedges_wasted", task=task, model=model)
+                        return (future.result(), *calls[future])
+            raise primary.exception()
+        finally:
+            for future in calls:
+                future.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
+            if winner is not None:
+                for future, (name, _) in calls.items():
+                    if future is not winner:
+                        self._record_lost(task, name, future)
+
+    async def _hedged_first_chunk(self, task: str, model: str, hedge_model: str, route: ModelRoute, prompt):
+        """Starts a stream on `model`; if its first chunk is later than the observed p95, races a second
+        stream on `hedge_model`.
+
+        Returns (chunk iterator, first chunk or None if empty, model that answered,
+        when that stream started). The losing stream is cancelled and closed.
+        """
+        streams = {}
+
+        def open_stream(name: str) -> asyncio.Future:
+            chunks = self._client(name, route).astream(prompt).__aiter__()
+            first = asyncio.ensure_future(chunks.__anext__())
+            streams[first] = (chunks, name, time.perf_counter())
+            return first
+
+        primary = open_stream(model)
+        winner = None
+        try:
+            delay = self._hedge_delay(task, model, "llm_first_token_seconds")
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and self._hedges.allow():
+                    open_stream(hedge_model)
+                    metrics.incr("llm_hedges_fired", task=task, model=model)
+                    logger.info(f"LLM task '{task}': {model} first chunk past p95 ({delay:.2f}s); hedging on {hedge_model}")
+            self._hedges.record(hedged=len(streams) > 1)
+
+            pending = set(streams)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for first in done:
+                    error = first.exception()
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        winner = first
+                        if len(streams) > 1:
+                            metrics.incr("llm_hedges_won" if first is not primary else "llm_hedges_wasted", task=task, model=model)
+                        chunks, name, started = streams[first]
+                        return chunks, None if error else first.result(), name, started
+            raise primary.exception()
+        finally:
+            for first, (chunks, name, _) in streams.items():
+                if first is not winner:
+                    first.cancel()
+                    await asyncio.gather(first, return_exceptions=True)
+                    try:
+                        await chunks.aclose()
+                    except Exception:
+                        pass
+                    if winner is not None:
+                        self._record_lost(task, name, first)
+
+    def _hedge_delay(self, task: str, model: str, metric: str = "llm_latency_seconds") -> Optional[float]:
+        session = current_usage()
+        if not settings.LLM_HEDGING_ENABLED or (session is not None and session.over_budget):
+            return None # Hedges are duplicate spend
+        return metrics.percentile(
+            metric, settings.LLM_HEDGE_PERCENTILE,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES, task=task, model=model
         )
 
+    async def _stream(self, task: str, prompt) -> AsyncIterator[str]:
+        """Streams the task's output; falls back only if the first chunk doesn't arrive within budget.
+
+        The time to the first chunk is hedged like `_invoke` calls (against the
+        observed p95 first-chunk time); once text flows, the stream is not raced.
+        """
+        route, models = self._models(task)
+        for i, model in enumerate(models):
+            last = i == len(models) - 1
+            started = time.perf_counter()
+            hedge_model = route.fallback if settings.LLM_HEDGE_TO_FALLBACK and route.fallback else model
+            try:
+                timeout = bounded_timeout(None if last else route.latency_budget_s)
+                chunks, first, model, started = await asyncio.wait_for(
+                    self._hedged_first_chunk(task, model, hedge_model, route, prompt), timeout=timeout
+                )
+            except Exception as e:
+                out_of_time = isinstance(e, DeadlineExceeded) or (remaining() is not None and remaining() <= 0)
+                self._record(task, model, started, "deadline" if out_of_time else "timeout" if isinstance(e, asyncio.TimeoutError) else "error")
+                if out_of_time:
+                    raise DeadlineExceeded(f"Request deadline exceeded during '{task}'") from e
+                if last:
+                    raise
+                logger.warning(f"LLM task '{task}' failed on {model} ({type(e).__name__}); falling back to {models[i + 1]}")
+                continue
+            if first is None:
+                self._record(task, model, started, "ok")
+                return
+
+            metrics.observe("llm_first_token_seconds", time.perf_counter() - started, task=task, model=model)
+            usage = getattr(first, "usage_metadata", None)
+            if first.content:
+                yield first.content
+            try:
+                async for chunk in chunks:
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    if chunk.content:
+                        yield chunk.content
+            except Exception:
+                # Text was already delivered; switching models mid-answer isn't an option
+                self._record(task, model, started, "error")
+                raise
+            self._record(task, model, started, "ok", usage, route)
+            return
+
+    @staticmethod
+    def _record(task: str, model: str, started: float, outcome: str, usage: Optional[Dict] = None, route: ModelRoute = None):
+        elapsed = time.perf_counter() - started
+        metrics.incr("llm_calls", task=task, model=model, outcome=outcome)
+        if outcome != "ok":
+            return
+        metrics.observe("llm_latency_seconds", elapsed, task=task, model=model)
+        if route and elapsed > route.latency_budget_s:
+            metrics.incr("llm_over_budget", task=task, model=model)
+        GeminiService._record_usage(task, model, usage)
+
+    @staticmethod
+    def _record_lost(task: str, model: str, call: asyncio.Future):
+        """The losing call of a hedge race. One that finished before it was cancelled was still billed."""
+        metrics.incr("llm_calls", task=task, model=model, outcome="hedge_lost")
+        if not call.cancelled() and call.exception() is None:
+            GeminiService._record_usage(task, model, getattr(call.result(), "usage_metadata", None))
+
+    @staticmethod
+    def _record_usage(task: str, model: str, usage: Optional[Dict]):
+        if usage:
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+            # Prompt-prefix cache hits, as reported by the provider (part of input_tokens)
+            cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+            metrics.incr("llm_tokens", input_tokens, task=task, model=model, kind="input")
+            metrics.incr("llm_tokens", cached_tokens, task=task, model=model, kind="cached_input")
+            metrics.incr("llm_tokens", output_tokens, task=task, model=model, kind="output")
+            price_in, price_out = settings.MODEL_PRICES.get(model, (0.0, 0.0))
+            billed_input = input_tokens - cached_tokens * (1 - settings.CACHED_INPUT_PRICE_RATIO)
+            cost = (billed_input * price_in + output_tokens * price_out) / 1_000_000
+            metrics.incr("llm_cost_usd", cost, task=task, model=model)
+            session = current_usage()
+            if session is not None:
+                session.add_llm(task, input_tokens, output_tokens, cost, cached_tokens)
+
     async def analyze_video_behavior(self, video_path: str) -> str:
         """Analyzes a video file for behavioral cues and expressions."""
-        # Video analysis via OpenRouter (Multimodal) requires sending image frames or video URL.
-        # For MVP, we will stub this or use a simple text fallback since we can't upload files to OpenRouter easily via this SDK yet.
-        # Alternatively, we could keep the Google SDK *just* for this if a GOOGLE_API_KEY is present.
-        
-        if settings.GOOGLE_API_KEY:
-             try:
-                import google.generativeai as genai
-                import time
-                genai.configure(api_key=settings.GOOGLE_API_KEY)
-                model = genai.GenerativeModel('gemini-1.5-flash')
-                
-                logger.info(f"Uploading video {video_path} to Google for analysis...")
-                video_file = genai.upload_file(path=video_path)
-                
-                while video_file.state.name == "PROCESSING":
-                    time.sleep(1)
-                    video_file = genai.get_file(video_file.name)
-                    
-                if video_file.state.name == "FAILED":
-                    raise ValueError("Video processing failed by Gemini.")
-                    
-                prompt = "Analyze this interview video clip. Describe the candidate's facial expressions, body language, and apparent confidence level. Be concise."
-                response = model.generate_content([video_file, prompt])
-                return response.text
-             except Exception as e:
-                 logger.error(f"Google Video Analysis failed: {e}")
-                 return "Video analysis unavailable (Check Google API Key)."
-        
-        return "Video analysis requires a valid GOOGLE_API_KEY in addition to OpenRouter."
+        # Preferred path: a small, deduplicated keyframe set sent to a multimodal model.
+        # Falls back to uploading the whole file to Google if frames can't be extracted.
+        try:
+            keyframes = await video_preprocessor.extract(video_path)
+        except Exception as e:
+            logger.warning(f"Keyframe extraction failed ({e}); falling back to full video upload.")
+            keyframes = None
 
-    async def generate_question(
-        self, 
+        if keyframes and keyframes.frames:
+            try:
+                return await self._analyze_keyframes(keyframes)
+            except Exception as e:
+                logger.error(f"Keyframe video analysis failed: {e}")
+
+        return await self._analyze_full_video(video_path)
+
+    async def _analyze_keyframes(self, keyframes: KeyframeSet) -> str:
+        """Sends timestamped JPEG keyframes to Gemini directly or through OpenRouter."""
+        if settings.VIDEO_ANALYSIS_PROVIDER == "gemini" and settings.GOOGLE_API_KEY:
+            parts = [VIDEO_KEYFRAMES_PROMPT]
+            for frame in keyframes.frames:
+                parts += [f"t={frame.timestamp:.1f}s", {"mime_type": "image/jpeg", "data": frame.jpeg}]
+            model = provider_clients.gemini_model('gemini-1.5-flash')
+            response = await model.generate_content_async(parts)
+            return response.text
+
+        content = [{"type": "text", "text": VIDEO_KEYFRAMES_PROMPT}]
+        for frame in keyframes.frames:
+            data_url = "data:image/jpeg;base64," + base64.b64encode(frame.jpeg).decode("ascii")
+            content.append({"type": "text", "text": f"t={frame.timestamp:.1f}s"})
+            content.append({"type": "image_url", "image_url": {"url": data_url}})
+        return await self._invoke("video", [{"role": "user", "content": content}])
+
+    async def _analyze_full_video(self, video_path: str) -> str:
+        """Uploads the whole clip to Google, waits for processing, and always deletes the remote file.
+
+        Raises on any failure, so the video job ends FAILED with the error.
+        """
+        if not settings.GOOGLE_API_KEY:
+            raise RuntimeError("Video analysis unavailable: keyframe analysis failed and no GOOGLE_API_KEY is set for full upload.")
+
+        loop = asyncio.get_running_loop()
+        genai = provider_clients.genai()
+        model = provider_clients.gemini_model('gemini-1.5-flash')
+        video_file = None
+        try:
+            logger.info(f"Uploading video {video_path} to Google for analysis...")
+            video_file = await loop.run_in_executor(None, lambda: genai.upload_file(path=video_path))
+
+            # Poll with exponential backoff instead of a fixed 1s busy loop
+            delay = settings.VIDEO_POLL_INITIAL_DELAY_S
+            deadline = loop.time() + settings.VIDEO_PROCESSING_TIMEOUT_S
+            while video_file.state.name == "PROCESSING":
+                if loop.time() > deadline:
+                    raise TimeoutError("Timed out waiting for Gemini to process the video.")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.VIDEO_POLL_MAX_DELAY_S)
+                name = video_file.name
+                video_file = await loop.run_in_executor(None, lambda: genai.get_file(name))
+
+            if video_file.state.name == "FAILED":
+                raise ValueError("Video processing failed by Gemini.")
+
+            response = await model.generate_content_async([video_file, VIDEO_ANALYSIS_PROMPT])
+            return response.text
+        except Exception as e:
+            logger.error(f"Google Video Analysis failed: {e}")
+            raise
+        finally:
+            if video_file is not None:
+                await self._delete_remote_file(genai, video_file.name)
+
+    async def _delete_remote_file(self, genai, name: str):
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: genai.delete_file(name))
+        except Exception as e:
+            logger.warning(f"Failed to delete remote Gemini file {name}: {e}")
+
+    def _question_prompt(
+        self,
         target_company: str,
         interview_style: str,
         job_role: str,
@@ -67,27 +404,43 @@ class GeminiService:
         total_questions: int,
         history: List[str],
         resume_text: str = None
-    ) -> str:
-        """Generates the next interview question based on context."""
-        
+    ) -> List[Dict[str, str]]:
         # Format history string
         history_text = "\n".join(history) if history else "No previous history."
         resume_context = resume_text if resume_text else "No resume provided."
         
-        prompt = QUESTION_PROMPT.format(
+        system = QUESTION_SYSTEM_PROMPT.format(
             target_company=target_company or "Generic Tech Company",
             interview_style=interview_style,
             job_role=job_role,
-            difficulty=difficulty,
             topic=topic or "General",
-            question_num=question_num,
             total_questions=total_questions,
-            history=history_text,
             resume_context=resume_context
         )
-        
-        response = await self.llm.ainvoke(prompt)
-        return response.content
+        return self._messages(system, QUESTION_TURN_PROMPT.format(
+            history=history_text,
+            question_num=question_num,
+            total_questions=total_questions,
+            difficulty=difficulty
+        ))
+
+    @staticmethod
+    def _messages(system: str, user: str) -> List[Dict[str, str]]:
+        """Session-stable instructions as the system message, per-turn values after them.
+
+        Keeps the prompt prefix byte-identical across a session's turns, which is
+        what provider-side prompt caching keys on.
+        """
+        return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+    async def generate_question(self, **kwargs) -> str:
+        """Generates the next interview question based on context."""
+        return await self._invoke("question", self._question_prompt(**kwargs))
+
+    async def stream_question(self, **kwargs) -> AsyncIterator[str]:
+        """Same as `generate_question`, yielding the text as the model produces it."""
+        async for text in self._stream("question", self._question_prompt(**kwargs)):
+            yield text
 
 
     async def generate_followup_question(
@@ -98,14 +451,12 @@ class GeminiService:
     ) -> str:
         """Generates a follow-up question based on the previous answer."""
         
-        prompt = FOLLOWUP_PROMPT.format(
-            target_company=target_company or "Generic Tech Company",
-            question=question,
-            answer=answer
+        prompt = self._messages(
+            FOLLOWUP_SYSTEM_PROMPT.format(target_company=target_company or "Generic Tech Company"),
+            FOLLOWUP_TURN_PROMPT.format(question=question, answer=answer)
         )
         
-        response = await self.llm.ainvoke(prompt)
-        return response.content
+        return await self._invoke("follow_up", prompt)
 
     async def analyze_response(
         self, 
@@ -116,20 +467,19 @@ class GeminiService:
     ) -> Dict[str, Any]:
         """Analyzes the candidate's answer and returns structured data."""
         
-        prompt = ANALYSIS_PROMPT.format(
-            question=question,
-            answer=answer,
-            job_role=job_role,
-            difficulty=difficulty
+        prompt = self._messages(
+            ANALYSIS_SYSTEM_PROMPT.format(job_role=job_role),
+            ANALYSIS_TURN_PROMPT.format(question=question, answer=answer, difficulty=difficulty)
         )
         
         try:
-            response = await self.json_llm.ainvoke(prompt)
-            content = response.content
-            # Cleanup json if needed
-            if "```json" in content:
-                content = content.replace("```json", "").replace("```", "").strip()
-            return json.loads(content)
+            content = await self._invoke("analysis", prompt, json_mode=True)
+            analysis = await parse_or_reask(
+                content, AnswerAnalysis, partial(self._reask_json, AnswerAnalysis)
+            )
+            return analysis.model_dump()
+        except DeadlineExceeded:
+            raise # The turn is out of time; a placeholder would be recorded as a real answer
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
             return {
@@ -141,6 +491,15 @@ class GeminiService:
                 "error": str(e)
             }
 
+    async def _reask_json(self, schema: Type[BaseModel], error: str, output: str) -> str:
+        """Asks the model to fix its own malformed JSON (much shorter than re-running the analysis)."""
+        prompt = STRUCTURED_REPAIR_PROMPT.format(
+            error=error,
+            fields=", ".join(schema.model_fields),
+            output=output[:2000]
+        )
+        return await self._invoke("analysis", prompt, json_mode=True)
+
     async def generate_final_report(
         self,
         target_company: str,
@@ -155,7 +514,6 @@ class GeminiService:
             interview_data=interview_data
         )
         
-        response = await self.llm.ainvoke(prompt)
-        return response.content
+        return await self._invoke("report", prompt)
 
 gemini_service = GeminiService()
@@ -0,0 +1,134 @@
+import io
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+
+class ExtractionError(Exception):
+    """No backend could extract any text from the document."""
+
+    def __init__(self, message: str, attempts: Dict[str, str]):
+        super().__init__(message)
+        self.attempts = attempts # backend -> why it was skipped
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    backend: str
+    pages: int
+    seconds: float
+    fallbacks: int = 0 # Backends tried before this one
+
+
+def _extract_pymupdf(data: bytes) -> List[str]:
+    import pymupdf
+
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return [page.get_text() for page in doc]
+
+
+def _extract_pypdf(data: bytes) -> List[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def _is_pdf(data: bytes) -> bool:
+    return b"%PDF-" in data[:1024] # The header may follow some junk bytes
+
+
+def _has_text_layer(data: bytes) -> bool:
+    # Text needs a font. Object streams (PDF 1.5+) compress resource dicts, so only
+    # a PDF without them can be told apart as image-only (a scan) from its raw bytes.
+    return b"/Font" in data or b"/ObjStm" in data
+
+
+def _extract_plain_text(data: bytes) -> List[str]:
+    # Some clients upload .txt/.md resumes with a .pdf name; take them as they are
+    if _is_pdf(data):
+        raise ValueError("binary PDF")
+    return [data.decode("utf-8")]
+
+
+def _available(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+# Fastest first, as measured by tests/bench_pdf_extraction.py
+BACKENDS: Dict[str, Callable[[bytes], List[str]]] = {
+    "pymupdf": _extract_pymupdf,
+    "pypdf": _extract_pypdf,
+    "text": _extract_plain_text,
+}
+_MODULES = {"pymupdf": "pymupdf", "pypdf": "pypdf"}
+
+
+class PdfExtractor:
+    """
+    Extracts resume text with the first installed backend in `order`, falling
+    through to the next one when a backend fails or returns only whitespace
+    (e.g. a font without a usable ToUnicode map in one library but not the other).
+
+    The document is looked at first: uploads that aren't PDFs go to the plain
+    text backend first, PDFs skip it, and a PDF without any fonts (a scan) is
+    rejected without running the parsers.
+    """
+
+    def __init__(self, order: Optional[List[str]] = None):
+        order = order or settings.PDF_EXTRACTION_BACKENDS
+        unknown = [name for name in order if name not in BACKENDS]
+        if unknown:
+            raise ValueError(f"Unknown PDF extraction backends: {unknown}")
+        self.backends = [name for name in order if name not in _MODULES or _available(_MODULES[name])]
+        missing = [name for name in order if name not in self.backends]
+        if missing:
+            logger.warning(f"PDF extraction backends not installed, skipping: {missing}")
+
+    def plan(self, data: bytes) -> List[str]:
+        """The backends worth trying on this document, in order."""
+        if not _is_pdf(data):
+            return sorted(self.backends, key=lambda name: name != "text")
+        return [name for name in self.backends if name != "text"]
+
+    def extract(self, data: bytes) -> ExtractionResult:
+        """Blocking; call from a worker thread."""
+        if _is_pdf(data) and not _has_text_layer(data):
+            metrics.incr("pdf_extraction_fallbacks", backend="inspection", reason="no_text_layer")
+            raise ExtractionError("PDF has no text layer", {"inspection": "no text"})
+
+        attempts = {}
+        for name in self.plan(data):
+            started = time.perf_counter()
+            try:
+                pages = BACKENDS[name](data)
+            except Exception as e:
+                attempts[name] = f"{type(e).__name__}: {e}"
+                metrics.incr("pdf_extraction_fallbacks", backend=name, reason="error")
+                continue
+            seconds = time.perf_counter() - started
+            text = "\n".join(page.strip("\n") for page in pages if page.strip())
+            if not text.strip():
+                attempts[name] = "no text"
+                metrics.incr("pdf_extraction_fallbacks", backend=name, reason="empty")
+                continue
+
+            metrics.observe("pdf_extraction_seconds", seconds, backend=name)
+            metrics.incr("pdf_extraction_pages", len(pages), backend=name)
+            if attempts:
+                logger.info(f"PDF extracted with {name} after {attempts}")
+            return ExtractionResult(text=text, backend=name, pages=len(pages), seconds=seconds, fallbacks=len(attempts))
+
+        raise ExtractionError("No text could be extracted", attempts)
+
+
+pdf_extractor = PdfExtractor()
@@ -0,0 +1,209 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+PROVIDER_BASE_URLS = {
+    "openrouter": "https://openrouter.ai/api/v1",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "assemblyai": "https://api.assemblyai.com",
+    "elevenlabs": "https://api.elevenlabs.io",
+}
+
+def _api_key(provider: str) -> str:
+    return {
+        "openrouter": settings.OPENROUTER_API_KEY,
+        "gemini": settings.GOOGLE_API_KEY,
+        "assemblyai": settings.ASSEMBLYAI_API_KEY,
+        "elevenlabs": settings.ELEVENLABS_API_KEY,
+    }[provider]
+
+class ConnectionStats:
+    """Counts requests vs. freshly opened TCP connections for one provider."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.new_connections += 1
+
+    @property
+    def reuse_ratio(self) -> Optional[float]:
+        if not self.requests:
+            return None
+        return max(0.0, 1.0 - self.new_connections / self.requests)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reuse_ratio": self.reuse_ratio,
+        }
+
+class ProviderClientRegistry:
+    """Owns long-lived, keep-alive clients for every upstream provider.
+
+    httpx clients are traced per request so /metrics can report how often a
+    pooled connection was reused instead of paying a fresh TCP + TLS handshake.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats = {name: ConnectionStats() for name in PROVIDER_BASE_URLS}
+        self._assemblyai_client = None
+        self._genai = None
+        self._gemini_models: Dict[str, Any] = {}
+        self._gemini_model_hits = 0
+
+    def _limits(self, provider: str) -> httpx.Limits:
+        max_connections = settings.PROVIDER_POOL_SIZES.get(provider, settings.PROVIDER_POOL_MAX_CONNECTIONS)
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(settings.PROVIDER_POOL_MAX_KEEPALIVE, max_connections),
+            keepalive_expiry=settings.PROVIDER_KEEPALIVE_EXPIRY,
+        )
+
+    def _sync_hook(self, provider: str):
+        stats = self._stats[provider]
+
+        def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                stats.record_connect()
+
+        def on_request(request: httpx.Request):
+            stats.record_request()
+            request.extensions["trace"] = trace
+
+        return on_request
+
+    def _async_hook(self, provider: str):
+        stats = self._stats[provider]
+
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                stats.record_connect()
+
+        async def on_request(request: httpx.Request):
+            stats.record_request()
+            request.extensions["trace"] = trace
+
+        return on_request
+
+    def sync_client(self, provider: str) -> httpx.Client:
+        with self._lock:
+            if provider not in self._sync_clients:
+                self._sync_clients[provider] = httpx.Client(
+                    base_url=PROVIDER_BASE_URLS[provider],
+                    limits=self._limits(provider),
+                    timeout=settings.PROVIDER_TIMEOUT,
+                    event_hooks={"request": [self._sync_hook(provider)]},
+                )
+            return self._sync_clients[provider]
+
+    def async_client(self, provider: str) -> httpx.AsyncClient:
+        with self._lock:
+            if provider not in self._async_clients:
+                self._async_clients[provider] = httpx.AsyncClient(
+                    base_url=PROVIDER_BASE_URLS[provider],
+                    limits=self._limits(provider),
+                    timeout=settings.PROVIDER_TIMEOUT,
+                    event_hooks={"request": [self._async_hook(provider)]},
+                )
+            return self._async_clients[provider]
+
+    def assemblyai_client(self):
+        """Shared AssemblyAI SDK client. The SDK builds its own httpx pool, so we
+        only set its keep-alive expiry and attach the reuse tracer."""
+        with self._lock:
+            if self._assemblyai_client is None:
+                import assemblyai as aai
+                aai_settings = aai.settings.copy()
+                aai_settings.api_key = settings.ASSEMBLYAI_API_KEY
+                aai_settings.keepalive_expiry = settings.PROVIDER_KEEPALIVE_EXPIRY
+                client = aai.Client(settings=aai_settings)
+                client.http_client.event_hooks["request"].append(self._sync_hook("assemblyai"))
+                self._assemblyai_client = client
+            return self._assemblyai_client
+
+    def genai(self):
+        """The google.generativeai module, configured once with our API key."""
+        with self._lock:
+            if self._genai is None:
+                import google.generativeai as genai
+                genai.configure(api_key=settings.GOOGLE_API_KEY)
+                self._genai = genai
+            return self._genai
+
+    def gemini_model(self, model_name: str):
+        """Cached GenerativeModel; its underlying gRPC channel stays open between calls."""
+        genai = self.genai()
+        with self._lock:
+            if model_name in self._gemini_models:
+                self._gemini_model_hits += 1
+            else:
+                self._gemini_models[model_name] = genai.GenerativeModel(model_name)
+            return self._gemini_models[model_name]
+
+    async def warm_up(self):
+        """Opens keep-alive connections to every configured provider ahead of traffic."""
+        n = settings.PROVIDER_WARMUP_CONNECTIONS
+        loop = asyncio.get_running_loop()
+        tasks = []
+
+        async def _ping_async(client: httpx.AsyncClient):
+            await client.head("/")
+
+        def _ping_sync(client: httpx.Client):
+            client.head("/")
+
+        for provider in PROVIDER_BASE_URLS:
+            if not _api_key(provider):
+                continue
+            if provider == "openrouter":
+                client = self.async_client(provider)
+                tasks += [_ping_async(client) for _ in range(n)]
+            elif provider == "gemini":
+                tasks.append(loop.run_in_executor(None, self.gemini_model, "gemini-1.5-flash"))
+            elif provider == "assemblyai":
+                client = self.assemblyai_client().http_client
+                tasks += [loop.run_in_executor(None, _ping_sync, client) for _ in range(n)]
+            else:
+                client = self.sync_client(provider)
+                tasks += [loop.run_in_executor(None, _ping_sync, client) for _ in range(n)]
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        for failure in failures:
+            logger.warning(f"Provider warm-up request failed: {failure}")
+        logger.info(f"Provider warm-up complete ({len(results) - len(failures)}/{len(results)} ok)")
+
+    def stats(self) -> Dict[str, Any]:
+        report = {name: stats.as_dict() for name, stats in self._stats.items()}
+        lookups = self._gemini_model_hits + len(self._gemini_models)
+        report["gemini"]["model_reuse_ratio"] = self._gemini_model_hits / lookups if lookups else None
+        return report
+
+    async def aclose(self):
+        for client in self._async_clients.values():
+            await client.aclose()
+        for client in self._sync_clients.values():
+            client.close()
+        self._async_clients.clear()
+        self._sync_clients.clear()
+
+provider_clients = ProviderClientRegistry()
+metrics.register_collector("provider_connections", provider_clients.stats)
@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import io
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+# A4 in points, with 54pt (3/4 inch) margins
+PAGE_SIZE = (595, 842)
+MARGIN = 54
+STREAM_CHUNK_BYTES = 64 * 1024
+
+REPORT_CSS = """
+body { font-family: sans-serif; font-size: 10.5pt; line-height: 1.4; }
+h1 { font-size: 20pt; margin-bottom: 8pt; }
+h2 { font-size: 15pt; margin-top: 14pt; }
+h3 { font-size: 12pt; margin-top: 10pt; }
+code, pre { font-family: monospace; font-size: 9pt; }
+th, td { border: 1px solid #999; padding: 3pt; }
+"""
+
+
+def render_report_pdf(markdown: str, title: str) -> bytes:
+    """Markdown report -> PDF bytes. CPU-bound; runs in the export process pool."""
+    import pymupdf
+    from markdown_it import MarkdownIt
+
+    html = MarkdownIt("commonmark").enable("table").render(markdown)
+    story = pymupdf.Story(html=html, user_css=REPORT_CSS)
+    page = pymupdf.Rect(0, 0, *PAGE_SIZE)
+    body = page + (MARGIN, MARGIN, -MARGIN, -MARGIN)
+
+    buffer = io.BytesIO()
+    writer = pymupdf.DocumentWriter(buffer)
+    more = True
+    while more:
+        device = writer.begin_page(page)
+        more, _ = story.place(body)
+        story.draw(device)
+        writer.end_page()
+    writer.close()
+
+    # Story output has no metadata; set the title so viewers don't show "Untitled"
+    with pymupdf.open(stream=buffer.getvalue(), filetype="pdf") as doc:
+        doc.set_metadata({"title": title, "producer": settings.PROJECT_NAME})
+        return doc.tobytes(garbage=3, deflate=True)
+
+
+def report_digest(markdown: str) -> str:
+    return hashlib.sha256(markdown.encode()).hexdigest()
+
+
+class ReportPdfExporter:
+    """
+    Renders final reports to PDF in a process pool, so exports (however many
+    recruiters run at once) never hold the event loop or the GIL interview
+    turns need. Rendered PDFs are cached by (session, report hash) in an LRU
+    bounded by total bytes; concurrent exports of the same report share one render.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._rendering: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if settings.REPORT_PDF_WORKERS <= 0:
+            return None  # Default thread pool
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=settings.REPORT_PDF_WORKERS)
+        return self._executor
+
+    async def export(self, session_id: str, markdown: str, title: str = "Interview Report") -> bytes:
+        key = (session_id, report_digest(markdown))
+        pdf = self._cache.get(key)
+        if pdf is not None:
+            self._cache.move_to_end(key)
+            metrics.incr("report_pdf_cache", result="hit")
+            return pdf
+
+        rendering = self._rendering.get(key)
+        if rendering is not None:
+            metrics.incr("report_pdf_cache", result="joined")
+            return await asyncio.shield(rendering)
+
+        metrics.incr("report_pdf_cache", result="miss")
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        rendering = loop.run_in_executor(self._get_executor(), render_report_pdf, markdown, title)
+        self._rendering[key] = rendering
+        try:
+            # Shielded: one client going away doesn't cancel a render others are waiting on
+            pdf = await asyncio.shield(rendering)
+        finally:
+            if rendering.done():
+                self._rendering.pop(key, None)
+            else:
+                rendering.add_done_callback(lambda _: self._rendering.pop(key, None))
+
+        seconds = time.perf_counter() - started
+        metrics.observe("report_pdf_render_seconds", seconds)
+        logger.info(f"Report PDF for {session_id}: {len(pdf)} bytes in {seconds * 1000:.0f}ms")
+        self._store(key, pdf)
+        return pdf
+
+    def cached_size(self, session_id: str, markdown: str) -> int:
+        """Bytes of the cached PDF for this report version (0 if not cached)."""
+        return len(self._cache.get((session_id, report_digest(markdown)), b""))
+
+    def _store(self, key: Tuple[str, str], pdf: bytes):
+        if len(pdf) > settings.REPORT_PDF_CACHE_MAX_BYTES:
+            return
+        if key in self._cache:
+            self._cache_bytes -= len(self._cache.pop(key))
+        # A session's older report versions are never asked for again
+        for stale in [k for k in self._cache if k[0] == key[0]]:
+            self._cache_bytes -= len(self._cache.pop(stale))
+        self._cache[key] = pdf
+        self._cache_bytes += len(pdf)
+        while self._cache_bytes > settings.REPORT_PDF_CACHE_MAX_BYTES:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+            metrics.incr("report_pdf_evictions")
+
+    def stats(self) -> dict:
+        return {"cached": len(self._cache), "cached_bytes": self._cache_bytes, "rendering": len(self._rendering)}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def iter_chunks(data: bytes, size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    view = memoryview(data)
+    for start in range(0, len(data), size):
+        yield bytes(view[start:start + size])
+
+
+report_pdf_exporter = ReportPdfExporter()
+metrics.register_collector("report_pdf", report_pdf_exporter.stats)
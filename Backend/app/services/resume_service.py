@@ -1,31 +1,25 @@
-import io
-from pypdf import PdfReader
+import asyncio
 from fastapi import UploadFile
 
+from app.core.logging_config import logger
+from app.services.pdf_extraction import ExtractionError, pdf_extractor
+
 class ResumeService:
     async def extract_text(self, file: UploadFile) -> str:
         """Extracts text from a PDF file."""
         content = await file.read()
-        file_obj = io.BytesIO(content)
-        
+        if not content:
+            return "Error: Empty PDF or parsing failed."
+
         try:
-            reader = PdfReader(file_obj)
-            text = ""
-            if not reader.pages:
-                return "Error: Empty PDF or parsing failed."
-                
-            for page in reader.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-            
-            if not text.strip():
+            result = await asyncio.to_thread(pdf_extractor.extract, content)
+        except ExtractionError as e:
+            logger.warning(f"Resume extraction failed: {e.attempts}")
+            if any(reason == "no text" for reason in e.attempts.values()):
                 return "Warning: No text could be extracted from this PDF. It might be an image scan."
-                
-            return text
-        except Exception as e:
-            # Fallback for non-pdf or error
-            print(f"Error in extract_text: {e}") # Print to stdout to capture in logs
-            return f"Error extracting resume: {str(e)}"
+            return f"Error extracting resume: {e}"
+
+        logger.info(f"Resume extracted with {result.backend}: {result.pages} pages in {result.seconds * 1000:.0f}ms")
+        return result.text
 
 resume_service = ResumeService()
@@ -0,0 +1,136 @@
+import os
+import asyncio
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.usage import current_usage
+from app.services.audio_preprocessing import encode_wav
+
+class StreamingTranscription(ABC):
+    """A live STT session fed with 16-bit little-endian mono PCM chunks.
+
+    Subclasses keep `partial_transcript` updated as audio arrives and return the
+    final transcript from `finish()`.
+    """
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.partial_transcript = ""
+
+    async def start(self):
+        pass
+
+    @abstractmethod
+    async def feed(self, chunk: bytes) -> str:
+        """Sends a chunk of audio and returns the current rolling partial transcript."""
+
+    @abstractmethod
+    async def finish(self) -> str:
+        """Flushes remaining audio and returns the final transcript."""
+
+    async def abort(self):
+        pass
+
+
+class BufferedStreamingTranscription(StreamingTranscription):
+    """Fallback for providers without streaming: buffers audio, transcribes on finish."""
+
+    def __init__(self, sample_rate: int, transcribe: Callable):
+        super().__init__(sample_rate)
+        self._transcribe = transcribe
+        self._chunks: List[bytes] = []
+
+    async def feed(self, chunk: bytes) -> str:
+        self._chunks.append(chunk)
+        return self.partial_transcript
+
+    async def finish(self) -> str:
+        pcm = np.frombuffer(b"".join(self._chunks), dtype="<i2").astype(np.float32) / 32768.0
+        fd, path = tempfile.mkstemp(suffix=".wav", prefix="stream_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode_wav(pcm, self.sample_rate))
+            return await self._transcribe(path)
+        finally:
+            os.remove(path)
+
+
+class AssemblyAIStreamingTranscription(StreamingTranscription):
+    """AssemblyAI Universal Streaming (v3) session.
+
+    The SDK client is synchronous and delivers events on its own thread, so
+    blocking calls run in the default executor and turn events are folded into
+    the rolling transcript under the GIL.
+    """
+
+    # AssemblyAI accepts 50-1000ms of audio per message
+    MIN_CHUNK_MS = 100
+
+    def __init__(self, sample_rate: int, api_key: str):
+        super().__init__(sample_rate)
+        from assemblyai.streaming.v3 import StreamingClient, StreamingClientOptions
+
+        self._client = StreamingClient(StreamingClientOptions(api_key=api_key))
+        self._final_turns: List[str] = []
+        self._pending = bytearray()
+        self._bytes_sent = 0
+        self._min_chunk_bytes = sample_rate * 2 * self.MIN_CHUNK_MS // 1000
+
+    def _on_turn(self, client, event):
+        if event.end_of_turn:
+            self._final_turns.append(event.transcript)
+            self.partial_transcript = " ".join(self._final_turns)
+        else:
+            self.partial_transcript = " ".join(self._final_turns + [event.transcript]).strip()
+
+    def _on_error(self, client, error):
+        logger.error(f"AssemblyAI streaming error: {error}")
+
+    async def start(self):
+        from assemblyai.streaming.v3 import StreamingEvents, StreamingParameters
+
+        self._client.on(StreamingEvents.Turn, self._on_turn)
+        self._client.on(StreamingEvents.Error, self._on_error)
+        params = StreamingParameters(sample_rate=self.sample_rate, format_turns=True)
+        await asyncio.get_running_loop().run_in_executor(None, self._client.connect, params)
+
+    async def feed(self, chunk: bytes) -> str:
+        self._pending.extend(chunk)
+        if len(self._pending) >= self._min_chunk_bytes:
+            data, self._pending = bytes(self._pending), bytearray()
+            await asyncio.get_running_loop().run_in_executor(None, self._client.stream, data)
+            self._bytes_sent += len(data)
+        return self.partial_transcript
+
+    async def finish(self) -> str:
+        loop = asyncio.get_running_loop()
+        if self._pending:
+            await loop.run_in_executor(None, self._client.stream, bytes(self._pending))
+            self._bytes_sent += len(self._pending)
+            self._pending = bytearray()
+        # terminate=True waits for the provider to flush the last turn
+        await loop.run_in_executor(None, lambda: self._client.disconnect(terminate=True))
+        self._record_usage()
+        return self.partial_transcript.strip()
+
+    async def abort(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._client.disconnect)
+        self._record_usage()
+
+    def _record_usage(self):
+        session = current_usage()
+        if session is not None and self._bytes_sent:
+            session.add_stt("assemblyai", self._bytes_sent / (2 * self.sample_rate))
+            self._bytes_sent = 0
+
+
+# name -> factory(sample_rate) ; extended by tests and future providers
+STREAMING_BACKENDS: Dict[str, Callable[[int], StreamingTranscription]] = {}
+
+def register_streaming_backend(name: str, factory: Callable[[int], StreamingTranscription]):
+    STREAMING_BACKENDS[name] = factory
@@ -0,0 +1,163 @@
+import json
+import re
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+T = TypeVar("T", bound=BaseModel)
+
+OUTCOMES = ("ok", "repaired", "reasked", "failed")
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+# A trailing member cut off before its value finished: `, "key": tru` / `{"key"`
+_PARTIAL_MEMBER_RE = re.compile(r'([,{])\s*"[^"]*"\s*(?::\s*[^,{}\[\]"]*)?$')
+
+class StructuredOutputError(Exception):
+    """Model output could not be parsed into the schema, even after repair."""
+
+def _drop_trailing_comma(out: List[str]):
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+def repair_json(text: str) -> str:
+    """Local fixes for the usual LLM JSON defects, in one string-aware pass.
+
+    Strips markdown fences, prose around the object, // and /* */ comments and
+    trailing commas, and closes strings/brackets left open by truncation.
+    """
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start = text.find("{")
+    if start < 0:
+        return text.strip()
+    text = text[start:]
+
+    out: List[str] = []
+    closers: List[str] = []
+    in_string = escaped = False
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if in_string:
+            out.append(c)
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+            i += 1
+            continue
+
+        if c == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if c == "/" and text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+
+        if c == '"':
+            in_string = True
+        elif c in "{[":
+            closers.append("}" if c == "{" else "]")
+        elif c in "}]":
+            _drop_trailing_comma(out)
+            out.append(c)
+            if closers:
+                closers.pop()
+            if not closers:
+                break # End of the top-level object; ignore whatever follows
+            i += 1
+            continue
+        out.append(c)
+        i += 1
+
+    if not closers:
+        return "".join(out)
+
+    # Truncated: close the open string, drop a half-written member, close brackets
+    if in_string:
+        out.append('"')
+    repaired = "".join(out).rstrip()
+    if repaired.endswith(","):
+        repaired = repaired[:-1]
+    candidate = repaired + "".join(reversed(closers))
+    try:
+        json.loads(candidate)
+        return candidate
+    except ValueError:
+        trimmed = _PARTIAL_MEMBER_RE.sub(lambda m: "{" if m.group(1) == "{" else "", repaired)
+        return trimmed + "".join(reversed(closers))
+
+def parse_structured(text: str, schema: Type[T]) -> Tuple[T, bool]:
+    """Parses and validates model output. Returns (instance, repaired)."""
+    try:
+        return schema.model_validate_json(text), False
+    except ValidationError as strict_error:
+        try:
+            return schema.model_validate_json(repair_json(text)), True
+        except ValidationError as e:
+            raise StructuredOutputError(_describe(e)) from strict_error
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'json'}: {err['msg']}" for err in error.errors()[:5]
+    )
+
+async def parse_or_reask(
+    text: str,
+    schema: Type[T],
+    reask: Callable[[str, str], Awaitable[str]]
+) -> T:
+    """Parses `text` into `schema`, repairing locally first.
+
+    Only if that fails is `reask(error, previous_output)` called: a short
+    correction request instead of a full regeneration. Raises
+    StructuredOutputError if the corrected output doesn't parse either.
+    """
+    name = schema.__name__
+    try:
+        result, repaired = parse_structured(text, schema)
+        _record(name, "repaired" if repaired else "ok")
+        return result
+    except StructuredOutputError as e:
+        logger.warning(f"{name}: output not parseable after repair ({e}); re-asking")
+        error = str(e)
+
+    try:
+        result, _ = parse_structured(await reask(error, text), schema)
+    except Exception:
+        _record(name, "failed")
+        raise
+    _record(name, "reasked")
+    return result
+
+_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(OUTCOMES, 0))
+
+def _record(schema_name: str, outcome: str):
+    _counts[schema_name][outcome] += 1
+    metrics.incr("structured_output", schema=schema_name, outcome=outcome)
+
+def stats() -> Dict[str, Any]:
+    """Per schema: outcome counts and rates. parse_failure_rate covers everything that wasn't clean JSON."""
+    report = {}
+    for name, counts in _counts.items():
+        total = sum(counts.values())
+        report[name] = {
+            **counts,
+            "parse_failure_rate": (total - counts["ok"]) / total if total else None,
+            "repair_rate": counts["repaired"] / total if total else None,
+            "reask_rate": (counts["reasked"] + counts["failed"]) / total if total else None,
+        }
+    return report
+
+metrics.register_collector("structured_output", stats)
@@ -0,0 +1,164 @@
+import os
+import re
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.services.voice_service import voice_service
+
+AUDIO_DIR = os.path.join("static", "audio")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_sentences(text: str, min_chars: int) -> List[str]:
+    """Splits text at sentence boundaries, merging sentences into segments of at least min_chars."""
+    segments: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        current = f"{current} {sentence}".strip()
+        if len(current) >= min_chars:
+            segments.append(current)
+            current = ""
+    if current:
+        if segments and len(current) < min_chars // 2:
+            segments[-1] = f"{segments[-1]} {current}"
+        else:
+            segments.append(current)
+    return segments
+
+class AudioStream:
+    """A single synthesis job that any number of listeners can tail while it runs."""
+
+    def __init__(self, audio_id: str, path: str):
+        self.audio_id = audio_id
+        self.path = path
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[str] = None
+        self._changed = asyncio.Condition()
+
+    async def append(self, chunk: bytes):
+        async with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    async def close(self, error: Optional[str] = None):
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def wait_done(self):
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.done)
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yields every chunk from the beginning, then new ones as they arrive."""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                pending = self.chunks[index:]
+                finished = self.done
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+            if finished and index >= len(self.chunks):
+                return
+
+class TTSStreamManager:
+    """Starts question TTS in the background and serves it while it is still being synthesized.
+
+    Audio IDs are content-addressed (provider + voice + text), so a repeated question
+    reuses the stream or the finished file instead of synthesizing again. A question
+    is voiced by one provider, chosen when it starts; its segments don't fail over
+    separately.
+    """
+
+    def __init__(self):
+        self._streams: "OrderedDict[str, AudioStream]" = OrderedDict()
+        self._tasks = set()
+
+    @staticmethod
+    def audio_id_for(text: str, provider: str) -> str:
+        # Files are served as immutable, so fallback audio must not share the primary voice's ID
+        voice = f"{settings.ELEVENLABS_VOICE_ID}|{settings.ELEVENLABS_MODEL_ID}" if provider == "tts.elevenlabs" else ""
+        key = f"{provider}|{voice}|{text}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def path_for(audio_id: str) -> str:
+        return os.path.join(AUDIO_DIR, f"{audio_id}.mp3")
+
+    def get(self, audio_id: str) -> Optional[AudioStream]:
+        return self._streams.get(audio_id)
+
+    def start(self, text: str) -> Optional[str]:
+        """Schedules synthesis of `text` (if needed) and returns its audio ID immediately; None if no TTS provider can serve it."""
+        provider = voice_service.tts_provider()
+        if provider is None:
+            return None
+        audio_id = self.audio_id_for(text, provider)
+        path = self.path_for(audio_id)
+        existing = self._streams.get(audio_id)
+        if existing and existing.error:
+            del self._streams[audio_id] # Retry failed synthesis
+        elif existing or os.path.exists(path):
+            return audio_id
+
+        stream = AudioStream(audio_id, path)
+        self._streams[audio_id] = stream
+        task = asyncio.create_task(self._synthesize(stream, text, provider))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return audio_id
+
+    async def _synthesize(self, stream: AudioStream, text: str, provider: str):
+        segments = split_sentences(text, settings.TTS_MIN_SEGMENT_CHARS)
+        limit = asyncio.Semaphore(settings.TTS_PARALLEL_SEGMENTS)
+        queues = [asyncio.Queue() for _ in segments]
+
+        async def produce(segment: str, queue: asyncio.Queue):
+            async with limit:
+                try:
+                    async for chunk in voice_service.stream_audio(segment, provider):
+                        queue.put_nowait(chunk)
+                    queue.put_nowait(None)
+                except Exception as e:
+                    queue.put_nowait(e)
+
+        producers = [asyncio.create_task(produce(seg, q)) for seg, q in zip(segments, queues)]
+        try:
+            # Segments are synthesized concurrently but emitted strictly in order
+            for queue in queues:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    await stream.append(item)
+
+            os.makedirs(AUDIO_DIR, exist_ok=True)
+            tmp_path = f"{stream.path}.part"
+            with open(tmp_path, "wb") as f:
+                f.write(b"".join(stream.chunks))
+            os.replace(tmp_path, stream.path)
+            await stream.close()
+        except Exception as e:
+            logger.error(f"TTS failed: {e}")
+            await stream.close(error=str(e))
+        finally:
+            for producer in producers:
+                producer.cancel()
+            self._prune()
+
+    def _prune(self):
+        finished = [k for k, s in self._streams.items() if s.done]
+        for audio_id in finished[: max(0, len(self._streams) - settings.TTS_STREAMS_RETAINED)]:
+            del self._streams[audio_id]
+
+tts_streams = TTSStreamManager()
@@ -0,0 +1,147 @@
+import os
+import time
+import asyncio
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+from app.services.gemini_service import gemini_service
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+FINAL_STATES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+class JobQueueFull(Exception):
+    pass
+
+@dataclass
+class VideoJob:
+    job_id: str
+    video_path: str
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "analysis": self.result,
+            "error": self.error,
+        }
+
+class VideoJobManager:
+    """Runs video analysis in the background with a fixed number of workers.
+
+    The local upload is owned by the job and deleted once the job reaches a
+    final state; remote (Gemini) file handles are cleaned up by the service.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, VideoJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=settings.VIDEO_JOB_QUEUE_SIZE)
+            self._workers = [
+                asyncio.create_task(self._worker(i)) for i in range(settings.VIDEO_JOB_WORKERS)
+            ]
+
+    def submit(self, video_path: str) -> VideoJob:
+        self._ensure_workers()
+        self._prune()
+        job = VideoJob(job_id=str(uuid4()), video_path=video_path)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull("Video analysis queue is full")
+        self._jobs[job.job_id] = job
+        metrics.incr("video_jobs_submitted")
+        metrics.set_gauge("video_jobs_queued", self._queue.qsize())
+        return job
+
+    def get(self, job_id: str) -> Optional[VideoJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[VideoJob]:
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINAL_STATES:
+            return job
+        if job.status == JobStatus.RUNNING and job.task:
+            job.task.cancel()
+        else:
+            # Still queued; the worker skips it when dequeued
+            self._finish(job, JobStatus.CANCELLED)
+        return job
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job = await self._queue.get()
+            metrics.set_gauge("video_jobs_queued", self._queue.qsize())
+            try:
+                if job.status == JobStatus.CANCELLED:
+                    continue
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                job.task = asyncio.create_task(gemini_service.analyze_video_behavior(job.video_path))
+                try:
+                    job.result = await job.task
+                    self._finish(job, JobStatus.COMPLETED)
+                except asyncio.CancelledError:
+                    if not job.task.cancelled():
+                        raise # The worker itself is shutting down
+                    self._finish(job, JobStatus.CANCELLED)
+                except Exception as e:
+                    logger.error(f"Video job {job.job_id} failed: {e}")
+                    job.error = str(e)
+                    self._finish(job, JobStatus.FAILED)
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, job: VideoJob, status: JobStatus):
+        job.status = status
+        job.finished_at = time.time()
+        job.task = None
+        metrics.incr("video_jobs_finished", status=status.value)
+        if job.started_at:
+            metrics.observe("video_job_seconds", job.finished_at - job.started_at)
+        if os.path.exists(job.video_path):
+            os.remove(job.video_path)
+
+    def _prune(self):
+        cutoff = time.time() - settings.VIDEO_JOB_RETENTION_S
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in FINAL_STATES and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def stop(self):
+        for job in list(self._jobs.values()):
+            self.cancel(job.job_id)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+video_jobs = VideoJobManager()
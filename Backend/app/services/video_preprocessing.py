@@ -0,0 +1,131 @@
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import metrics
+
+@dataclass
+class Keyframe:
+    timestamp: float
+    jpeg: bytes
+    phash: int
+
+@dataclass
+class KeyframeSet:
+    original_bytes: int
+    duration_s: float
+    sampled: int = 0
+    frames: List[Keyframe] = field(default_factory=list)
+
+    @property
+    def uploaded_bytes(self) -> int:
+        return sum(len(f.jpeg) for f in self.frames)
+
+def dhash(gray: np.ndarray) -> int:
+    """64-bit difference hash of a 9x8 grayscale thumbnail."""
+    bits = (gray[:, 1:] > gray[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def select_evenly(frames: List[Keyframe], limit: int) -> List[Keyframe]:
+    if len(frames) <= limit:
+        return frames
+    picks = np.linspace(0, len(frames) - 1, limit).round().astype(int)
+    return [frames[i] for i in picks]
+
+def extract_keyframes(
+    path: str,
+    fps: float,
+    max_width: int,
+    jpeg_quality: int,
+    max_frames: int,
+    dedupe_distance: int,
+) -> KeyframeSet:
+    """Samples frames at `fps`, downscales, drops near-duplicates and JPEG-encodes the rest."""
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video: {path}")
+
+    source_fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    total_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    step = max(1, int(round(source_fps / fps)))
+    result = KeyframeSet(original_bytes=os.path.getsize(path), duration_s=total_frames / source_fps)
+
+    index = 0
+    last_hash: Optional[int] = None
+    try:
+        # grab() skips frames without decoding them to BGR; retrieve() only the sampled ones
+        while capture.grab():
+            if index % step == 0:
+                ok, frame = capture.retrieve()
+                if ok:
+                    result.sampled += 1
+                    height, width = frame.shape[:2]
+                    if width > max_width:
+                        frame = cv2.resize(frame, (max_width, int(height * max_width / width)), interpolation=cv2.INTER_AREA)
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    phash = dhash(cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA))
+
+                    if last_hash is None or hamming(phash, last_hash) > dedupe_distance:
+                        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+                        if ok:
+                            result.frames.append(Keyframe(index / source_fps, jpeg.tobytes(), phash))
+                            last_hash = phash
+            index += 1
+    finally:
+        capture.release()
+
+    result.frames = select_evenly(result.frames, max_frames)
+    return result
+
+class VideoPreprocessor:
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if settings.VIDEO_PREPROCESS_WORKERS <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=settings.VIDEO_PREPROCESS_WORKERS)
+        return self._executor
+
+    async def extract(self, path: str) -> KeyframeSet:
+        """Extracts the compact keyframe set for a video off the event loop."""
+        loop = asyncio.get_running_loop()
+        keyframes = await loop.run_in_executor(
+            self._get_executor(),
+            extract_keyframes,
+            path,
+            settings.VIDEO_KEYFRAME_FPS,
+            settings.VIDEO_KEYFRAME_MAX_WIDTH,
+            settings.VIDEO_KEYFRAME_JPEG_QUALITY,
+            settings.VIDEO_KEYFRAME_MAX_FRAMES,
+            settings.VIDEO_KEYFRAME_DEDUPE_DISTANCE,
+        )
+
+        metrics.incr("video_bytes_original", keyframes.original_bytes)
+        metrics.incr("video_bytes_uploaded", keyframes.uploaded_bytes)
+        ratio = keyframes.uploaded_bytes / keyframes.original_bytes if keyframes.original_bytes else 0.0
+        logger.info(
+            f"Video keyframes: {len(keyframes.frames)}/{keyframes.sampled} sampled frames kept "
+            f"from {keyframes.duration_s:.1f}s; uploading {keyframes.uploaded_bytes} bytes "
+            f"vs {keyframes.original_bytes} original ({ratio:.1%})"
+        )
+        return keyframes
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+video_preprocessor = VideoPreprocessor()
@@ -1,123 +1,323 @@
 import os
+import wave
 import asyncio
-from typing import Optional
-import assemblyai as aai
-from elevenlabs.client import ElevenLabs
+import importlib.util
+import tempfile
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional
 
+from app.core.circuit_breaker import BreakerState, CircuitBreaker, CircuitOpen, breakers
 from app.core.config import settings
-from app.core.logging_config import logger
+from app.core.logging_config import logger, turn_logger
+from app.core.usage import current_usage
+from app.services.audio_preprocessing import audio_preprocessor
+from app.services.provider_clients import provider_clients
+from app.services.streaming_stt import (
+    STREAMING_BACKENDS,
+    AssemblyAIStreamingTranscription,
+    BufferedStreamingTranscription,
+    StreamingTranscription,
+    register_streaming_backend,
+)
+
+_UNSET = object()
+_GTTS_INSTALLED = importlib.util.find_spec("gtts") is not None
+_PROBES = set() # Background half-open probes (see _healthy)
 
 class VoiceService:
+    """Speech-to-text and text-to-speech.
+
+    Provider SDK clients are created on first use (or by `warm_up` at startup);
+    assemblyai and elevenlabs are not imported until then. Each provider sits
+    behind a circuit breaker, so an outage costs one probe per BREAKER_OPEN_S
+    instead of a timeout on every request.
+    """
+
     def __init__(self):
-        # Initialize AssemblyAI
-        if settings.ASSEMBLYAI_API_KEY:
-            aai.settings.api_key = settings.ASSEMBLYAI_API_KEY
-            self.transcriber = aai.Transcriber()
-        else:
-            logger.warning("AssemblyAI API Key not found. STT will be disabled.")
-            self.transcriber = None
+        self._lock = threading.Lock()
+        self._transcriber = _UNSET
+        self._elevenlabs = _UNSET
 
-        # Initialize ElevenLabs
-        if settings.ELEVENLABS_API_KEY:
-            self.elevenlabs = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
-        else:
-            logger.warning("ElevenLabs API Key not found. TTS will be disabled.")
-            self.elevenlabs = None
+    @property
+    def transcriber(self):
+        if self._transcriber is _UNSET:
+            with self._lock:
+                if self._transcriber is _UNSET:
+                    # Initialize AssemblyAI
+                    if settings.ASSEMBLYAI_API_KEY:
+                        import assemblyai as aai
+                        self._transcriber = aai.Transcriber(client=provider_clients.assemblyai_client())
+                    else:
+                        logger.warning("AssemblyAI API Key not found. STT will be disabled.")
+                        self._transcriber = None
+        return self._transcriber
+
+    @property
+    def elevenlabs(self):
+        if self._elevenlabs is _UNSET:
+            with self._lock:
+                if self._elevenlabs is _UNSET:
+                    # Initialize ElevenLabs
+                    if settings.ELEVENLABS_API_KEY:
+                        from elevenlabs.client import ElevenLabs
+                        self._elevenlabs = ElevenLabs(
+                            api_key=settings.ELEVENLABS_API_KEY,
+                            httpx_client=provider_clients.sync_client("elevenlabs")
+                        )
+                    else:
+                        logger.warning("ElevenLabs API Key not found. TTS will be disabled.")
+                        self._elevenlabs = None
+        return self._elevenlabs
+
+    @property
+    def ready(self) -> bool:
+        return self._transcriber is not _UNSET and self._elevenlabs is not _UNSET
+
+    def warm_up(self):
+        """Creates the provider clients ahead of the first request (blocking; run in an executor)."""
+        self.transcriber
+        self.elevenlabs
 
     async def transcribe_audio(self, file_path: str) -> str:
-        """Transcribes audio file using Google Gemini (Fallbacks to AssemblyAI if needed)."""
-        
-        # Method 1: Google Gemini (Multimodal) - Robust & supports many formats without FFMPEG
+        """Transcribes audio file, downsampling and trimming silence before upload."""
+        processed_path = None
+        if settings.AUDIO_PREPROCESSING_ENABLED:
+            processed_path = await audio_preprocessor.preprocess_file(file_path)
+
+        try:
+            return await self._transcribe_file(processed_path or file_path)
+        finally:
+            if processed_path and os.path.exists(processed_path):
+                os.remove(processed_path)
+
+    async def _transcribe_file(self, file_path: str) -> str:
+        """Transcribes with the healthiest configured provider (see BreakerRegistry.ordered; Gemini, then AssemblyAI among equals)."""
+        providers = {}
         if settings.GOOGLE_API_KEY:
+            providers["stt.gemini"] = self._transcribe_gemini
+        if self.transcriber:
+            providers["stt.assemblyai"] = self._transcribe_assemblyai
+        if not providers:
+            raise ValueError("No Transcription service available (Gemini or AssemblyAI). check API Keys.")
+
+        last_error = None
+        probe = lambda name: self._probe_transcription(providers[name])
+        for breaker in _healthy(list(providers), probe):
             try:
-                import google.generativeai as genai
-                genai.configure(api_key=settings.GOOGLE_API_KEY)
-                
-                logger.info(f"Uploading audio {file_path} to Gemini...")
-                # Upload file
-                audio_file = genai.upload_file(path=file_path)
-                
-                # Prompt
-                model = genai.GenerativeModel('gemini-1.5-flash')
-                response = model.generate_content([
-                    "Transcribe this audio file verbatim. Output strictly the transcription text only.",
-                    audio_file
-                ])
-                
-                logger.info("Gemini Transcription complete.")
-                return response.text.strip()
+                text = await asyncio.wait_for(providers[breaker.name](file_path), settings.VOICE_PROVIDER_TIMEOUT_S)
             except Exception as e:
-                logger.error(f"Gemini STT failed: {e}")
-                # Fallthrough to AssemblyAI
-        
-        # Method 2: AssemblyAI
-        if not self.transcriber:
-             raise ValueError("No Transcription service available (Gemini or AssemblyAI). check API Keys.")
-
-        logger.info(f"Transcribing audio with AssemblyAI: {file_path}")
-        
+                breaker.record_failure()
+                logger.error(f"{breaker.name} failed: {e!r}")
+                last_error = e
+                continue
+            breaker.record_success()
+            session = current_usage()
+            if session is not None:
+                session.add_stt(breaker.name.split(".", 1)[1], _audio_seconds(file_path))
+            return text
+        raise last_error or CircuitOpen(f"All transcription providers are unavailable: {', '.join(providers)}")
+
+    async def _probe_transcription(self, transcribe: Callable[[str], Awaitable[str]]):
+        """Transcribes half a second of silence: a cheap request that only checks the provider answers."""
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            with wave.open(path, "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(settings.AUDIO_TARGET_SAMPLE_RATE)
+                f.writeframes(b"\x00\x00" * (settings.AUDIO_TARGET_SAMPLE_RATE // 2))
+            await transcribe(path)
+        finally:
+            os.remove(path)
+
+    async def _transcribe_gemini(self, file_path: str) -> str:
+        """Google Gemini (Multimodal) - Robust & supports many formats without FFMPEG."""
+        def transcribe():
+            genai = provider_clients.genai()
+            turn_logger.info(f"Uploading audio {file_path} to Gemini...")
+            audio_file = genai.upload_file(path=file_path)
+            model = provider_clients.gemini_model('gemini-1.5-flash')
+            return model.generate_content([
+                "Transcribe this audio file verbatim. Output strictly the transcription text only.",
+                audio_file
+            ])
+
+        # The Gemini SDK is synchronous, run in executor
+        response = await asyncio.get_running_loop().run_in_executor(None, transcribe)
+        turn_logger.info("Gemini Transcription complete.")
+        return response.text.strip()
+
+    async def _transcribe_assemblyai(self, file_path: str) -> str:
+        turn_logger.info(f"Transcribing audio with AssemblyAI: {file_path}")
         # AssemblyAI SDK is synchronous, run in executor
-        loop = asyncio.get_event_loop()
-        
+        transcript = await asyncio.get_running_loop().run_in_executor(None, self.transcriber.transcribe, file_path)
+        if transcript.status == "error": # aai.TranscriptStatus is a str enum
+            raise Exception(transcript.error)
+        return transcript.text
+
+    async def open_transcription_stream(self, sample_rate: int) -> StreamingTranscription:
+        """Opens a live transcription session on the configured streaming backend."""
+        backend = settings.STREAMING_STT_BACKEND
+        if backend == "assemblyai" and not settings.ASSEMBLYAI_API_KEY:
+            backend = "buffered"
+        breaker = breakers.get(f"stt_stream.{backend}")
+        if backend != "buffered" and not breaker.allow():
+            backend = "buffered"
+
         try:
-            transcript = await loop.run_in_executor(
-                None, 
-                self.transcriber.transcribe, 
-                file_path
-            )
-            
-            if transcript.status == aai.TranscriptStatus.error:
-                raise Exception(transcript.error)
-                
-            return transcript.text
+            # Unknown backends (KeyError) and missing SDKs (ImportError) fall back too
+            stream = STREAMING_BACKENDS[backend](sample_rate)
+            await asyncio.wait_for(stream.start(), settings.VOICE_PROVIDER_TIMEOUT_S)
         except Exception as e:
-            logger.error(f"AssemblyAI Transcription failed: {e}")
-            raise
+            breaker.record_failure()
+            logger.error(f"Streaming STT backend '{backend}' failed to start: {e!r}. Buffering instead.")
+            stream = STREAMING_BACKENDS["buffered"](sample_rate)
+        else:
+            if backend != "buffered":
+                breaker.record_success()
+        return stream
+
+    def tts_providers(self) -> List[str]:
+        """Configured TTS providers in preference order: ElevenLabs needs a key, gTTS the package."""
+        providers = []
+        if self.elevenlabs:
+            providers.append("tts.elevenlabs")
+        if _GTTS_INSTALLED:
+            providers.append("tts.gtts")
+        return providers
+
+    def tts_provider(self) -> Optional[str]:
+        """The provider to voice the next question with: the best-ranked one that can serve it, or None."""
+        try:
+            return next((breaker.name for breaker in _healthy(self.tts_providers(), self._probe_tts)), None)
+        except CircuitOpen:
+            return None
+
+    async def stream_audio(self, text: str, provider: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Yields MP3 chunks from the healthiest configured TTS provider (see BreakerRegistry.ordered; ElevenLabs, then gTTS among equals).
+
+        `provider` pins one provider, without failover, e.g. so every part of one question has the same voice.
+        """
+        providers = self.tts_providers()
+        if not providers:
+            raise ValueError("No TTS provider configured (ElevenLabs API key or the gTTS package).")
+
+        turn_logger.info(f"Streaming audio for: {text[:50]}...")
+        last_error = None
+        candidates = [breakers.get(provider)] if provider else _healthy(providers, self._probe_tts)
+        for breaker in candidates:
+            chunks = self._synthesize(breaker.name, text)
+            try:
+                # Failing over is only possible until the first chunk is out
+                first = await asyncio.wait_for(chunks.__anext__(), settings.VOICE_PROVIDER_TIMEOUT_S)
+            except Exception as e:
+                breaker.record_failure()
+                logger.error(f"{breaker.name} failed: {e!r}")
+                last_error = e
+                await chunks.aclose()
+                continue
+
+            try:
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+            except Exception:
+                # Part of the audio was already delivered; switching voices mid-question is worse than failing
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+            session = current_usage()
+            if session is not None:
+                session.add_tts(breaker.name.split(".", 1)[1], len(text))
+            turn_logger.info(f"{breaker.name} generation successful.")
+            return
+        raise last_error or CircuitOpen("All TTS providers are unavailable")
+
+    async def _probe_tts(self, provider: str):
+        async for _ in self._synthesize(provider, "Hello."):
+            pass
+
+    def _synthesize(self, provider: str, text: str) -> AsyncIterator[bytes]:
+        if provider == "tts.elevenlabs":
+            return _iterate_in_thread(lambda: self.elevenlabs.text_to_speech.stream(
+                voice_id=settings.ELEVENLABS_VOICE_ID,
+                text=text,
+                model_id=settings.ELEVENLABS_MODEL_ID
+            ))
+        # Fallback: gTTS (Free)
+        from gtts import gTTS
+        return _iterate_in_thread(lambda: gTTS(text=text, lang='en').stream())
 
     async def generate_audio(self, text: str, output_path: str) -> Optional[str]:
-        """Generates audio from text using ElevenLabs."""
-        logger.info(f"ENTER generate_audio: {text[:20]}...")
-        if not self.elevenlabs:
-            logger.error("ElevenLabs not configured")
-            raise ValueError("ElevenLabs not configured.")
-
-        logger.info(f"Generating audio for: {text[:50]}...")
-        
+        """Generates an MP3 file from text using ElevenLabs (falls back to gTTS)."""
         try:
-            # Run blocking generation in executor
-            loop = asyncio.get_event_loop()
-            
-            # Use default voice for now
-            audio_generator = await loop.run_in_executor(
-                None,
-                lambda: self.elevenlabs.generate(
-                    text=text,
-                    voice="Rachel", # Default popular voice
-                    model="eleven_monolingual_v1"
-                )
-            )
-            
-            # Save to file
             with open(output_path, "wb") as f:
-                for chunk in audio_generator:
+                async for chunk in self.stream_audio(text):
                     f.write(chunk)
-            
             return output_path
         except Exception as e:
-            logger.error(f"ElevenLabs TTS generation failed: {e}. Falling back to gTTS.")
-            
-            # Fallback: gTTS (Free)
-            try:
-                from gtts import gTTS
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    None,
-                    lambda: gTTS(text=text, lang='en').save(output_path)
-                )
-                logger.info("gTTS generation successful.")
-                return output_path
-            except Exception as e_gtts:
-                logger.error(f"gTTS also failed: {e_gtts}")
-                raise
+            logger.error(f"TTS generation failed: {e}")
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+def _audio_seconds(file_path: str) -> float:
+    """Duration of a WAV file; other containers (webm, mp3) aren't decoded and count as 0."""
+    try:
+        with wave.open(file_path, "rb") as f:
+            return f.getnframes() / f.getframerate()
+    except (wave.Error, EOFError):
+        return 0.0
+
+def _healthy(providers: List[str], probe: Optional[Callable[[str], Awaitable]] = None) -> Iterator[CircuitBreaker]:
+    """Breakers of the providers worth trying now, best first (see BreakerRegistry.ordered).
+
+    While a closed provider is left, half-open ones are not tried by the request:
+    `probe(name)` checks them in the background instead, so nobody waits on a
+    provider that may still be down. Without a closed provider they come last.
+    """
+    ranked = [breakers.get(name) for name in breakers.ordered(providers)]
+    if probe is not None and any(breaker.state == BreakerState.CLOSED for breaker in ranked):
+        for breaker in ranked:
+            if breaker.state == BreakerState.HALF_OPEN and breaker.allow():
+                task = asyncio.create_task(_run_probe(breaker, probe))
+                _PROBES.add(task)
+                task.add_done_callback(_PROBES.discard)
+        ranked = [breaker for breaker in ranked if breaker.state == BreakerState.CLOSED]
+    for breaker in ranked:
+        if breaker.allow():
+            yield breaker
+
+async def _run_probe(breaker: CircuitBreaker, probe: Callable[[str], Awaitable]):
+    try:
+        await asyncio.wait_for(probe(breaker.name), settings.VOICE_PROVIDER_TIMEOUT_S)
+    except Exception as e:
+        breaker.record_failure()
+        logger.warning(f"{breaker.name} probe failed: {e!r}")
+    else:
+        breaker.record_success()
+        logger.info(f"{breaker.name} probe succeeded")
+
+async def _iterate_in_thread(make_iterator: Callable[[], Iterator[bytes]]) -> AsyncIterator[bytes]:
+    """Drives a blocking (network) iterator from the default executor."""
+    loop = asyncio.get_running_loop()
+    iterator = await loop.run_in_executor(None, lambda: iter(make_iterator()))
+    done = object()
+    while True:
+        chunk = await loop.run_in_executor(None, next, iterator, done)
+        if chunk is done:
+            return
+        if chunk:
+            yield chunk
 
 voice_service = VoiceService()
+
+register_streaming_backend(
+    "assemblyai",
+    lambda sample_rate: AssemblyAIStreamingTranscription(sample_rate, settings.ASSEMBLYAI_API_KEY)
+)
+register_streaming_backend(
+    "buffered",
+    lambda sample_rate: BufferedStreamingTranscription(sample_rate, voice_service.transcribe_audio)
+)
@@ -5,6 +5,12 @@ class Settings(BaseSettings):
     APP_NAME: str = "TalentTalk Pro"
     GOOGLE_API_KEY: str
     DATABASE_URL: str = "sqlite:///./data/talenttalk.db"
+    CHAT_SESSION_CACHE_SIZE: int = 256 # Gemini chat handles kept for active sessions (LRU)
+    CHROMA_PATH: str = "./data/chroma_db"
+    EMBEDDING_BACKEND: str = "google" # "google" (Gemini API) or "local" (sentence-transformers on CPU)
+    LOCAL_EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_CACHE_SIZE: int = 10000 # Embeddings kept in memory, keyed by content hash
+    VECTOR_INGEST_BATCH_SIZE: int = 128 # Documents embedded and written per add
     
     class Config:
         env_file = ".env"
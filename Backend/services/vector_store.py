@@ -1,32 +1,119 @@
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
 import chromadb
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from chromadb.api.types import Embedding
 from chromadb.utils import embedding_functions
-import os
 
-# Initialize ChromaDB Client
+from ..core.config import get_settings
+
+settings = get_settings()
+
+# ChromaDB Client, opened on first use
 # PersistentClient saves data to disk
-chroma_client = chromadb.PersistentClient(path="./data/chroma_db")
+@lru_cache()
+def get_chroma_client():
+    return chromadb.PersistentClient(path=settings.CHROMA_PATH)
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Wraps an embedding function with an in-memory LRU keyed by content hash.
+
+    Only texts not seen before are sent to the wrapped function, in one batch;
+    re-ingesting a document or repeating a query costs no embedding call.
+    """
+
+    def __init__(self, inner: EmbeddingFunction, key: str, maxsize: int):
+        self.inner = inner
+        self.key = key # Backend + model; cached vectors are only valid for the model that made them
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[str, Embedding]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _digest(self, text: str) -> str:
+        return hashlib.sha256(f"{self.key}\0{text}".encode()).hexdigest()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        digests = [self._digest(text) for text in input]
+        missing = OrderedDict()
+        for digest, text in zip(digests, input):
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+            else:
+                missing.setdefault(digest, text) # Duplicates within a batch are embedded once
+        self.hits += len(digests) - len(missing)
+        self.misses += len(missing)
+
+        found = {}
+        if missing:
+            vectors = self.inner(list(missing.values()))
+            found = dict(zip(missing, vectors))
+        # Look up fresh vectors before storing them: a batch larger than the cache still returns whole
+        embeddings = [found[d] if d in found else self._cache[d] for d in digests]
 
-# Use Google Generative AI Embeddings
-def get_embedding_function(api_key):
+        for digest, vector in found.items():
+            self._cache[digest] = vector
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return embeddings
+
+def _google_embeddings(api_key: str) -> EmbeddingFunction:
     return embedding_functions.GoogleGenerativeAiEmbeddingFunction(api_key=api_key)
 
-def get_collection(name: str, api_key: str):
-    return chroma_client.get_or_create_collection(
-        name=name,
-        embedding_function=get_embedding_function(api_key)
-    )
+def _local_embeddings(api_key: str) -> EmbeddingFunction:
+    # Runs on CPU in-process; the model is downloaded once into the Hugging Face cache
+    return embedding_functions.SentenceTransformerEmbeddingFunction(model_name=settings.LOCAL_EMBEDDING_MODEL, device="cpu")
+
+EMBEDDING_BACKENDS = {
+    "google": _google_embeddings,
+    "local": _local_embeddings,
+}
+
+# One function (and its cache / loaded model) per backend and key
+@lru_cache(maxsize=8)
+def get_embedding_function(api_key: str, backend: Optional[str] = None) -> CachedEmbeddingFunction:
+    backend = backend or settings.EMBEDDING_BACKEND
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    model = settings.LOCAL_EMBEDDING_MODEL if backend == "local" else "default"
+    return CachedEmbeddingFunction(EMBEDDING_BACKENDS[backend](api_key), key=f"{backend}:{model}", maxsize=settings.EMBEDDING_CACHE_SIZE)
 
-def add_documents(collection_name: str, documents: list, metadatas: list, ids: list, api_key: str):
+# Collection handles, reused across calls. A collection keeps the vector size of the
+# backend it was filled with, so switching EMBEDDING_BACKEND needs new collections.
+_collections: Dict[Tuple[str, str, str], chromadb.Collection] = {}
+
+def get_collection(name: str, api_key: str, backend: Optional[str] = None):
+    backend = backend or settings.EMBEDDING_BACKEND
+    key = (name, backend, api_key)
+    if key not in _collections:
+        _collections[key] = get_chroma_client().get_or_create_collection(
+            name=name,
+            embedding_function=get_embedding_function(api_key, backend)
+        )
+    return _collections[key]
+
+def _batch_size(batch_size: Optional[int]) -> int:
+    size = batch_size or settings.VECTOR_INGEST_BATCH_SIZE
+    return max(1, min(size, get_chroma_client().get_max_batch_size()))
+
+def add_documents(collection_name: str, documents: list, metadatas: list, ids: list, api_key: str,
+                  batch_size: Optional[int] = None):
+    """Embeds and writes documents `batch_size` at a time (VECTOR_INGEST_BATCH_SIZE by default)."""
     collection = get_collection(collection_name, api_key)
-    collection.add(
-        documents=documents,
-        metadatas=metadatas,
-        ids=ids
-    )
+    size = _batch_size(batch_size)
+    for start in range(0, len(documents), size):
+        collection.add(
+            documents=documents[start:start + size],
+            metadatas=metadatas[start:start + size] if metadatas else None,
+            ids=ids[start:start + size]
+        )
 
-def query_documents(collection_name: str, query_text: str, n_results: int, api_key: str):
+def query_documents(collection_name: str, query_text: Union[str, List[str]], n_results: int, api_key: str):
     collection = get_collection(collection_name, api_key)
     return collection.query(
-        query_texts=[query_text],
+        query_texts=[query_text] if isinstance(query_text, str) else query_text,
         n_results=n_results
     )
@@ -0,0 +1,85 @@
+"""
+Startup profile: per-module import time of `app.main`, from `python -X importtime`.
+
+Provider SDKs (langchain_openai, langgraph, assemblyai, elevenlabs,
+google.generativeai) are created lazily or during background warm-up, so none
+of them should show up here. Exits non-zero if one does, or if the total
+exceeds --budget-ms.
+
+Usage (from Backend/):
+    python tests/bench_import_time.py --top 25 --budget-ms 2500
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported until a request (or warm-up) needs them
+LAZY_MODULES = ["langchain_openai", "langgraph", "assemblyai", "elevenlabs", "google.generativeai"]
+
+def profile_imports(module: str = "app.main") -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """Imports `module` in a fresh interpreter.
+
+    Returns ([(name, self_us, cumulative_us), ...] in import order, loaded lazy modules).
+    """
+    env = dict(os.environ)
+    env.setdefault("OPENROUTER_API_KEY", "bench")
+    env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    check = f"import sys; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    # Run from a scratch directory: app.main creates static/ in the working directory
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}; {check}"],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return rows, loaded
+
+def by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    rows, loaded = profile_imports(args.module)
+    total_us = next(cum for name, _, cum in rows if name == args.module)
+
+    print(f"import {args.module}: {total_us / 1000:.0f} ms, {len(rows)} modules\n")
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f}  {self_us / 1000:8.1f}  {name}")
+
+    print(f"\n{'self ms':>14}  top-level package")
+    for package, self_us in sorted(by_package(rows).items(), key=lambda p: p[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:14.1f}  {package}")
+
+    failed = False
+    if loaded:
+        print(f"\nFAIL: imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+        print(f"\nFAIL: {total_us / 1000:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Legacy /chat (Backend/agents/workflow.py): re-rendering the whole conversation
+into one prompt every turn vs. a cached per-session chat handle that is only
+given the new answer.
+
+No network: the Gemini transport is replaced by a stub that records the size of
+each serialized request. The Gemini API is stateless, so the chat handle's
+history is still part of every request ("wire bytes"); what the handle removes
+is rebuilding and re-encoding the conversation in the app on every turn
+("built bytes" and local time).
+
+Usage (from Backend/):
+    python tests/bench_legacy_chat.py --turns 20 --sessions 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+
+# The legacy modules use package-relative imports: import them as Backend.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("GOOGLE_API_KEY", "bench")
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+from google.generativeai import protos
+from langchain_core.messages import AIMessage, HumanMessage
+
+from Backend.agents import gemini_client
+from Backend.agents.gemini_client import ChatSessions, generate_response, get_gemini_model
+
+SYSTEM = "You are an expert technical interviewer conducting an interview.\nCurrent Stage: technical"
+QUESTION = "Can you walk me through how you would shard that table, and what happens on a hot key? " * 2
+ANSWER = "I would start by looking at the access pattern and pick a shard key with high cardinality. " * 10
+
+class StubTransport:
+    """Stands in for the async Gemini client; records serialized request sizes."""
+
+    def __init__(self):
+        self.sizes = []
+
+    async def generate_content(self, request, **kwargs):
+        self.sizes.append(len(type(request).serialize(request)))
+        return protos.GenerateContentResponse(candidates=[protos.Candidate(
+            content=protos.Content(role="model", parts=[protos.Part(text=QUESTION)]),
+            finish_reason=protos.Candidate.FinishReason.STOP
+        )])
+
+async def legacy_turn(session_id, messages):
+    """interviewer_node before the chat handle: the full conversation as one string."""
+    conversation = "\n".join([f"{m.type}: {m.content}" for m in messages])
+    prompt = f"{conversation}\nInterviewer:"
+    await generate_response(prompt, system_instruction=SYSTEM)
+    return len(prompt.encode())
+
+async def run(turns: int, sessions: int):
+    transport = StubTransport()
+    get_gemini_model(system_instruction=SYSTEM)._async_client = transport
+    chats = ChatSessions(maxsize=sessions)
+
+    async def chat_turn(session_id, messages):
+        await chats.send(session_id, messages, system_instruction=SYSTEM)
+        return len(messages[-1].content.encode())
+
+    results = {}
+    for name, turn_fn in [("legacy prompt", legacy_turn), ("chat handle", chat_turn)]:
+        per_turn = [[0.0, 0, 0] for _ in range(turns)] # seconds, built bytes, wire bytes
+        for s in range(sessions):
+            messages = []
+            for t in range(turns):
+                messages.append(HumanMessage(content=f"{t}: {ANSWER}"))
+                started = time.perf_counter()
+                built = await turn_fn(f"{name}-{s}", messages)
+                per_turn[t][0] += time.perf_counter() - started
+                per_turn[t][1] += built
+                per_turn[t][2] += transport.sizes[-1]
+                messages.append(AIMessage(content=QUESTION))
+        results[name] = [(sec / sessions, built // sessions, wire // sessions) for sec, built, wire in per_turn]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.turns, args.sessions))
+    print(f"{'path':<15} {'turn':>5} {'local ms':>9} {'built bytes':>12} {'wire bytes':>11}")
+    for name, rows in results.items():
+        for turn in (2, args.turns):
+            seconds, built, wire = rows[turn - 1]
+            print(f"{name:<15} {turn:>5} {seconds * 1000:>9.3f} {built:>12} {wire:>11}")
+        total = sum(r[1] for r in rows)
+        print(f"{name:<15} {'all':>5} {sum(r[0] for r in rows) * 1000:>9.3f} {total:>12} {sum(r[2] for r in rows):>11}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Logging overhead per /chat turn, on the request (event loop) thread.
+
+  legacy    - synchronous StreamHandler + JsonFormatter, full transcript logged
+  pipeline  - app/core/logging_config.py: QueueHandler with sampling; JSON
+              formatting, redaction and writes happen on the listener thread
+
+Each turn replays the log calls of a /chat turn (answer, graph steps, TTS, access
+line). The sink models stdout backpressure from a container log driver: every
+write() blocks for --write-latency-ms. "drain" is how long the listener then
+needs to write what is still queued.
+
+Usage (from Backend/):
+    python tests/bench_logging.py --turns 2000 --write-latency-ms 0 0.05 0.2
+"""
+import argparse
+import atexit
+import logging
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+os.environ["ENVIRONMENT"] = "production" # JSON records, as deployed
+
+import numpy as np
+
+from app.core import logging_config
+from app.core.config import settings
+from app.core.logging_config import JsonFormatter, candidate
+
+ANSWER = ("In my last role I owned the billing service; you can reach my manager at jane.doe@example.com "
+          "or +1 (415) 555-0134. We moved settlement to an event-sourced pipeline and cut latency by 40%. ") * 5
+QUESTION = "How would you make that pipeline idempotent when the payment provider retries webhooks?"
+
+class SlowSink:
+    """A stream whose writes block, like a full stdout pipe."""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.bytes = 0
+
+    def write(self, data: str):
+        self.bytes += len(data)
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def flush(self):
+        pass
+
+def turn(log: logging.Logger, turn_log: logging.Logger, session_id: str, answer: str):
+    turn_log.info(f"Session {session_id} answer: {answer}")
+    turn_log.info("Running analyze_answer_node...")
+    turn_log.info("Analyzing user answer...")
+    turn_log.info("Next step routed: generate_question")
+    turn_log.info("Running generate_question_node...")
+    turn_log.info("Generating question 3/5")
+    turn_log.info(f"Streaming audio for: {QUESTION[:50]}...")
+    turn_log.info("tts.elevenlabs generation successful.")
+    log.info(f'127.0.0.1:53122 - "POST /api/v1/chat HTTP/1.1" 200')
+
+def legacy_logger(sink: SlowSink) -> logging.Logger:
+    log = logging.getLogger(f"bench.legacy.{id(sink)}")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(JsonFormatter())
+    log.addHandler(handler)
+    return log
+
+def run(turns: int, latency_s: float, sample_rate: float):
+    results = {}
+    for name in ("legacy", "pipeline"):
+        sink = SlowSink(latency_s)
+        if name == "legacy":
+            log, listener = legacy_logger(sink), None
+            answer = ANSWER
+        else:
+            log_name = f"bench.pipeline.{id(sink)}"
+            settings.LOG_SAMPLE_RATES = {f"{log_name}.turn": sample_rate}
+            log, listener = logging_config.setup_logging(log_name, stream=sink)
+            log.propagate = False
+            answer = candidate(ANSWER)
+        turn_log = log.getChild("turn")
+
+        per_turn = np.empty(turns)
+        for i in range(turns):
+            started = time.perf_counter()
+            turn(log, turn_log, f"session-{i}", answer)
+            per_turn[i] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if listener:
+            listener.stop()
+            atexit.unregister(listener.stop)
+        results[name] = (per_turn, time.perf_counter() - started, sink.bytes)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--write-latency-ms", type=float, nargs="+", default=[0.0, 0.05, 0.2])
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="Kept fraction of per-turn INFO records")
+    args = parser.parse_args()
+
+    print(f"{'sink ms':>7} {'config':<9} {'mean us':>9} {'p99 us':>9} {'drain ms':>9} {'bytes/turn':>11}")
+    for latency_ms in args.write_latency_ms:
+        for name, (per_turn, drain, written) in run(args.turns, latency_ms / 1000, args.sample_rate).items():
+            print(f"{latency_ms:>7.2f} {name:<9} {per_turn.mean() * 1e6:>9.1f} {np.percentile(per_turn, 99) * 1e6:>9.1f} "
+                  f"{drain * 1000:>9.1f} {written / args.turns:>11.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures interview session memory: legacy triple-stored state vs. the compact TurnLog.
+
+Usage (from Backend/):
+    python tests/bench_session_memory.py --sessions 500 --turns 10
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.agents.turn_log import Turn, TurnLog
+
+QUESTION_CHARS = 220
+ANSWER_CHARS = 900
+FEEDBACK_CHARS = 350
+
+def text(prefix: str, n: int) -> str:
+    # Fresh string objects per session, like real transcripts
+    return (prefix * (n // len(prefix) + 1))[:n]
+
+def analysis(i: int) -> dict:
+    return {
+        "feedback": text(f"feedback {i} ", FEEDBACK_CHARS),
+        "sentiment_score": 0.5,
+        "technical_accuracy": 0.7,
+        "suggested_improvement": text(f"improve {i} ", FEEDBACK_CHARS // 2),
+        "is_correct": True,
+    }
+
+def legacy_session(turns: int) -> dict:
+    """State as previously stored: messages + formatted history + analysis_data."""
+    state = {"messages": [], "history": [], "analysis_data": []}
+    for i in range(turns):
+        question = text(f"question {i} ", QUESTION_CHARS)
+        answer = text(f"answer {i} ", ANSWER_CHARS)
+        result = analysis(i)
+        state["messages"].append(AIMessage(content=question))
+        state["messages"].append(HumanMessage(content=answer))
+        state["analysis_data"].append({"question": question, "answer": answer, "analysis": result, "question_num": i + 1})
+        state["history"].append(f"Question: {question}\nAnswer: {answer}\nFeedback: {result.get('feedback', '')}")
+    return state
+
+def compact_session(turns: int) -> dict:
+    state = {"turns": TurnLog(), "pending_answer": None}
+    for i in range(turns):
+        state["turns"].append(Turn(
+            question=text(f"question {i} ", QUESTION_CHARS),
+            answer=text(f"answer {i} ", ANSWER_CHARS),
+            analysis=analysis(i),
+            question_num=i + 1
+        ))
+    return state
+
+def bytes_per_session(factory, sessions: int, turns: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = [factory(turns) for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del store
+    return (after - before) / sessions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    legacy = bytes_per_session(legacy_session, args.sessions, args.turns)
+    compact = bytes_per_session(compact_session, args.sessions, args.turns)
+
+    print(f"Sessions: {args.sessions}, turns per session: {args.turns}")
+    print(f"Legacy state : {legacy / 1024:8.1f} KiB/session")
+    print(f"Compact state: {compact / 1024:8.1f} KiB/session")
+    print(f"Saved        : {(legacy - compact) / 1024:8.1f} KiB/session ({1 - compact / legacy:.0%})")
+
+if __name__ == "__main__":
+    main()
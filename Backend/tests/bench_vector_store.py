@@ -0,0 +1,89 @@
+"""
+Legacy vector store (Backend/services/vector_store.py): ingest and query
+throughput with the local CPU embedding backend.
+
+  per call  - what every call used to do: build a new embedding function,
+              get_or_create_collection, then add one document / run one query
+  batched   - cached collection handle, VECTOR_INGEST_BATCH_SIZE documents per add
+  warm      - the same texts again: served from the content-hash embedding cache
+
+No network beyond the one-time model download; Chroma writes to a temp dir.
+
+Usage (from Backend/):
+    python tests/bench_vector_store.py --docs 2000 --queries 200 --batch-size 128
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+# The legacy modules use package-relative imports: import them as Backend.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("GOOGLE_API_KEY", "bench")
+os.environ["CHROMA_PATH"] = tempfile.mkdtemp(prefix="bench_chroma_")
+os.environ["EMBEDDING_BACKEND"] = "local"
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+from Backend.services import vector_store
+
+TOPICS = ["distributed systems", "query planning", "React state", "Kubernetes rollouts", "feature stores",
+          "rate limiting", "CAP theorem", "B-tree indexes", "gradient descent", "OAuth flows"]
+
+def corpus(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [f"Interview question {i} on {rng.choice(TOPICS)}: explain trade-offs around "
+            f"{rng.choice(TOPICS)} and {rng.choice(TOPICS)} for a team of {rng.randint(2, 40)}." for i in range(n)]
+
+def legacy_collection(name: str):
+    # Before: a fresh embedding function (for "local", a model load) and lookup on every call
+    return vector_store.get_chroma_client().get_or_create_collection(
+        name=name, embedding_function=vector_store.EMBEDDING_BACKENDS["local"]("")
+    )
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>9.1f}/s"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--legacy-docs", type=int, default=50, help="Per-call path is slow; time fewer documents")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=128)
+    args = parser.parse_args()
+
+    docs = corpus(args.docs)
+    queries = [f"Tell me about {random.Random(i).choice(TOPICS)} ({i})" for i in range(args.queries)]
+    vector_store.get_embedding_function("", "local")([docs[0]]) # Load the model outside the timings
+
+    print(f"{'ingest':<10} {'docs':>6} {'throughput':>11}")
+    started = time.perf_counter()
+    for i, doc in enumerate(docs[:args.legacy_docs]):
+        legacy_collection("bench_legacy").add(documents=[doc], metadatas=[{"i": i}], ids=[f"d{i}"])
+    print(f"{'per call':<10} {args.legacy_docs:>6} {rate(args.legacy_docs, time.perf_counter() - started)}")
+
+    ids = [f"d{i}" for i in range(len(docs))]
+    metadatas = [{"i": i} for i in range(len(docs))]
+    for label, name in [("batched", "bench_batched"), ("warm", "bench_warm")]:
+        started = time.perf_counter()
+        vector_store.add_documents(name, docs, metadatas, ids, api_key="", batch_size=args.batch_size)
+        print(f"{label:<10} {len(docs):>6} {rate(len(docs), time.perf_counter() - started)}")
+
+    print(f"\n{'query':<10} {'count':>6} {'throughput':>11}")
+    started = time.perf_counter()
+    for query in queries[:args.legacy_docs]:
+        legacy_collection("bench_legacy").query(query_texts=[query], n_results=5)
+    print(f"{'per call':<10} {args.legacy_docs:>6} {rate(args.legacy_docs, time.perf_counter() - started)}")
+    for label in ["cached", "warm"]:
+        started = time.perf_counter()
+        for query in queries:
+            vector_store.query_documents("bench_batched", query, n_results=5, api_key="")
+        print(f"{label:<10} {len(queries):>6} {rate(len(queries), time.perf_counter() - started)}")
+
+    embeddings = vector_store.get_embedding_function("", "local")
+    print(f"\nembedding cache: {embeddings.hits} hits, {embeddings.misses} misses")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app import api_routes
+from app.agents.turn_log import TurnLog
+from app.core.idempotency import session_turns
+from app.services.gemini_service import gemini_service
+from app.services.voice_service import voice_service
+
+def new_session(**overrides):
+    """Interview state after the first question, before any answer."""
+    return {
+        "turns": TurnLog(),
+        "pending_answer": None,
+        "current_question": "Q1?",
+        "current_question_num": 1,
+        "total_questions": 5,
+        "follow_up_count": 0,
+        "max_follow_ups": 0,
+        "target_company": "Google",
+        "interview_style": "Professional",
+        "job_role": "Engineer",
+        "difficulty": "Medium",
+        "topic": "General",
+        **overrides
+    }
+
+@pytest.fixture
+def make_session():
+    return new_session
+
+@pytest.fixture
+def api_app(monkeypatch, tmp_path):
+    """The API router on a bare app. Session "s1" (store, report task, turn records, slot) is cleared afterwards."""
+    monkeypatch.chdir(tmp_path) # TTS output lands in static/audio
+    app = FastAPI()
+    app.include_router(api_routes.router, prefix="/api/v1")
+    yield app
+    api_routes.SESSION_STORE.pop("s1", None)
+    api_routes.REPORT_TASKS.pop("s1", None)
+    api_routes.admission.release("s1")
+    session_turns.discard("s1")
+
+@pytest.fixture
+def api_client(api_app):
+    with TestClient(api_app) as client:
+        yield client
+
+@pytest.fixture
+def stub_tts(monkeypatch):
+    """Question audio without a TTS provider: b"ID3" followed by the text."""
+    async def fake_audio(text, provider=None):
+        yield b"ID3" + text.encode()
+    monkeypatch.setattr(voice_service, "stream_audio", fake_audio)
+
+@pytest.fixture
+def stub_providers(stub_tts, monkeypatch):
+    """Canned model calls: every answer gets "Nice." and the next question is "What is a closure?",
+    streamed in two parts. Tests replace single calls with monkeypatch."""
+    async def fake_analyze(**kwargs):
+        return {"feedback": "Nice.", "sentiment_score": 0.5}
+
+    async def fake_question(**kwargs):
+        return "What is a closure?"
+
+    async def fake_stream_question(**kwargs):
+        for part in ["What is ", "a closure?"]:
+            yield part
+
+    monkeypatch.setattr(gemini_service, "analyze_response", fake_analyze)
+    monkeypatch.setattr(gemini_service, "generate_question", fake_question)
+    monkeypatch.setattr(gemini_service, "stream_question", fake_stream_question)
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import api_routes
+from app.core.admission import AdmissionController, AdmissionRejected
+from app.core.config import settings
+from app.core.metrics import metrics
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_ACTIVE", 2)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 2)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT_S", 1.0)
+    monkeypatch.setattr(settings, "ADMISSION_IDLE_TIMEOUT_S", 60.0)
+    monkeypatch.setattr(settings, "ADMISSION_DEFAULT_SESSION_S", 300.0)
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_in_fifo_order(limits):
+    controller = AdmissionController()
+    await controller.acquire("a")
+    await controller.acquire("b")
+
+    admitted = []
+    async def start(session_id):
+        await controller.acquire(session_id)
+        admitted.append(session_id)
+
+    waiters = [asyncio.create_task(start(s)) for s in ("c", "d")]
+    await asyncio.sleep(0.01)
+    assert controller.stats()["queued"] == 2
+    # Queue is full: rejected at once, told to retry after ~3 slots' worth of interviews
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("e")
+    assert rejected.value.reason == "queue_full"
+    assert rejected.value.retry_after == pytest.approx(3 * 300.0 / 2)
+
+    controller.release("a")
+    await asyncio.sleep(0.01)
+    assert admitted == ["c"]
+    controller.release("b")
+    await asyncio.gather(*waiters)
+    assert admitted == ["c", "d"]
+
+@pytest.mark.asyncio
+async def test_wait_times_out_and_leaves_the_queue(limits, monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT_S", 0.05)
+    controller = AdmissionController()
+    await controller.acquire("a")
+    await controller.acquire("b")
+    before = metrics.counter("admission_rejected", reason="timeout")
+
+    with pytest.raises(AdmissionRejected):
+        await controller.acquire("c")
+    assert controller.stats()["queued"] == 0
+    assert metrics.counter("admission_rejected", reason="timeout") == before + 1
+
+@pytest.mark.asyncio
+async def test_idle_sessions_give_up_their_slot(limits, monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_IDLE_TIMEOUT_S", 0.1)
+    controller = AdmissionController()
+    await controller.acquire("a")
+    await controller.acquire("b")
+
+    await asyncio.sleep(0.05)
+    controller.touch("b")
+    await controller.acquire("c") # Waits until "a" has been idle for 0.1s
+    assert set(controller._active) == {"b", "c"}
+
+@pytest.mark.asyncio
+async def test_touch_does_not_readmit_released_sessions(limits):
+    controller = AdmissionController()
+    await controller.acquire("a")
+    await controller.acquire("b")
+    controller.release("a")
+    await controller.acquire("c")
+
+    controller.touch("a") # Another /chat after the interview finished
+    assert set(controller._active) == {"b", "c"}
+    assert controller.stats()["active"] <= settings.ADMISSION_MAX_ACTIVE
+
+@pytest.fixture
+def client(limits, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path) # TTS output lands in static/audio
+    controller = AdmissionController()
+    monkeypatch.setattr(api_routes, "admission", controller)
+
+    class FakeGraph:
+        async def ainvoke(self, state):
+            return {**state, "current_question": "Q1?", "current_question_num": 1}
+    monkeypatch.setattr(api_routes, "get_interview_app", lambda: FakeGraph())
+
+    app = FastAPI()
+    app.include_router(api_routes.router, prefix="/api/v1")
+    yield TestClient(app), controller
+    for session_id in list(controller._active):
+        api_routes.SESSION_STORE.pop(session_id, None)
+
+def test_overflow_gets_429_with_retry_after(client, monkeypatch):
+    client, controller = client
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 0)
+    body = {"target_company": "Google", "job_role": "Engineer", "interview_style": "Professional", "difficulty": "Medium"}
+
+    assert client.post("/api/v1/start", json=body).status_code == 200
+    assert client.post("/api/v1/start", json=body).status_code == 200
+    response = client.post("/api/v1/start", json=body)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "150" # 1 * 300s / 2 slots
+    assert controller.stats()["active"] == 2
+
+def test_released_session_is_readmitted_before_its_next_turn(client, stub_providers, monkeypatch):
+    client, controller = client
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 0)
+    body = {"target_company": "Google", "job_role": "Engineer", "interview_style": "Professional", "difficulty": "Medium"}
+
+    idle = client.post("/api/v1/start", json=body).json()["session_id"]
+    other = client.post("/api/v1/start", json=body).json()["session_id"]
+    controller.release(idle, reason="idle")
+    assert client.post("/api/v1/start", json=body).status_code == 200
+
+    answer = {"session_id": idle, "text_input": "I'm back."}
+    assert client.post("/api/v1/chat", data=answer).status_code == 429
+    assert controller.stats()["active"] == 2
+
+    controller.release(other)
+    api_routes.SESSION_STORE.pop(other, None)
+    assert client.post("/api/v1/chat", data=answer).status_code == 200
+    assert controller.admitted(idle)
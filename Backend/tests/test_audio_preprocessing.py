@@ -0,0 +1,70 @@
+import io
+import os
+import sys
+import wave
+
+import numpy as np
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.services.audio_preprocessing import (
+    audio_preprocessor,
+    decode_wav,
+    preprocess_wav_bytes,
+    resample,
+)
+
+def make_wav(samples: np.ndarray, rate: int) -> bytes:
+    """Encodes (frames, channels) float samples as 16-bit PCM WAV."""
+    pcm = (samples * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(samples.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+def speech_like(rate: int, silences=(1.0, 2.0, 1.0), tone_s: float = 1.0, channels: int = 2) -> np.ndarray:
+    """silence, tone, long pause, tone, silence"""
+    rng = np.random.default_rng(0)
+    def silence(s):
+        return rng.normal(0, 1e-4, int(rate * s))
+    t = np.arange(int(rate * tone_s)) / rate
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    mono = np.concatenate([silence(silences[0]), tone, silence(silences[1]), tone, silence(silences[2])])
+    return np.repeat(mono[:, None], channels, axis=1).astype(np.float32)
+
+def test_preprocess_downmixes_resamples_and_trims():
+    data = make_wav(speech_like(44100), 44100)
+    result = preprocess_wav_bytes(data, target_rate=16000, max_silence_ms=300)
+
+    samples, rate = decode_wav(result.data)
+    assert rate == 16000
+    assert samples.shape[1] == 1
+    assert result.original_seconds == pytest.approx(6.0, abs=0.01)
+    # Two 1s tones + one pause capped at 300ms, plus VAD padding
+    assert 2.0 <= result.processed_seconds <= 2.8
+    assert result.bytes_removed > 0.85 * result.original_bytes
+
+def test_preprocess_keeps_pure_silence():
+    silence = np.zeros((16000, 1), dtype=np.float32)
+    result = preprocess_wav_bytes(make_wav(silence, 16000), target_rate=16000, max_silence_ms=300)
+    assert result.processed_seconds == pytest.approx(1.0)
+
+def test_resample_preserves_duration_and_tone():
+    rate = 48000
+    t = np.arange(rate) / rate
+    out = resample(np.sin(2 * np.pi * 440 * t).astype(np.float32), rate, 16000)
+    assert out.size == 16000
+    spectrum = np.abs(np.fft.rfft(out))
+    assert np.argmax(spectrum) == pytest.approx(440, abs=1)
+
+@pytest.mark.asyncio
+async def test_preprocess_file_skips_non_wav(tmp_path):
+    path = tmp_path / "answer.webm"
+    path.write_bytes(b"not a wav file")
+    assert await audio_preprocessor.preprocess_file(str(path)) is None
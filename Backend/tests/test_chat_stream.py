@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import pytest
+
+from app import api_routes
+from app.core.deadline import DeadlineExceeded
+from app.services.gemini_service import gemini_service
+from app.services.voice_service import voice_service
+
+@pytest.fixture
+def client(api_client, stub_providers):
+    return api_client
+
+def test_chat_stream_sends_question_incrementally(client, make_session):
+    api_routes.SESSION_STORE["s1"] = make_session()
+    with client.stream("POST", "/api/v1/chat/stream", data={"session_id": "s1", "text_input": "Use a dict."}) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    types = [e["type"] for e in events]
+    assert types == ["transcript", "feedback", "question_delta", "question_delta", "question", "done"]
+    assert events[1]["feedback"]["feedback"] == "Nice."
+    assert events[4]["text"] == "What is a closure?"
+    assert events[5]["response"]["question"] == "What is a closure?"
+    assert events[5]["response"]["audio_url"] == events[4]["audio_url"]
+    assert api_routes.SESSION_STORE["s1"]["current_question_num"] == 2
+
+def test_no_audio_url_without_a_tts_provider(client, make_session, monkeypatch):
+    monkeypatch.setattr(voice_service, "tts_providers", lambda: [])
+    api_routes.SESSION_STORE["s1"] = make_session()
+    response = client.post("/api/v1/chat/stream", data={"session_id": "s1", "text_input": "Use a dict."})
+    question = [json.loads(line) for line in response.text.splitlines()][-2]
+    assert question == {"type": "question", "text": "What is a closure?", "audio_url": None}
+
+def test_chat_stream_reports_errors_in_band(client, make_session, monkeypatch):
+    async def broken_analyze(**kwargs):
+        raise RuntimeError("model down")
+    monkeypatch.setattr(gemini_service, "analyze_response", broken_analyze)
+
+    api_routes.SESSION_STORE["s1"] = make_session()
+    response = client.post("/api/v1/chat/stream", data={"session_id": "s1", "text_input": "Hi"})
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1] == {"type": "error", "detail": "Chat Error: model down"}
+
+def test_chat_returns_504_when_the_turn_runs_out_of_time(client, make_session, monkeypatch):
+    async def slow_question(**kwargs):
+        raise DeadlineExceeded("Request deadline exceeded")
+    monkeypatch.setattr(gemini_service, "generate_question", slow_question)
+
+    api_routes.SESSION_STORE["s1"] = make_session()
+    response = client.post("/api/v1/chat", data={"session_id": "s1", "text_input": "Hi"})
+    assert response.status_code == 504
+    assert "too long" in response.json()["detail"]
+
+def test_failed_turn_leaves_the_session_untouched(client, make_session, monkeypatch):
+    calls = {"n": 0}
+    async def flaky_question(**kwargs):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise DeadlineExceeded("Request deadline exceeded")
+        return "Q2?"
+    monkeypatch.setattr(gemini_service, "generate_question", flaky_question)
+
+    api_routes.SESSION_STORE["s1"] = make_session()
+    data = {"session_id": "s1", "text_input": "Use a dict."}
+    assert client.post("/api/v1/chat", data=data).status_code == 504
+    state = api_routes.SESSION_STORE["s1"]
+    assert len(state["turns"]) == 0 and state["pending_answer"] is None and state["current_question_num"] == 1
+
+    assert client.post("/api/v1/chat", data=data).status_code == 200
+    state = api_routes.SESSION_STORE["s1"]
+    assert [t.answer for t in state["turns"]] == ["Use a dict."]
+    assert state["current_question"] == "Q2?"
+
+def test_report_is_generated_in_background(client, make_session, monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_report(**kwargs):
+        await release.wait()
+        return "# Report"
+    monkeypatch.setattr(gemini_service, "generate_final_report", slow_report)
+
+    api_routes.SESSION_STORE["s1"] = make_session(current_question_num=5, total_questions=5)
+    result = client.post("/api/v1/chat", data={"session_id": "s1", "text_input": "Done."}).json()
+    assert result["is_finished"] is True
+
+    assert client.get("/api/v1/report/s1").json() == {"status": "in_progress"}
+    client.portal.call(release.set)
+    for _ in range(50):
+        report = client.get("/api/v1/report/s1").json()
+        if report["status"] == "ready":
+            break
+    assert report == {"status": "ready", "report": "# Report"}
+    assert "s1" not in api_routes.REPORT_TASKS
+
+def test_failed_report_is_kept_on_the_session(client, make_session, monkeypatch):
+    async def broken_report(**kwargs):
+        raise RuntimeError("model down")
+    monkeypatch.setattr(gemini_service, "generate_final_report", broken_report)
+
+    api_routes.SESSION_STORE["s1"] = make_session(current_question_num=5, total_questions=5)
+    assert client.post("/api/v1/chat", data={"session_id": "s1", "text_input": "Done."}).json()["is_finished"]
+    for _ in range(50):
+        response = client.get("/api/v1/report/s1")
+        if response.status_code != 200:
+            break
+    assert response.status_code == 500 and "model down" in response.json()["detail"]
+    assert "s1" not in api_routes.REPORT_TASKS
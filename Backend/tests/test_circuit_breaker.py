@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.core import circuit_breaker
+from app.core.circuit_breaker import BreakerRegistry, BreakerState, CircuitBreaker, CircuitOpen
+from app.core.config import settings
+from app.services import voice_service as voice_module
+from app.services.voice_service import VoiceService
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+async def settle():
+    """Lets background probes run (the frozen clock stalls timed sleeps)."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+def test_opens_on_error_rate_and_probes_after_cool_down(clock):
+    breaker = CircuitBreaker("test", window_s=60, min_calls=4, error_rate=0.5, open_s=30)
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED # Only 3 calls so far
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow() # One probe at a time
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.as_dict()["calls_in_window"] == 0
+
+def test_old_failures_leave_the_window(clock):
+    breaker = CircuitBreaker("test", window_s=10, min_calls=3, error_rate=0.5, open_s=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 11
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+
+def test_open_providers_are_skipped(clock):
+    registry = BreakerRegistry()
+    for name in ("a", "b", "c"):
+        registry._breakers[name] = CircuitBreaker(name, min_calls=1, error_rate=0.5, open_s=30)
+    registry.get("a").record_failure()
+    assert registry.ordered(["a", "b", "c"]) == ["b", "c"]
+
+    clock.now += 30
+    registry.get("b").record_failure()
+    assert registry.ordered(["a", "b", "c"]) == ["c", "a"] # a is half-open: due a probe, tried last
+
+    registry.get("c").record_failure()
+    assert registry.ordered(["a", "b", "c"]) == ["a"]
+    registry.get("a").allow()
+    registry.get("a").record_failure()
+    with pytest.raises(CircuitOpen):
+        registry.ordered(["a", "b", "c"])
+
+def test_providers_are_ranked_by_error_rate(clock):
+    registry = BreakerRegistry()
+    for name in ("a", "b", "c"):
+        registry._breakers[name] = CircuitBreaker(name, min_calls=4, error_rate=0.9, open_s=30)
+    for outcome in (True, True, True, False):
+        (registry.get("a").record_success if outcome else registry.get("a").record_failure)()
+    registry.get("b").record_failure() # Too few calls to judge
+    assert registry.ordered(["a", "b", "c"]) == ["b", "c", "a"]
+
+@pytest.mark.asyncio
+async def test_transcription_skips_a_provider_that_is_down(clock, monkeypatch):
+    monkeypatch.setattr(voice_module, "breakers", BreakerRegistry())
+    monkeypatch.setattr(settings, "GOOGLE_API_KEY", "key")
+    monkeypatch.setattr(settings, "BREAKER_MIN_CALLS", 2)
+    monkeypatch.setattr(settings, "BREAKER_OPEN_S", 30)
+
+    calls = []
+    async def gemini(path):
+        calls.append("gemini")
+        raise RuntimeError("gemini down")
+    async def assemblyai(path):
+        calls.append("assemblyai")
+        return "hello"
+
+    service = VoiceService()
+    service._transcriber = object()
+    monkeypatch.setattr(service, "_transcribe_gemini", gemini)
+    monkeypatch.setattr(service, "_transcribe_assemblyai", assemblyai)
+
+    for _ in range(4):
+        assert await service._transcribe_file("answer.wav") == "hello"
+    # Two failures open Gemini's breaker; later requests go straight to AssemblyAI
+    assert calls == ["gemini", "assemblyai", "gemini", "assemblyai", "assemblyai", "assemblyai"]
+
+    calls.clear()
+    clock.now += 30
+    assert await service._transcribe_file("answer.wav") == "hello"
+    await settle()
+    # Gemini is half-open: probed in the background, which fails and re-opens the breaker
+    assert sorted(calls) == ["assemblyai", "gemini"]
+    assert voice_module.breakers.get("stt.gemini").state == BreakerState.OPEN
+    calls.clear()
+    assert await service._transcribe_file("answer.wav") == "hello"
+    assert calls == ["assemblyai"]
+
+    clock.now += 30
+    monkeypatch.setattr(service, "_transcribe_gemini", lambda path: assemblyai(path))
+    await service._transcribe_file("answer.wav")
+    await settle()
+    assert voice_module.breakers.get("stt.gemini").state == BreakerState.CLOSED
+
+@pytest.mark.asyncio
+async def test_tts_falls_back_to_gtts_without_elevenlabs(clock, monkeypatch):
+    monkeypatch.setattr(voice_module, "breakers", BreakerRegistry())
+    monkeypatch.setattr(voice_module, "_GTTS_INSTALLED", True)
+    service = VoiceService()
+    service._elevenlabs = None # No API key
+
+    used = []
+    async def synthesize(provider, text):
+        used.append(provider)
+        yield b"ID3"
+    monkeypatch.setattr(service, "_synthesize", synthesize)
+
+    assert [chunk async for chunk in service.stream_audio("Hello?")] == [b"ID3"]
+    assert used == ["tts.gtts"]
+
+    monkeypatch.setattr(voice_module, "_GTTS_INSTALLED", False)
+    with pytest.raises(ValueError):
+        [chunk async for chunk in service.stream_audio("Hello?")]
@@ -0,0 +1,169 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.core.config import ModelRoute, settings
+from app.core.deadline import DeadlineExceeded, deadline_scope, remaining
+from app.core.metrics import metrics
+from app.services.gemini_service import GeminiService, HedgeBudget
+
+class Response:
+    def __init__(self, content, usage=None):
+        self.content = content
+        self.usage_metadata = usage
+
+class FakeModel:
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = 0
+        self.finish_on_cancel = False # The answer arrives just as the call is cancelled
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if not self.finish_on_cancel:
+                raise
+        return Response(self.name, {"input_tokens": 10, "output_tokens": 5})
+
+    async def astream(self, prompt):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        for part in (self.name, "!"):
+            yield Response(part)
+
+@pytest.fixture
+def service(request, monkeypatch):
+    # Unique model names per test keep the global latency windows apart
+    primary, fallback = f"{request.node.name}/primary", f"{request.node.name}/fallback"
+    monkeypatch.setitem(settings.MODEL_ROUTES, "question", ModelRoute(
+        primary=primary, fallback=fallback, max_tokens=100, latency_budget_s=5
+    ))
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 5)
+    for _ in range(5):
+        metrics.observe("llm_latency_seconds", 0.02, task="question", model=primary)
+
+    models = {primary: FakeModel("primary", 0.0), fallback: FakeModel("fallback", 0.0)}
+    service = GeminiService()
+    service._hedges = HedgeBudget(max_rate=1.0)
+    monkeypatch.setattr(service, "_client", lambda model, route, json_mode=False: models[model])
+    return service, models[primary], models[fallback], primary
+
+def hedge_counter(name, model):
+    return metrics.counter(name, task="question", model=model)
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled(service):
+    service, primary, fallback, name = service
+    primary.delay, fallback.delay = 1.0, 0.01
+
+    assert await service._invoke("question", "Q") == "fallback"
+    assert hedge_counter("llm_hedges_fired", name) == 1
+    assert hedge_counter("llm_hedges_won", name) == 1
+    assert primary.cancelled == 1
+
+@pytest.mark.asyncio
+async def test_hedge_that_loses_is_counted_as_wasted(service):
+    service, primary, fallback, name = service
+    primary.delay, fallback.delay = 0.06, 1.0
+
+    assert await service._invoke("question", "Q") == "primary"
+    assert hedge_counter("llm_hedges_wasted", name) == 1
+    assert fallback.cancelled == 1
+
+@pytest.mark.asyncio
+async def test_hedge_latency_is_timed_from_its_own_start(service):
+    service, primary, fallback, name = service
+    primary.delay, fallback.delay = 1.0, 0.0
+    fallback_name = name.replace("/primary", "/fallback")
+
+    assert await service._invoke("question", "Q") == "fallback"
+    # Hedged after the primary's p95 (0.02s); that wait isn't the fallback's latency
+    assert metrics.percentile("llm_latency_seconds", 100, min_samples=1, task="question", model=fallback_name) < 0.015
+
+@pytest.mark.asyncio
+async def test_losing_call_is_awaited_and_its_tokens_counted(service):
+    service, primary, fallback, name = service
+    primary.delay, fallback.delay = 1.0, 0.0
+    primary.finish_on_cancel = True
+
+    assert await service._invoke("question", "Q") == "fallback"
+    assert primary.cancelled == 1
+    assert metrics.counter("llm_calls", task="question", model=name, outcome="hedge_lost") == 1
+    assert metrics.counter("llm_tokens", task="question", model=name, kind="output") == 5
+
+@pytest.mark.asyncio
+async def test_fast_calls_are_not_hedged(service):
+    service, primary, fallback, name = service
+    assert await service._invoke("question", "Q") == "primary"
+    assert fallback.calls == 0
+
+def test_hedge_rate_is_capped():
+    budget = HedgeBudget(max_rate=0.25)
+    for _ in range(3):
+        budget.record(hedged=False)
+    assert budget.allow()
+    budget.record(hedged=True)
+    assert not budget.allow()
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_calls_and_skips_fallback(service):
+    service, primary, fallback, name = service
+    primary.delay = 1.0
+    service._hedges = HedgeBudget(max_rate=0.0)
+
+    with deadline_scope(0.1):
+        with pytest.raises(DeadlineExceeded):
+            await service._invoke("question", "Q")
+    assert fallback.calls == 0
+
+@pytest.mark.asyncio
+async def test_slow_first_chunk_is_hedged(service):
+    service, primary, fallback, name = service
+    for _ in range(5):
+        metrics.observe("llm_first_token_seconds", 0.02, task="question", model=name)
+    primary.delay, fallback.delay = 1.0, 0.01
+
+    text = "".join([part async for part in service._stream("question", "Q")])
+    assert text == "fallback!"
+    assert primary.cancelled == 1
+    assert hedge_counter("llm_hedges_won", name) >= 1
+
+@pytest.mark.asyncio
+async def test_fast_stream_is_not_hedged(service):
+    service, primary, fallback, name = service
+    for _ in range(5):
+        metrics.observe("llm_first_token_seconds", 0.5, task="question", model=name)
+    primary.delay = 0.0
+
+    assert "".join([part async for part in service._stream("question", "Q")]) == "primary!"
+    assert fallback.calls == 0
+
+@pytest.mark.asyncio
+async def test_analysis_propagates_deadline_instead_of_placeholder():
+    service = GeminiService()
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded):
+            await service.analyze_response(question="Q", answer="A", job_role="Engineer", difficulty="Medium")
+
+def test_nested_deadline_only_tightens():
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert remaining() <= 10
+        with deadline_scope(1):
+            assert remaining() <= 1
+    assert remaining() is None
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import api_routes
+from app.core import http_cache
+from app.core.http_cache import CompressionMiddleware, ImmutableStaticFiles, negotiate_encoding
+from app.core.metrics import metrics
+from app.services.tts_stream import tts_streams
+
+REPORT = "# Final Report\n\n" + "The candidate explained trade-offs clearly. " * 200
+
+@pytest.fixture
+def client(api_app):
+    app = api_app
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for _ in range(3):
+                yield "x" * 2000 + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware)
+    with TestClient(app) as test_client:
+        yield test_client
+
+def test_negotiation_prefers_brotli_and_honors_q_values(monkeypatch):
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip;q=0") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("*") == "br"
+    monkeypatch.setattr(http_cache, "brotli", None)
+    assert negotiate_encoding("gzip, br") == "gzip"
+
+def test_report_is_compressed_and_revalidated_with_etag(client):
+    api_routes.SESSION_STORE["s1"] = {"final_report": REPORT}
+    saved_before = metrics.counter("http_bytes_saved", reason="gzip")
+
+    first = client.get("/api/v1/report/s1", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.json()["report"] == REPORT # Decoded by the client
+    assert int(first.headers["content-length"]) < len(REPORT) // 5
+    assert metrics.counter("http_bytes_saved", reason="gzip") > saved_before
+
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    again = client.get("/api/v1/report/s1", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+
+    # A regenerated report no longer matches
+    api_routes.SESSION_STORE["s1"]["final_report"] = REPORT + "\nAddendum."
+    changed = client.get("/api/v1/report/s1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+def test_pending_report_is_not_cached(client):
+    api_routes.SESSION_STORE["s1"] = {"final_report": None}
+    response = client.get("/api/v1/report/s1")
+    assert response.json() == {"status": "in_progress"}
+    assert response.headers["cache-control"] == "no-store"
+
+def test_small_and_streamed_responses_are_not_compressed(client):
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in streamed.headers
+    assert streamed.text.count("\n") == 3
+
+def test_brotli_when_accepted(client):
+    pytest.importorskip("brotli")
+    api_routes.SESSION_STORE["s1"] = {"final_report": REPORT}
+    response = client.get("/api/v1/report/s1", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+
+def test_finished_audio_is_immutable(client):
+    audio_id = "b" * 32
+    os.makedirs(os.path.dirname(tts_streams.path_for(audio_id)))
+    with open(tts_streams.path_for(audio_id), "wb") as f:
+        f.write(bytes(range(100)))
+
+    response = client.get(f"/api/v1/audio/{audio_id}")
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["etag"] == f'"{audio_id}"'
+    partial = client.get(f"/api/v1/audio/{audio_id}", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206 and "immutable" in partial.headers["cache-control"]
+
+    again = client.get(f"/api/v1/audio/{audio_id}", headers={"If-None-Match": f'"{audio_id}"'})
+    assert again.status_code == 304
+
+def test_static_audio_is_immutable(tmp_path):
+    (tmp_path / "q.mp3").write_bytes(b"ID3" * 10)
+    app = FastAPI()
+    app.mount("/static/audio", ImmutableStaticFiles(directory=str(tmp_path)))
+    with TestClient(app) as client:
+        response = client.get("/static/audio/q.mp3")
+        assert response.status_code == 200 and "immutable" in response.headers["cache-control"]
+        again = client.get("/static/audio/q.mp3", headers={"If-None-Match": response.headers["etag"]})
+        assert again.status_code == 304 and "immutable" in again.headers["cache-control"]
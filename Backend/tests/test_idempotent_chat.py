@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app import api_routes
+from app.core.config import settings
+from app.core.idempotency import SessionTurns
+from app.core.metrics import metrics
+from app.services.gemini_service import gemini_service
+
+@pytest.fixture
+def fakes(stub_tts, make_session, monkeypatch):
+    monkeypatch.setattr(api_routes, "session_turns", SessionTurns())
+    calls = {"analyze": [], "active": 0, "overlapped": False, "fail": False, "fail_question": False}
+
+    async def fake_analyze(**kwargs):
+        calls["analyze"].append(kwargs["answer"])
+        calls["active"] += 1
+        calls["overlapped"] |= calls["active"] > 1
+        await asyncio.sleep(0.05)
+        calls["active"] -= 1
+        if calls["fail"]:
+            raise RuntimeError("model down")
+        return {"feedback": "Nice.", "sentiment_score": 0.5}
+
+    async def fake_generate(**kwargs):
+        if calls["fail_question"]:
+            raise RuntimeError("model down")
+        return f"Q{kwargs['question_num']}?"
+
+    async def fake_stream_question(**kwargs):
+        yield await fake_generate(**kwargs)
+
+    monkeypatch.setattr(gemini_service, "analyze_response", fake_analyze)
+    monkeypatch.setattr(gemini_service, "generate_question", fake_generate)
+    monkeypatch.setattr(gemini_service, "stream_question", fake_stream_question)
+    api_routes.SESSION_STORE["s1"] = make_session()
+    return calls
+
+@pytest.fixture
+def client(api_app):
+    return lambda: httpx.AsyncClient(transport=httpx.ASGITransport(app=api_app), base_url="http://test")
+
+@pytest.mark.asyncio
+async def test_duplicates_share_one_turn_and_are_replayed(fakes, client):
+    before = metrics.counter("chat_turns", outcome="coalesced")
+    async with client() as c:
+        send = lambda: c.post("/api/v1/chat", data={"session_id": "s1", "text_input": "Use a dict."})
+        first, second = await asyncio.gather(send(), send()) # Double-click, no Idempotency-Key
+        assert first.json() == second.json()
+        assert fakes["analyze"] == ["Use a dict."]
+        assert metrics.counter("chat_turns", outcome="coalesced") == before + 1
+
+        # A client retry after the turn finished, with an explicit key
+        headers = {"Idempotency-Key": "turn-2"}
+        data = {"session_id": "s1", "text_input": "Hash map."}
+        second_turn = (await c.post("/api/v1/chat", data=data, headers=headers)).json()
+        assert (await c.post("/api/v1/chat", data=data, headers=headers)).json() == second_turn
+        assert fakes["analyze"] == ["Use a dict.", "Hash map."]
+    assert api_routes.SESSION_STORE["s1"]["current_question_num"] == 3
+
+@pytest.mark.asyncio
+async def test_different_answers_run_one_at_a_time(fakes, client):
+    async with client() as c:
+        responses = await asyncio.gather(*[
+            c.post("/api/v1/chat", data={"session_id": "s1", "text_input": text}) for text in ("A", "B")
+        ])
+    assert not fakes["overlapped"]
+    assert sorted(r.json()["question"] for r in responses) == ["Q2?", "Q3?"]
+    assert api_routes.SESSION_STORE["s1"]["current_question_num"] == 3
+
+@pytest.mark.asyncio
+async def test_failed_turn_is_retried_and_streams_replay(fakes, client):
+    data = {"session_id": "s1", "text_input": "Use a dict."}
+    async with client() as c:
+        fakes["fail"] = True
+        assert (await c.post("/api/v1/chat", data=data)).status_code == 500
+        fakes["fail"] = False
+        # The question advances after the first stream, so a resend needs the key to match
+        headers = {"Idempotency-Key": "turn-1"}
+        streams = [(await c.post("/api/v1/chat/stream", data=data, headers=headers)).text for _ in range(2)]
+    assert len(fakes["analyze"]) == 2 # The failure wasn't cached; the resent stream was
+    assert streams[0] == streams[1]
+    assert json.loads(streams[0].splitlines()[-1])["response"]["question"] == "Q2?"
+
+@pytest.mark.asyncio
+async def test_retry_after_failure_runs_on_untouched_state(fakes, client):
+    data = {"session_id": "s1", "text_input": "Use a dict."}
+    async with client() as c:
+        # Analysis succeeds, then the next question fails: nothing of the turn is kept
+        fakes["fail_question"] = True
+        assert (await c.post("/api/v1/chat", data=data)).status_code == 500
+        state = api_routes.SESSION_STORE["s1"]
+        assert len(state["turns"]) == 0 and state["current_question_num"] == 1
+
+        fakes["fail_question"] = False
+        retry = await c.post("/api/v1/chat", data=data) # Same derived key as the failed attempt
+    assert retry.status_code == 200 and retry.json()["question"] == "Q2?"
+    state = api_routes.SESSION_STORE["s1"]
+    assert [t.answer for t in state["turns"]] == ["Use a dict."]
+    assert state["current_question_num"] == 2
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_forgotten(fakes, client, monkeypatch):
+    async with client() as c:
+        assert (await c.post("/api/v1/chat", data={"session_id": "s1", "text_input": "Use a dict."})).status_code == 200
+    turns = api_routes.session_turns
+    assert "s1" in turns._sessions
+
+    async def produce():
+        yield {"type": "done"}
+    monkeypatch.setattr(settings, "IDEMPOTENCY_SESSION_RETENTION_S", 0)
+    async for _ in turns.start("s2", "turn-1", produce).iter_events():
+        pass
+    assert "s1" not in turns._sessions
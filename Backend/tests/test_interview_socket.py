@@ -0,0 +1,147 @@
+import json
+
+import pytest
+
+from app import api_routes
+from app.core.admission import AdmissionController
+from app.core.config import settings
+from app.services.voice_service import voice_service
+
+START = {"type": "start", "target_company": "Google", "job_role": "Engineer", "interview_style": "Professional", "difficulty": "Medium"}
+
+@pytest.fixture
+def client(api_client, stub_providers, monkeypatch):
+    monkeypatch.setattr(api_routes, "admission", AdmissionController())
+    monkeypatch.setattr(settings, "STREAMING_STT_BACKEND", "buffered")
+
+    class FakeGraph:
+        async def ainvoke(self, state):
+            return {**state, "current_question": "Tell me about yourself.", "current_question_num": 1, "follow_up_count": 0}
+
+    async def fake_transcribe(path):
+        return "I write Python."
+
+    async def fake_report(state):
+        state["final_report"] = "# Report"
+        return state
+
+    monkeypatch.setattr(api_routes, "get_interview_app", lambda: FakeGraph())
+    monkeypatch.setattr(api_routes, "generate_report_node", fake_report)
+    monkeypatch.setattr(voice_service, "transcribe_audio", fake_transcribe)
+    return api_client
+
+def receive(ws):
+    message = ws.receive()
+    return message["bytes"] if message.get("bytes") is not None else json.loads(message["text"])
+
+def receive_until(ws, kind):
+    messages = []
+    while True:
+        message = receive(ws)
+        messages.append(message)
+        if isinstance(message, dict) and message["type"] in (kind, "error"):
+            return messages
+
+def test_whole_interview_over_one_connection(client):
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json(START)
+        session = receive(ws)
+        assert session["type"] == "session" and session["question"] == "Tell me about yourself."
+        audio = receive_until(ws, "audio_end")
+        assert b"".join(m for m in audio if isinstance(m, bytes)) == b"ID3Tell me about yourself."
+
+        ws.send_json({"type": "answer", "text": "I write Python."})
+        events = receive_until(ws, "audio_end")
+        types = [m["type"] if isinstance(m, dict) else "bytes" for m in events]
+        assert types == ["transcript", "feedback", "question_delta", "question_delta", "question", "done", "audio_start", "bytes", "audio_end"]
+        assert events[5]["response"]["question"] == "What is a closure?"
+
+    api_routes.SESSION_STORE.pop(session["session_id"], None)
+
+def test_audio_answer_and_report(client):
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json(START)
+        session_id = receive(ws)["session_id"]
+        receive_until(ws, "audio_end")
+        api_routes.SESSION_STORE[session_id]["total_questions"] = 1 # This answer ends the interview
+
+        ws.send_json({"type": "audio_start", "sample_rate": 16000})
+        ws.send_bytes(b"\x00\x00" * 1600)
+        ws.send_json({"type": "audio_end"})
+        events = receive_until(ws, "report_ready")
+        assert events[0] == {"type": "transcript", "text": "I write Python."}
+        assert events[-2]["response"]["is_finished"]
+        assert events[-1]["report"] == "# Report"
+
+    api_routes.SESSION_STORE.pop(session_id, None)
+    api_routes.REPORT_TASKS.pop(session_id, None)
+
+def test_transcription_failure_is_reported_and_connection_stays_open(client, monkeypatch):
+    async def broken_transcribe(path):
+        raise RuntimeError("STT provider down")
+    monkeypatch.setattr(voice_service, "transcribe_audio", broken_transcribe)
+
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json(START)
+        session_id = receive(ws)["session_id"]
+        receive_until(ws, "audio_end")
+
+        ws.send_json({"type": "audio_start", "sample_rate": 16000})
+        ws.send_bytes(b"\x00\x00" * 1600)
+        ws.send_json({"type": "audio_end"})
+        error = receive_until(ws, "error")[-1]
+        assert error["type"] == "error" and "STT provider down" in error["detail"]
+
+        # The connection still works: a typed answer runs the turn
+        ws.send_json({"type": "answer", "text": "I write Python."})
+        assert receive_until(ws, "done")[-1]["type"] == "done"
+
+    api_routes.SESSION_STORE.pop(session_id, None)
+
+def test_failed_start_is_reported_and_frees_the_slot(client, monkeypatch):
+    class BrokenGraph:
+        async def ainvoke(self, state):
+            raise RuntimeError("LLM provider down")
+    monkeypatch.setattr(api_routes, "get_interview_app", lambda: BrokenGraph())
+
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json(START)
+        error = receive(ws)
+        assert error["status"] == 500 and "LLM provider down" in error["detail"]
+        assert api_routes.admission.stats()["active"] == 0
+
+        # The connection still works and has no session
+        ws.send_json({"type": "answer", "text": "Hi"})
+        assert receive(ws)["detail"] == "Send start or resume first"
+
+def test_missing_audio_file_is_reported(client, monkeypatch):
+    monkeypatch.setattr(api_routes.tts_streams, "start", lambda text: "pruned")
+
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json(START)
+        session_id = receive(ws)["session_id"]
+        error = receive(ws)
+        assert (error["type"], error["status"]) == ("error", 404)
+
+    api_routes.SESSION_STORE.pop(session_id, None)
+
+def test_resume_after_reconnect(client):
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json(START)
+        session_id = receive(ws)["session_id"]
+
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json({"type": "answer", "text": "Hi"})
+        assert receive(ws)["detail"] == "Send start or resume first"
+        ws.send_json({"type": "resume", "session_id": session_id})
+        session = receive(ws)
+        assert (session["session_id"], session["question_num"]) == (session_id, 1)
+
+        ws.send_json({"type": "resume", "session_id": "missing"})
+        assert receive_until(ws, "error")[-1]["detail"] == "This connection already has a session"
+
+    with client.websocket_connect("/api/v1/ws/interview") as ws:
+        ws.send_json({"type": "resume", "session_id": "missing"})
+        assert receive(ws)["status"] == 404
+
+    api_routes.SESSION_STORE.pop(session_id, None)
@@ -0,0 +1,55 @@
+import os
+import sys
+import warnings
+
+import pytest
+
+# The legacy modules use package-relative imports: import them as Backend.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+from google.generativeai import protos
+from langchain_core.messages import AIMessage, HumanMessage
+
+from Backend.agents.gemini_client import ChatSessions, get_gemini_model
+
+SYSTEM = "You are an interviewer."
+
+class StubTransport:
+    def __init__(self):
+        self.requests = []
+
+    async def generate_content(self, request, **kwargs):
+        self.requests.append([(c.role, c.parts[0].text) for c in request.contents])
+        return protos.GenerateContentResponse(candidates=[protos.Candidate(
+            content=protos.Content(role="model", parts=[protos.Part(text=f"Q{len(self.requests) + 1}?")]),
+            finish_reason=protos.Candidate.FinishReason.STOP
+        )])
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = StubTransport()
+    monkeypatch.setattr(get_gemini_model(system_instruction=SYSTEM), "_async_client", transport)
+    return transport
+
+@pytest.mark.asyncio
+async def test_handle_is_reused_and_rebuilt_after_eviction(transport):
+    chats = ChatSessions(maxsize=1)
+    messages = [HumanMessage(content="Hi")]
+    assert await chats.send("a", messages, SYSTEM) == "Q2?"
+    handle = chats._chats["a"][1]
+
+    messages += [AIMessage(content="Q2?"), HumanMessage(content="Answer 1")]
+    await chats.send("a", messages, SYSTEM)
+    assert chats._chats["a"][1] is handle
+    assert transport.requests[-1] == [("user", "Hi"), ("model", "Q2?"), ("user", "Answer 1")]
+
+    await chats.send("b", [HumanMessage(content="Hello")], SYSTEM) # Evicts "a"
+    assert list(chats._chats) == ["b"]
+
+    messages += [AIMessage(content="Q3?"), HumanMessage(content="Answer 2")]
+    await chats.send("a", messages, SYSTEM)
+    assert chats._chats["a"][1] is not handle
+    assert [role for role, _ in transport.requests[-1]] == ["user", "model"] * 2 + ["user"]
+    assert transport.requests[-1][-1] == ("user", "Answer 2")
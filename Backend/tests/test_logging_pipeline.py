@@ -0,0 +1,85 @@
+import atexit
+import io
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.core import logging_config
+from app.core.config import settings
+from app.core.logging_config import candidate
+from app.core.metrics import metrics
+
+@pytest.fixture
+def pipeline(monkeypatch, request):
+    """A logger wired like the app's, writing to a buffer; output is read after a flush."""
+    name = f"test.{request.node.name}"
+    monkeypatch.setattr(settings, "LOG_SAMPLE_RATES", {f"{name}.turn": 0.0})
+    monkeypatch.setattr(settings, "LOG_MAX_MESSAGE_CHARS", 60)
+    stream = io.StringIO()
+    log, listener = logging_config.setup_logging(name, stream=stream)
+    log.propagate = False
+
+    def flush() -> str:
+        listener.stop()
+        atexit.unregister(listener.stop)
+        return stream.getvalue()
+    yield log, flush
+    log.handlers.clear()
+
+def test_sampling_keeps_warnings_and_counts_drops(pipeline):
+    log, flush = pipeline
+    turn = log.getChild("turn")
+    for _ in range(5):
+        turn.info("Running analyze_answer_node...")
+    turn.warning("LLM fallback")
+    log.info("Session started")
+
+    output = flush()
+    assert "analyze_answer_node" not in output
+    assert "LLM fallback" in output and "Session started" in output
+    assert metrics.snapshot()[f"logging.{log.name}"]["sampled_out"] == {f"{log.name}.turn": 5}
+
+def test_contact_details_are_masked_and_messages_capped(pipeline):
+    log, flush = pipeline
+    log.info("Reach me at jane.doe@example.com or +1 (415) 555-0134")
+    log.info("Session 550e8400-e29b-41d4-a716-446655440000 started")
+    log.info("x" * 100)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("Analysis failed")
+
+    lines = flush()
+    assert "Reach me at <email> or <phone>" in lines
+    assert "550e8400-e29b-41d4-a716-446655440000" in lines
+    assert "x" * 60 + "... [40 chars truncated]" in lines
+    assert "ValueError: boom" in lines # Traceback formatted before the record is queued
+
+def test_plain_numbers_are_kept_and_tracebacks_masked(pipeline):
+    log, flush = pipeline
+    log.info("Uploaded 104857600 bytes")
+    log.info("Job 20261019123456 took 1234 ms")
+    log.info("Call 415-555-0134 or +14155550134")
+    try:
+        raise ValueError("bad contact: jane.doe@example.com, +44 20 7946 0958")
+    except ValueError:
+        log.exception("Parse failed")
+
+    lines = flush()
+    assert "Uploaded 104857600 bytes" in lines
+    assert "Job 20261019123456 took 1234 ms" in lines
+    assert "Call <phone> or <phone>" in lines
+    assert "ValueError: bad contact: <email>, <phone>" in lines
+    assert "jane.doe" not in lines
+
+def test_candidate_content_is_redacted_unless_enabled(monkeypatch):
+    assert candidate("I led the billing migration.") == "<28 chars redacted>"
+    monkeypatch.setattr(settings, "LOG_CANDIDATE_CONTENT", True)
+    monkeypatch.setattr(settings, "LOG_CANDIDATE_PREVIEW_CHARS", 5)
+    assert candidate("I led the billing migration.") == "I led..."
+    assert candidate(None) == "<none>"
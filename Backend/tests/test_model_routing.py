@@ -0,0 +1,81 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.core.config import ModelRoute, Settings, settings
+from app.core.metrics import metrics
+from app.services.gemini_service import GeminiService
+
+class Chunk:
+    def __init__(self, content, usage_metadata=None):
+        self.content = content
+        self.usage_metadata = usage_metadata
+
+class FakeModel:
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        return Chunk(f"{self.name}: {prompt}", {"input_tokens": 1000, "output_tokens": 500})
+
+    async def astream(self, prompt):
+        await asyncio.sleep(self.delay)
+        for word in ["from ", self.name]:
+            yield Chunk(word)
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setitem(settings.MODEL_ROUTES, "question", ModelRoute(
+        primary="slow/model", fallback="fast/model", max_tokens=100, latency_budget_s=0.05
+    ))
+    monkeypatch.setitem(settings.MODEL_PRICES, "fast/model", (1.0, 2.0))
+    models = {"slow/model": FakeModel("slow", delay=1.0), "fast/model": FakeModel("fast")}
+
+    service = GeminiService()
+    monkeypatch.setattr(service, "_client", lambda model, route, json_mode=False: models[model])
+    return service, models
+
+@pytest.mark.asyncio
+async def test_over_budget_primary_falls_back(service):
+    service, _ = service
+    timeouts = metrics.counter("llm_calls", task="question", model="slow/model", outcome="timeout")
+    cost = metrics.counter("llm_cost_usd", task="question", model="fast/model")
+
+    assert await service._invoke("question", "Q") == "fast: Q"
+    assert metrics.counter("llm_calls", task="question", model="slow/model", outcome="timeout") == timeouts + 1
+    # 1000 input tokens at $1/M + 500 output tokens at $2/M
+    assert metrics.counter("llm_cost_usd", task="question", model="fast/model") == pytest.approx(cost + 0.002)
+
+@pytest.mark.asyncio
+async def test_errors_fall_back_until_the_last_model(service):
+    service, models = service
+    models["slow/model"].delay = 0
+    models["slow/model"].fail = True
+    assert await service._invoke("question", "Q") == "fast: Q"
+
+    models["fast/model"].fail = True
+    with pytest.raises(RuntimeError, match="fast down"):
+        await service._invoke("question", "Q")
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_before_first_token(service):
+    service, _ = service
+    assert [text async for text in service._stream("question", "Q")] == ["from ", "fast"]
+
+def test_route_overrides_keep_other_defaults(monkeypatch):
+    monkeypatch.setenv("MODEL_ROUTES", '{"report": {"primary": "anthropic/claude-sonnet-4", "max_tokens": 6000}}')
+    routes = Settings().MODEL_ROUTES
+    assert routes["report"].primary == "anthropic/claude-sonnet-4"
+    assert routes["report"].fallback is None
+    assert routes["question"] == settings.MODEL_ROUTES["question"]
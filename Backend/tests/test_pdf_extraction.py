@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pymupdf
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.services import pdf_extraction
+from app.services.pdf_extraction import ExtractionError, PdfExtractor
+from app.services.resume_service import resume_service
+
+def make_pdf(*lines: str) -> bytes:
+    doc = pymupdf.open()
+    page = doc.new_page()
+    for i, line in enumerate(lines):
+        page.insert_text((72, 72 + 14 * i), line)
+    return doc.tobytes()
+
+class Upload:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def read(self):
+        return self.data
+
+def test_first_backend_that_finds_text_wins():
+    result = PdfExtractor(["pymupdf", "pypdf"]).extract(make_pdf("Skills: Python", "Experience: 5 years"))
+    assert result.backend == "pymupdf" and result.pages == 1 and result.fallbacks == 0
+    assert result.text.split("\n") == ["Skills: Python", "Experience: 5 years"]
+
+def test_falls_back_on_empty_text_and_on_errors(monkeypatch):
+    monkeypatch.setitem(pdf_extraction.BACKENDS, "pymupdf", lambda data: [" \n", ""])
+    result = PdfExtractor(["pymupdf", "pypdf"]).extract(make_pdf("Skills: Python"))
+    assert (result.backend, result.fallbacks, result.text) == ("pypdf", 1, "Skills: Python")
+
+    # The sample resume in the repo is plain text saved as .pdf
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test.pdf"), "rb") as f:
+        result = PdfExtractor().extract(f.read())
+    assert result.backend == "text" and result.fallbacks == 0 # Not a PDF: tried as text first
+    assert "Skills: Python, FastAPI, AI." in result.text
+
+def test_document_decides_the_backends(monkeypatch):
+    extractor = PdfExtractor(["pymupdf", "pypdf", "text"])
+    assert extractor.plan(make_pdf("Skills: Python")) == ["pymupdf", "pypdf"]
+    assert extractor.plan(b"Skills: Python") == ["text", "pymupdf", "pypdf"]
+
+    # No fonts: nothing to extract, so no parser runs
+    monkeypatch.setitem(pdf_extraction.BACKENDS, "pymupdf", lambda data: pytest.fail("parsed a scan"))
+    scan = pymupdf.open()
+    scan.new_page().draw_rect((72, 72, 144, 144))
+    with pytest.raises(ExtractionError) as e:
+        extractor.extract(scan.tobytes())
+    assert e.value.attempts == {"inspection": "no text"}
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        PdfExtractor(["pymupdf", "pdfminer"])
+
+@pytest.mark.asyncio
+async def test_resume_service_reports_scans_and_garbage(monkeypatch):
+    blank = pymupdf.open()
+    blank.new_page()
+    assert (await resume_service.extract_text(Upload(blank.tobytes()))).startswith("Warning: No text")
+
+    monkeypatch.setattr(pdf_extraction.pdf_extractor, "backends", ["pymupdf", "pypdf"])
+    assert (await resume_service.extract_text(Upload(b"\x00\x01garbage"))).startswith("Error extracting resume")
+    assert "Skills: Python" in await resume_service.extract_text(Upload(make_pdf("Skills: Python")))
+
+def test_all_failures_are_listed():
+    with pytest.raises(ExtractionError) as e:
+        PdfExtractor(["pymupdf", "pypdf"]).extract(b"not a pdf")
+    assert set(e.value.attempts) == {"pymupdf", "pypdf"}
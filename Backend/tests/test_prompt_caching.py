@@ -0,0 +1,104 @@
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.usage import SessionUsage, usage_scope
+from app.services.gemini_service import GeminiService
+
+SESSION = dict(
+    target_company="Google",
+    interview_style="Technical",
+    job_role="Backend Engineer",
+    topic="Distributed Systems",
+    total_questions=5,
+    resume_text="- 6 years of Go and Python\n- Led migration to Kafka"
+)
+
+def serialize(messages):
+    return "".join(f"<{m['role']}>{m['content']}" for m in messages)
+
+class PrefixCachingModel:
+    """Stand-in for a provider with implicit prompt caching.
+
+    Reports the longest prefix shared with any earlier prompt as cached input,
+    at roughly 4 characters per token.
+    """
+
+    def __init__(self):
+        self.seen = []
+
+    async def ainvoke(self, messages):
+        prompt = serialize(messages)
+        cached = max((len(os.path.commonprefix([prompt, earlier])) for earlier in self.seen), default=0)
+        self.seen.append(prompt)
+
+        class Response:
+            content = "Next question?"
+            usage_metadata = {
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": 5,
+                "input_token_details": {"cache_read": cached // 4}
+            }
+        return Response()
+
+def turns(service, count):
+    history = []
+    for num in range(1, count + 1):
+        yield service._question_prompt(
+            **SESSION, difficulty=["Medium", "Hard", "Easy"][num % 3], question_num=num, history=list(history)
+        )
+        history.append(f"Question: Q{num}?\nAnswer: A{num}.\nFeedback: Fine.")
+
+def test_question_prompt_prefix_is_stable_across_turns():
+    service = GeminiService()
+    prompts = list(turns(service, 4))
+
+    assert len({p[0]["content"] for p in prompts}) == 1 # System message never changes
+    for earlier, later in zip(prompts, prompts[1:]):
+        # Everything up to the end of the earlier turn's history is reused
+        reusable = serialize(earlier).rsplit("\n\nNext:", 1)[0].replace("No previous history.", "")
+        assert serialize(later).startswith(reusable)
+        assert "Difficulty" not in earlier[0]["content"]
+
+@pytest.mark.asyncio
+async def test_analysis_and_follow_up_prefixes_ignore_turn_values(monkeypatch):
+    service = GeminiService()
+    calls = []
+
+    async def capture(task, prompt, json_mode=False):
+        calls.append(prompt)
+        return '{"feedback": "ok", "sentiment_score": 0, "technical_accuracy": 0.5}'
+    monkeypatch.setattr(service, "_invoke", capture)
+
+    for question, difficulty in [("Q1?", "Easy"), ("Q2?", "Hard")]:
+        await service.analyze_response(question=question, answer="A", job_role="Backend Engineer", difficulty=difficulty)
+        await service.generate_followup_question(target_company="Google", question=question, answer="A")
+
+    analysis, follow_up = calls[0::2], calls[1::2]
+    assert analysis[0][0] == analysis[1][0] and analysis[0][1] != analysis[1][1]
+    assert follow_up[0][0] == follow_up[1][0]
+
+@pytest.mark.asyncio
+async def test_cached_tokens_are_recorded(monkeypatch):
+    model = PrefixCachingModel()
+    service = GeminiService()
+    monkeypatch.setattr(service, "_client", lambda name, route, json_mode=False: model)
+    monkeypatch.setattr(settings, "LLM_HEDGING_ENABLED", False)
+    primary = settings.MODEL_ROUTES["question"].primary
+    before = metrics.counter("llm_tokens", task="question", model=primary, kind="cached_input")
+
+    usage = SessionUsage(budget_usd=None)
+    with usage_scope(usage):
+        for messages in turns(service, 3):
+            await service._invoke("question", messages)
+
+    totals = usage.as_dict()["tasks"]["question"]
+    assert totals["cached_tokens"] > 0.5 * totals["input_tokens"]
+    assert metrics.counter("llm_tokens", task="question", model=primary, kind="cached_input") - before == totals["cached_tokens"]
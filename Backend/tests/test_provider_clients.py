@@ -0,0 +1,63 @@
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.core.config import settings
+from app.services.provider_clients import ProviderClientRegistry
+
+class OkHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+def test_sync_client_is_shared_and_reuses_connections(server_url):
+    registry = ProviderClientRegistry()
+    client = registry.sync_client("elevenlabs")
+    assert registry.sync_client("elevenlabs") is client
+
+    for _ in range(4):
+        client.get(server_url)
+
+    stats = registry.stats()["elevenlabs"]
+    assert stats["requests"] == 4
+    assert stats["new_connections"] == 1
+    assert stats["reuse_ratio"] == pytest.approx(0.75)
+
+@pytest.mark.asyncio
+async def test_async_client_reuse_ratio(server_url):
+    registry = ProviderClientRegistry()
+    client = registry.async_client("openrouter")
+    for _ in range(5):
+        await client.get(server_url)
+
+    assert registry.stats()["openrouter"]["reuse_ratio"] == pytest.approx(0.8)
+    await registry.aclose()
+
+def test_pool_size_override(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_POOL_SIZES", {"openrouter": 3})
+    registry = ProviderClientRegistry()
+    limits = registry._limits("openrouter")
+    assert limits.max_connections == 3
+    assert limits.max_keepalive_connections == 3
+    assert registry._limits("elevenlabs").max_connections == settings.PROVIDER_POOL_MAX_CONNECTIONS
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+
+import pymupdf
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app import api_routes
+from app.core.config import settings
+from app.services import report_pdf
+from app.services.report_pdf import ReportPdfExporter, render_report_pdf
+
+REPORT = "# Final Report\n\n## Strengths\n\n- Clear **system design** answers\n\n| Skill | Score |\n|---|---|\n| Python | 8 |\n"
+
+def pdf_text(data: bytes) -> str:
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return "".join(page.get_text() for page in doc)
+
+@pytest.fixture
+def exporter(monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_PDF_WORKERS", 0) # Threads, so the render can be counted
+    renders = []
+    def counting_render(markdown, title):
+        renders.append(markdown)
+        return render_report_pdf(markdown, title)
+    monkeypatch.setattr(report_pdf, "render_report_pdf", counting_render)
+    exporter = ReportPdfExporter()
+    exporter.renders = renders
+    return exporter
+
+def test_markdown_is_rendered_with_title():
+    pdf = render_report_pdf(REPORT, "Engineer at Google - Interview Report")
+    text = pdf_text(pdf)
+    assert "Final Report" in text and "Clear system design answers" in text and "Python" in text
+    with pymupdf.open(stream=pdf, filetype="pdf") as doc:
+        assert doc.metadata["title"] == "Engineer at Google - Interview Report"
+
+@pytest.mark.asyncio
+async def test_concurrent_exports_share_one_render_and_are_cached(exporter):
+    pdfs = await asyncio.gather(*[exporter.export("s1", REPORT) for _ in range(5)])
+    assert len(exporter.renders) == 1 and len(set(pdfs)) == 1
+    await exporter.export("s1", REPORT)
+    assert len(exporter.renders) == 1
+
+    # A new report version is rendered again and replaces the old entry
+    await exporter.export("s1", REPORT + "\nAddendum.\n")
+    assert len(exporter.renders) == 2
+    assert exporter.stats()["cached"] == 1
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_by_bytes(exporter, monkeypatch):
+    size = len(await exporter.export("a", REPORT))
+    monkeypatch.setattr(settings, "REPORT_PDF_CACHE_MAX_BYTES", int(size * 2.5))
+    await exporter.export("b", REPORT)
+    await exporter.export("c", REPORT)
+    assert [k[0] for k in exporter._cache] == ["b", "c"]
+    assert exporter.stats()["cached_bytes"] <= settings.REPORT_PDF_CACHE_MAX_BYTES
+
+def test_pdf_route(exporter, monkeypatch):
+    monkeypatch.setattr(api_routes, "report_pdf_exporter", exporter)
+    api_routes.SESSION_STORE["pdf-session"] = {"job_role": "Engineer", "target_company": "Google", "final_report": None}
+    app = FastAPI()
+    app.include_router(api_routes.router, prefix="/api/v1")
+    try:
+        with TestClient(app) as client:
+            assert client.get("/api/v1/report/missing/pdf").status_code == 404
+            assert client.get("/api/v1/report/pdf-session/pdf").status_code == 409
+
+            api_routes.SESSION_STORE["pdf-session"]["final_report"] = REPORT
+            response = client.get("/api/v1/report/pdf-session/pdf")
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/pdf"
+            assert int(response.headers["content-length"]) == len(response.content)
+            assert "Final Report" in pdf_text(response.content)
+    finally:
+        api_routes.SESSION_STORE.pop("pdf-session", None)
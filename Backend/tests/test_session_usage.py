@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from app import api_routes
+from app.core.config import settings
+from app.core.usage import SessionUsage
+from app.services.gemini_service import gemini_service
+
+ANALYSIS = {"feedback": "Nice.", "sentiment_score": 0.5, "technical_accuracy": 0.7, "is_correct": True}
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+        self.usage_metadata = {"input_tokens": 1000, "output_tokens": 500}
+
+class FakeModel:
+    def __init__(self, model, json_mode):
+        self.model = model
+        self.json_mode = json_mode
+
+    async def ainvoke(self, prompt):
+        return Response(json.dumps(ANALYSIS) if self.json_mode else "What is a closure?")
+
+@pytest.fixture
+def client(api_client, stub_tts, monkeypatch):
+    models = []
+
+    def fake_client(model, route, json_mode=False):
+        models.append(model)
+        return FakeModel(model, json_mode)
+
+    monkeypatch.setattr(gemini_service, "_client", fake_client)
+    monkeypatch.setattr(settings, "LLM_HEDGING_ENABLED", False)
+    return api_client, models
+
+def test_usage_is_tracked_per_task(client, make_session):
+    client, _ = client
+    api_routes.SESSION_STORE["s1"] = make_session(usage=SessionUsage(budget_usd=1.0))
+
+    response = client.post("/api/v1/chat", data={"session_id": "s1", "text_input": "Use a dict."})
+    assert response.status_code == 200
+    assert response.json()["audio_url"]
+
+    usage = client.get("/api/v1/sessions/s1/usage").json()
+    assert set(usage["tasks"]) == {"analysis", "question"}
+    assert usage["tasks"]["analysis"]["input_tokens"] == 1000
+    assert usage["output_tokens"] == 1000
+    # gemini-2.0-flash: 1000 input tokens at $0.10/M + 500 output tokens at $0.40/M, twice
+    assert usage["cost_usd"] == pytest.approx(0.0006)
+    assert not usage["over_budget"]
+
+def test_over_budget_session_degrades(client, make_session):
+    client, models = client
+    usage = SessionUsage(budget_usd=0.5)
+    usage.add_llm("report", 0, 0, 0.5)
+    api_routes.SESSION_STORE["s1"] = make_session(usage=usage)
+
+    response = client.post("/api/v1/chat", data={"session_id": "s1", "text_input": "Use a dict."})
+    assert response.status_code == 200
+    assert response.json()["question"] == "What is a closure?"
+    assert response.json()["audio_url"] is None # TTS skipped
+    assert set(models) == {settings.BUDGET_MODEL}
+
+def test_speech_usage_is_priced_per_provider():
+    usage = SessionUsage(budget_usd=None)
+    usage.add_stt("assemblyai", 120)
+    usage.add_tts("elevenlabs", 500)
+    usage.add_tts("gtts", 500)
+    totals = usage.as_dict()
+    assert totals["tasks"]["stt"]["seconds"] == 120
+    assert totals["tasks"]["tts"]["characters"] == 1000
+    assert totals["cost_usd"] == pytest.approx(2 * 0.0062 + 0.5 * 0.30)
+    assert not totals["over_budget"]
+
+def test_unknown_session_usage_is_404(client):
+    client, _ = client
+    assert client.get("/api/v1/sessions/missing/usage").status_code == 404
@@ -0,0 +1,52 @@
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from bench_import_time import profile_imports
+
+def test_provider_sdks_are_not_imported_at_startup():
+    rows, loaded = profile_imports("app.main")
+    assert loaded == []
+    assert any(name == "app.main" for name, _, _ in rows)
+
+def test_liveness_and_readiness(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from app import main
+
+    # No lifespan: startup hasn't run, so the app is live but not ready
+    monkeypatch.setattr(main, "readiness", {"database": False, "warm_up": False})
+    client = TestClient(main.app)
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/health").status_code == 200
+
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    monkeypatch.setattr(main, "readiness", {"database": True, "warm_up": True})
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["database"] is True
+
+def test_services_build_clients_lazily(monkeypatch):
+    from app.core.config import settings
+    from app.services.gemini_service import GeminiService
+    from app.services.voice_service import VoiceService
+
+    monkeypatch.setattr(settings, "ASSEMBLYAI_API_KEY", "")
+    monkeypatch.setattr(settings, "ELEVENLABS_API_KEY", "")
+
+    gemini, voice = GeminiService(), VoiceService()
+    assert not gemini.ready and not voice.ready
+
+    gemini.warm_up()
+    voice.warm_up()
+    assert gemini.ready and voice.ready
+    route = settings.MODEL_ROUTES["question"]
+    assert gemini._client(route.primary, route) is gemini._client(route.primary, route)
+    assert voice.transcriber is None and voice.elevenlabs is None
@@ -0,0 +1,65 @@
+import pytest
+
+from app import api_routes
+from app.core.config import settings
+from app.services.streaming_stt import BufferedStreamingTranscription, StreamingTranscription, register_streaming_backend
+from app.services.voice_service import voice_service
+
+class FakeStreamingTranscription(StreamingTranscription):
+    """Treats every audio chunk as one UTF-8 encoded word."""
+
+    def __init__(self, sample_rate):
+        super().__init__(sample_rate)
+        self.words = []
+
+    async def feed(self, chunk):
+        self.words.append(chunk.decode())
+        self.partial_transcript = " ".join(self.words)
+        return self.partial_transcript
+
+    async def finish(self):
+        return self.partial_transcript
+
+register_streaming_backend("fake", FakeStreamingTranscription)
+
+@pytest.fixture
+def client(api_client, stub_providers, make_session, monkeypatch):
+    monkeypatch.setattr(settings, "STREAMING_STT_BACKEND", "fake")
+    api_routes.SESSION_STORE["s1"] = make_session()
+    return api_client
+
+def test_streaming_partials_then_turn(client):
+    with client.websocket_connect("/api/v1/ws/transcribe/s1") as ws:
+        ws.send_bytes(b"I")
+        assert ws.receive_json() == {"type": "partial", "text": "I"}
+        ws.send_bytes(b"use")
+        ws.send_bytes(b"pytest")
+        assert ws.receive_json()["text"] == "I use"
+        assert ws.receive_json()["text"] == "I use pytest"
+
+        ws.send_json({"type": "stop"})
+        assert ws.receive_json() == {"type": "final", "text": "I use pytest"}
+
+        turn = ws.receive_json()
+        assert turn["type"] == "turn"
+        assert turn["data"]["user_transcript"] == "I use pytest"
+        assert turn["data"]["question"] == "What is a closure?"
+
+    assert api_routes.SESSION_STORE["s1"]["turns"][-1].answer == "I use pytest"
+
+def test_streaming_unknown_session(client):
+    with client.websocket_connect("/api/v1/ws/transcribe/missing") as ws:
+        assert ws.receive_json()["type"] == "error"
+
+@pytest.mark.asyncio
+async def test_unknown_backend_falls_back_to_buffered(monkeypatch):
+    monkeypatch.setattr(settings, "STREAMING_STT_BACKEND", "no-such-backend")
+    stream = await voice_service.open_transcription_stream(16000)
+    assert isinstance(stream, BufferedStreamingTranscription)
+
+def test_backends_must_implement_feed_and_finish():
+    class Incomplete(StreamingTranscription):
+        async def feed(self, chunk):
+            return ""
+    with pytest.raises(TypeError):
+        Incomplete(16000)
@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.schemas import AnswerAnalysis
+from app.services import structured_output
+from app.services.gemini_service import gemini_service
+from app.services.structured_output import StructuredOutputError, parse_structured, repair_json
+
+VALID = {
+    "feedback": "Clear answer.",
+    "sentiment_score": 0.6,
+    "technical_accuracy": 0.8,
+    "suggested_improvement": "Mention complexity.",
+    "is_correct": True
+}
+
+@pytest.mark.parametrize("raw", [
+    # Fenced, with the comments ANALYSIS_SYSTEM_PROMPT shows in its example
+    '```json\n{\n "feedback": "Clear answer.",\n "sentiment_score": 0.6, // -1.0 to 1.0\n'
+    ' "technical_accuracy": 0.8, /* 0..1 */\n "suggested_improvement": "Mention complexity.",\n'
+    ' "is_correct": true // Boolean\n}\n```',
+    # Trailing commas and prose around the object
+    'Here is the analysis: {"feedback": "Clear answer.", "sentiment_score": 0.6, "technical_accuracy": 0.8,'
+    ' "suggested_improvement": "Mention complexity.", "is_correct": true,} Hope this helps!',
+    # Truncated mid-literal: the half-written member is dropped, braces closed
+    '{"feedback": "Clear answer.", "sentiment_score": 0.6, "technical_accuracy": 0.8,'
+    ' "suggested_improvement": "Mention complexity.", "is_correct": true, "extra": tr',
+])
+def test_common_defects_are_repaired_locally(raw):
+    analysis, repaired = parse_structured(raw, AnswerAnalysis)
+    assert repaired
+    assert analysis.model_dump() == VALID
+
+def test_truncated_string_is_closed():
+    repaired = repair_json('{"feedback": "Good but')
+    assert json.loads(repaired) == {"feedback": "Good but"}
+
+def test_comment_markers_inside_strings_are_kept():
+    raw = '{"feedback": "See http://example.com // not a comment",}'
+    assert json.loads(repair_json(raw))["feedback"] == "See http://example.com // not a comment"
+
+def test_scores_are_clamped_and_missing_fields_rejected():
+    analysis, repaired = parse_structured(json.dumps({**VALID, "sentiment_score": 3}), AnswerAnalysis)
+    assert not repaired and analysis.sentiment_score == 1.0
+    with pytest.raises(StructuredOutputError, match="technical_accuracy"):
+        parse_structured('{"feedback": "x", "sentiment_score": 0.1}', AnswerAnalysis)
+
+class FakeLLM:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        class Response:
+            content = self.replies.pop(0)
+        return Response()
+
+@pytest.mark.asyncio
+async def test_reask_only_when_repair_fails(monkeypatch):
+    monkeypatch.setattr(structured_output, "_counts", structured_output.defaultdict(
+        lambda: dict.fromkeys(structured_output.OUTCOMES, 0)
+    ))
+    kwargs = dict(question="Q?", answer="A.", job_role="Engineer", difficulty="Medium")
+
+    llm = FakeLLM(['{"feedback": "Clear answer.", "sentiment_score": 0.6, "technical_accuracy": 0.8, "is_correct": true,}'])
+    monkeypatch.setattr(gemini_service, "_client", lambda model, route, json_mode=False: llm)
+    assert (await gemini_service.analyze_response(**kwargs))["technical_accuracy"] == 0.8
+    assert len(llm.prompts) == 1
+
+    llm = FakeLLM(['{"feedback": "Clear answer."}', json.dumps(VALID)])
+    monkeypatch.setattr(gemini_service, "_client", lambda model, route, json_mode=False: llm)
+    assert await gemini_service.analyze_response(**kwargs) == VALID
+    assert len(llm.prompts) == 2
+    assert "sentiment_score: Field required" in llm.prompts[1]
+
+    llm = FakeLLM(["not json", "still not json"])
+    monkeypatch.setattr(gemini_service, "_client", lambda model, route, json_mode=False: llm)
+    assert "error" in await gemini_service.analyze_response(**kwargs)
+
+    stats = structured_output.stats()["AnswerAnalysis"]
+    assert (stats["repaired"], stats["reasked"], stats["failed"]) == (1, 1, 1)
+    assert stats["repair_rate"] == pytest.approx(1 / 3)
@@ -0,0 +1,85 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services.tts_stream import TTSStreamManager, split_sentences, tts_streams
+from app.services.voice_service import voice_service
+
+def test_split_sentences_merges_short_sentences():
+    text = "Tell me about yourself. Why this role? What is a mutex and when would you use one over a semaphore?"
+    assert split_sentences(text, 1000) == [text]
+    segments = split_sentences(text, 20)
+    assert segments == [
+        "Tell me about yourself.",
+        "Why this role? What is a mutex and when would you use one over a semaphore?",
+    ]
+
+async def fake_stream_audio(text, provider=None):
+    # Later segments finish first; output must still be in order
+    await asyncio.sleep(0.05 if text.startswith("First") else 0.0)
+    for word in text.split():
+        yield word.encode() + b"|"
+
+@pytest.mark.asyncio
+async def test_stream_emits_segments_in_order_and_persists(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(voice_service, "stream_audio", fake_stream_audio)
+    monkeypatch.setattr(voice_service, "tts_provider", lambda: "tts.gtts")
+    monkeypatch.setattr(settings, "TTS_MIN_SEGMENT_CHARS", 10)
+
+    manager = TTSStreamManager()
+    audio_id = manager.start("First sentence here. Second sentence here.")
+    assert manager.start("First sentence here. Second sentence here.") == audio_id
+
+    chunks = [c async for c in manager.get(audio_id).iter_chunks()]
+    assert b"".join(chunks) == b"First|sentence|here.|Second|sentence|here.|"
+    with open(manager.path_for(audio_id), "rb") as f:
+        assert f.read() == b"".join(chunks)
+
+@pytest.mark.asyncio
+async def test_one_provider_voices_a_question_and_keys_its_audio(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "TTS_MIN_SEGMENT_CHARS", 10)
+    used = []
+    async def stream_audio(text, provider=None):
+        used.append(provider)
+        yield b"ID3"
+    monkeypatch.setattr(voice_service, "stream_audio", stream_audio)
+
+    manager = TTSStreamManager()
+    text = "First sentence here. Second sentence here."
+    monkeypatch.setattr(voice_service, "tts_provider", lambda: "tts.elevenlabs")
+    primary = manager.start(text)
+    await manager.get(primary).wait_done()
+    assert used == ["tts.elevenlabs", "tts.elevenlabs"]
+
+    # Fallback audio gets its own ID instead of being cached under the primary voice
+    monkeypatch.setattr(voice_service, "tts_provider", lambda: "tts.gtts")
+    assert manager.start(text) != primary
+
+    monkeypatch.setattr(voice_service, "tts_provider", lambda: None)
+    assert manager.start(text) is None
+
+def test_audio_endpoint_supports_ranges(api_client):
+    client = api_client
+    audio_id = "a" * 32
+    os.makedirs(os.path.dirname(tts_streams.path_for(audio_id)))
+    with open(tts_streams.path_for(audio_id), "wb") as f:
+        f.write(bytes(range(100)))
+
+    full = client.get(f"/api/v1/audio/{audio_id}")
+    assert full.status_code == 200
+    assert full.headers["accept-ranges"] == "bytes"
+
+    partial = client.get(f"/api/v1/audio/{audio_id}", headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == bytes(range(10, 20))
+    assert partial.headers["content-range"] == "bytes 10-19/100"
+
+    suffix = client.get(f"/api/v1/audio/{audio_id}", headers={"Range": "bytes=-5"})
+    assert suffix.content == bytes(range(95, 100))
+
+    assert client.get(f"/api/v1/audio/{audio_id}", headers={"Range": "bytes=200-"}).status_code == 416
+    assert client.get("/api/v1/audio/../../etc/passwd").status_code == 404
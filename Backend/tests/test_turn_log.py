@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.agents.interview_graph import analyze_answer_node, generate_follow_up_node
+from app.agents.turn_log import Turn, TurnLog
+from app.services.gemini_service import gemini_service
+
+def test_history_and_records_are_derived_from_turns():
+    log = TurnLog()
+    log.append(Turn("What is a tuple?", "An immutable list.", {"feedback": "Good."}, 1))
+
+    assert log.history() == ["Question: What is a tuple?\nAnswer: An immutable list.\nFeedback: Good."]
+    assert log.records() == [{
+        "question": "What is a tuple?",
+        "answer": "An immutable list.",
+        "analysis": {"feedback": "Good."},
+        "question_num": 1
+    }]
+    assert not hasattr(log[0], "__dict__")
+
+@pytest.mark.asyncio
+async def test_answer_is_stored_once(monkeypatch):
+    async def fake_analyze(**kwargs):
+        return {"feedback": "Vague.", "sentiment_score": 0.5}
+
+    async def fake_followup(target_company, question, answer):
+        return f"Why '{answer}'?"
+
+    monkeypatch.setattr(gemini_service, "analyze_response", fake_analyze)
+    monkeypatch.setattr(gemini_service, "generate_followup_question", fake_followup)
+
+    state = {
+        "turns": TurnLog(),
+        "pending_answer": "Use a cache.",
+        "current_question": "How to scale reads?",
+        "current_question_num": 1,
+        "follow_up_count": 0,
+        "job_role": "Engineer",
+        "difficulty": "Medium",
+        "target_company": "Google"
+    }
+    state = await analyze_answer_node(state)
+    assert state["pending_answer"] is None
+    assert len(state["turns"]) == 1
+    assert state["turns"][-1].analysis["feedback"] == "Vague."
+
+    state = await generate_follow_up_node(state)
+    assert state["current_question"] == "Why 'Use a cache.'?"
+    assert "messages" not in state and "history" not in state
@@ -0,0 +1,65 @@
+import os
+import sys
+import warnings
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+# The legacy modules use package-relative imports: import them as Backend.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+from Backend.services import vector_store
+
+class CountingEmbeddings:
+    """Deterministic 8-d vectors; records every batch it is asked to embed."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, input):
+        self.batches.append(list(input))
+        return [[float(b) for b in text.encode()[:8].ljust(8, b"\0")] for text in input]
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    fake = CountingEmbeddings()
+    client = chromadb.EphemeralClient()
+    monkeypatch.setattr(vector_store, "get_chroma_client", lambda: client)
+    monkeypatch.setitem(vector_store.EMBEDDING_BACKENDS, "counting", lambda api_key: fake)
+    monkeypatch.setattr(vector_store.settings, "EMBEDDING_BACKEND", "counting")
+    vector_store.get_embedding_function.cache_clear()
+    vector_store._collections.clear()
+    yield fake
+    vector_store.get_embedding_function.cache_clear()
+    vector_store._collections.clear()
+
+def test_batched_ingest_reuses_handle_and_cache(embeddings):
+    docs = [f"doc {i}" for i in range(5)]
+    vector_store.add_documents("batches", docs, [{"i": i} for i in range(5)], [f"a{i}" for i in range(5)], "key", batch_size=2)
+    assert [len(batch) for batch in embeddings.batches] == [2, 2, 1]
+    assert vector_store.get_collection("batches", "key") is vector_store.get_collection("batches", "key")
+
+    # Same texts under new ids: nothing is re-embedded
+    vector_store.add_documents("batches", docs, None, [f"b{i}" for i in range(5)], "key", batch_size=2)
+    assert len(embeddings.batches) == 3
+    assert vector_store.get_collection("batches", "key").count() == 10
+
+    result = vector_store.query_documents("batches", "doc 3", n_results=2, api_key="key")
+    assert set(result["ids"][0]) == {"a3", "b3"}
+    assert len(embeddings.batches) == 3 # The query text was embedded at ingest
+    vector_store.query_documents("batches", "doc 9", n_results=1, api_key="key")
+    assert embeddings.batches[-1] == ["doc 9"]
+
+def test_cache_is_bounded_and_dedupes_within_a_batch(embeddings):
+    cached = vector_store.CachedEmbeddingFunction(embeddings, key="counting:test", maxsize=2)
+    vectors = cached(["x", "y", "x", "z"])
+    assert embeddings.batches == [["x", "y", "z"]]
+    assert list(vectors[0]) == list(vectors[2])
+    assert len(cached._cache) == 2
+
+    cached(["z", "x"]) # "x" was evicted
+    assert embeddings.batches[-1] == ["x"]
+    assert (cached.hits, cached.misses) == (2, 4)
@@ -1,5 +1,6 @@
 import requests
 import os
+import time
 
 API_URL = "http://localhost:8000/api/v1"
 
@@ -22,8 +23,13 @@ def test_video_analysis():
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
-        if response.status_code == 200:
-            print("✅ Video Analysis Endpoint reachable.")
+        if response.status_code == 202:
+            print("✅ Video Analysis Job queued.")
+            job = response.json()
+            while job["status"] in ("queued", "running"):
+                time.sleep(2)
+                job = requests.get(f"{API_URL}/analyze_video/{job['job_id']}").json()
+            print(f"Job finished: {job}")
         else:
              # It might fail analysis content-wise (fake video), but 500 or 200 is "handled"
              # If API key is missing, it returns specific message
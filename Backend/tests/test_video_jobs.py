@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.core.config import settings
+from app.services.gemini_service import gemini_service
+from app.services.provider_clients import provider_clients
+from app.services.video_jobs import JobQueueFull, JobStatus, VideoJobManager
+from app.services.video_preprocessing import video_preprocessor
+
+async def wait_for_status(manager, job_id, statuses, timeout=2.0):
+    async def poll():
+        while manager.get(job_id).status not in statuses:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+    return manager.get(job_id)
+
+def make_video(tmp_path, name="clip.mp4"):
+    path = tmp_path / name
+    path.write_bytes(b"fake video")
+    return str(path)
+
+@pytest.mark.asyncio
+async def test_job_completes_and_removes_upload(tmp_path, monkeypatch):
+    async def fake_analyze(path):
+        return f"analyzed {os.path.basename(path)}"
+    monkeypatch.setattr(gemini_service, "analyze_video_behavior", fake_analyze)
+
+    manager = VideoJobManager()
+    path = make_video(tmp_path)
+    job = manager.submit(path)
+    assert job.status == JobStatus.QUEUED
+
+    job = await wait_for_status(manager, job.job_id, {JobStatus.COMPLETED})
+    assert job.as_dict()["analysis"] == "analyzed clip.mp4"
+    assert not os.path.exists(path)
+    await manager.stop()
+
+@pytest.mark.asyncio
+async def test_cancel_running_and_queued_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VIDEO_JOB_WORKERS", 1)
+    started = asyncio.Event()
+
+    async def slow_analyze(path):
+        started.set()
+        await asyncio.sleep(10)
+    monkeypatch.setattr(gemini_service, "analyze_video_behavior", slow_analyze)
+
+    manager = VideoJobManager()
+    running = manager.submit(make_video(tmp_path, "a.mp4"))
+    queued = manager.submit(make_video(tmp_path, "b.mp4"))
+    await asyncio.wait_for(started.wait(), 1)
+
+    assert manager.cancel(queued.job_id).status == JobStatus.CANCELLED
+    manager.cancel(running.job_id)
+    await wait_for_status(manager, running.job_id, {JobStatus.CANCELLED})
+    assert not os.listdir(tmp_path)
+    await manager.stop()
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VIDEO_JOB_WORKERS", 0)
+    monkeypatch.setattr(settings, "VIDEO_JOB_QUEUE_SIZE", 1)
+    manager = VideoJobManager()
+    manager.submit(make_video(tmp_path, "a.mp4"))
+    with pytest.raises(JobQueueFull):
+        manager.submit(make_video(tmp_path, "b.mp4"))
+    await manager.stop()
+
+@pytest.mark.asyncio
+async def test_full_upload_polls_with_backoff_and_deletes_remote_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_API_KEY", "test")
+    monkeypatch.setattr(settings, "VIDEO_POLL_INITIAL_DELAY_S", 0.001)
+    states = iter(["PROCESSING", "PROCESSING", "FAILED"])
+    deleted = []
+
+    def file_handle():
+        return SimpleNamespace(name="files/abc", state=SimpleNamespace(name=next(states)))
+
+    fake_genai = SimpleNamespace(
+        upload_file=lambda path: file_handle(),
+        get_file=lambda name: file_handle(),
+        delete_file=deleted.append,
+    )
+    monkeypatch.setattr(provider_clients, "genai", lambda: fake_genai)
+    monkeypatch.setattr(provider_clients, "gemini_model", lambda name: None)
+
+    with pytest.raises(ValueError, match="processing failed"):
+        await gemini_service._analyze_full_video(make_video(tmp_path))
+    assert deleted == ["files/abc"]
+
+@pytest.mark.asyncio
+async def test_provider_failure_fails_the_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_API_KEY", "")
+    async def no_keyframes(path):
+        raise RuntimeError("no frames")
+    monkeypatch.setattr(video_preprocessor, "extract", no_keyframes)
+
+    manager = VideoJobManager()
+    job = manager.submit(make_video(tmp_path))
+    job = await wait_for_status(manager, job.job_id, {JobStatus.COMPLETED, JobStatus.FAILED})
+    assert job.status == JobStatus.FAILED
+    assert "GOOGLE_API_KEY" in job.error
+    await manager.stop()
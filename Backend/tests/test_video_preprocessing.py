@@ -0,0 +1,77 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from app.services.video_preprocessing import Keyframe, dhash, extract_keyframes, hamming, select_evenly
+
+cv2 = pytest.importorskip("cv2")
+
+def gradient(width: int, height: int, horizontal: bool) -> np.ndarray:
+    ramp = np.linspace(0, 255, width if horizontal else height, dtype=np.uint8)
+    gray = np.tile(ramp, (height, 1)) if horizontal else np.tile(ramp[:, None], (1, width))
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+def write_video(path: str, scenes, fps: int = 10, seconds_per_scene: int = 4):
+    height, width = scenes[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    rng = np.random.default_rng(0)
+    for scene in scenes:
+        for _ in range(fps * seconds_per_scene):
+            # Sensor noise should not defeat deduplication
+            noise = rng.integers(0, 3, scene.shape, dtype=np.uint8)
+            writer.write(cv2.add(scene, noise))
+    writer.release()
+
+def test_dhash_distinguishes_images():
+    a = cv2.cvtColor(gradient(9, 8, True), cv2.COLOR_BGR2GRAY)
+    b = cv2.cvtColor(gradient(9, 8, True)[:, ::-1], cv2.COLOR_BGR2GRAY)
+    assert hamming(dhash(a), dhash(a)) == 0
+    assert hamming(dhash(a), dhash(b)) > 32
+
+def test_extract_keyframes_dedupes_and_downscales(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, [gradient(640, 480, True), gradient(640, 480, False)])
+
+    result = extract_keyframes(path, fps=1.0, max_width=320, jpeg_quality=70, max_frames=24, dedupe_distance=6)
+
+    assert result.sampled == 8
+    assert [round(f.timestamp) for f in result.frames] == [0, 4]
+    assert result.uploaded_bytes < result.original_bytes
+    thumb = cv2.imdecode(np.frombuffer(result.frames[0].jpeg, np.uint8), cv2.IMREAD_COLOR)
+    assert thumb.shape[1] == 320
+
+def test_select_evenly_caps_frame_count():
+    frames = [Keyframe(float(i), b"", i) for i in range(10)]
+    picked = select_evenly(frames, 3)
+    assert [f.timestamp for f in picked] == [0.0, 4.0, 9.0]
+
+@pytest.mark.asyncio
+async def test_analysis_sends_only_keyframes(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.services.gemini_service import gemini_service
+
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, [gradient(640, 480, True), gradient(640, 480, False)])
+    monkeypatch.setattr(settings, "VIDEO_PREPROCESS_WORKERS", 0)
+    monkeypatch.setattr(settings, "VIDEO_KEYFRAME_FPS", 1.0)
+
+    sent = []
+    class FakeLLM:
+        async def ainvoke(self, messages):
+            sent.extend(messages)
+            class Response:
+                content = "Calm and confident."
+            return Response()
+
+    monkeypatch.setattr(gemini_service, "_client", lambda model, route, json_mode=False: FakeLLM())
+    assert await gemini_service.analyze_video_behavior(path) == "Calm and confident."
+
+    images = [part for part in sent[0]["content"] if part["type"] == "image_url"]
+    assert len(images) == 2
+    assert images[0]["image_url"]["url"].startswith("data:image/jpeg;base64,")
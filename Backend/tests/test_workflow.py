@@ -9,15 +9,15 @@ sys.path.append(os.path.join(os.getcwd(), '..'))
 load_dotenv()
 
 from app.agents.interview_graph import workflow, InterviewState
-from langchain_core.messages import HumanMessage
+from app.agents.turn_log import TurnLog
 
 async def simulate_interview():
     print("--- Starting Simulation ---")
     
     # Initialize State
     initial_state = {
-        "messages": [],
-        "history": [],
+        "turns": TurnLog(),
+        "pending_answer": None,
         "current_question": None,
         "current_question_num": 0,
         "total_questions": 2, # Short for testing
@@ -25,8 +25,7 @@ async def simulate_interview():
         "interview_style": "Visual, Friendly", # Test new style
         "job_role": "Senior Python Engineer",
         "difficulty": "Medium",
-        "topic": "System Design",
-        "analysis_data": []
+        "topic": "System Design"
     }
     
     app = workflow.compile()
@@ -58,7 +57,7 @@ async def simulate_interview():
     print(f"\nUser: {answer1}")
     
     # Update state manually to inject answer (simulating API payload)
-    state["messages"].append(HumanMessage(content=answer1))
+    state["pending_answer"] = answer1
     
     # 3. Analyze Answer 1
     # We need to continue the graph. 
@@ -72,7 +71,7 @@ async def simulate_interview():
     
     print("\n[AI] Analyzing Q1...")
     state = await analyze_answer_node(state)
-    print("Feedback:", state["history"][-1])
+    print("Feedback:", state["turns"].history()[-1])
     
     # 4. Route
     next_step = route_interview(state)
@@ -86,11 +85,11 @@ async def simulate_interview():
         # 5. User Answer Q2
         answer2 = "I'm not sure, maybe hash maps?"
         print(f"\nUser: {answer2}")
-        state["messages"].append(HumanMessage(content=answer2))
+        state["pending_answer"] = answer2
         
         print("\n[AI] Analyzing Q2...")
         state = await analyze_answer_node(state)
-        print("Feedback:", state["history"][-1])
+        print("Feedback:", state["turns"].history()[-1])
         
         next_step = route_interview(state)
         print(f"Next step: {next_step}")
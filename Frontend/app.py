@@ -1,10 +1,9 @@
 import streamlit as st
-import requests
-import json
-import time
 
 import os
 
+from backend_client import BackendClient, BackendError
+
 # Configuration
 API_URL = "http://localhost:8000/api/v1"
 
@@ -28,6 +27,17 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_backend(api_url: str) -> BackendClient:
+    # One pooled client per server process, reused across reruns and sessions
+    return BackendClient(api_url)
+
+backend = get_backend(API_URL)
+
+# Chat rendering: the latest messages in full, older ones collapsed and paginated
+RECENT_MESSAGES = 6
+HISTORY_PAGE_SIZE = 10
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -60,6 +70,10 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "interview_active" not in st.session_state:
     st.session_state.interview_active = False
+if "report_pending" not in st.session_state:
+    st.session_state.report_pending = False
+if "autoplayed" not in st.session_state:
+    st.session_state.autoplayed = set() # Audio URLs that already played once
 
 def start_interview(company, role, style, difficulty, max_follow_ups):
     payload = {
@@ -70,9 +84,7 @@ def start_interview(company, role, style, difficulty, max_follow_ups):
         "max_follow_ups": max_follow_ups
     }
     try:
-        response = requests.post(f"{API_URL}/start", json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = backend.start(payload)
         
         st.session_state.session_id = data["session_id"]
         st.session_state.interview_active = True
@@ -84,6 +96,13 @@ def start_interview(company, role, style, difficulty, max_follow_ups):
     except Exception as e:
         st.error(f"Failed to start interview: {e}")
 
+def feedback_text(feedback_data) -> str:
+    # feedback_data is likely a dict or string depending on Gemini's JSON output
+    # Let's extract a friendly message.
+    if isinstance(feedback_data, dict):
+        return feedback_data.get("feedback", "")
+    return str(feedback_data) if feedback_data else ""
+
 def send_response(text_input, audio_file=None):
     if not st.session_state.session_id:
         return
@@ -94,63 +113,52 @@ def send_response(text_input, audio_file=None):
     elif audio_file:
          st.session_state.messages.append({"role": "user", "content": "🎤 Audio Response Sent"})
 
-    with st.spinner("Interviewer is thinking..."):
-        try:
-            files = None
-            data = {"session_id": st.session_state.session_id}
-            
-            if audio_file:
-                files = {"audio_file": ("answer.wav", audio_file, "audio/wav")}
-            if text_input:
-                data["text_input"] = text_input
-
-            response = requests.post(f"{API_URL}/chat", data=data, files=files)
-            response.raise_for_status()
-            result = response.json()
-            
-            # Update User Message with Transcript
-            if result.get("user_transcript"):
-                # If the last message was the placeholder, update it
-                if st.session_state.messages and st.session_state.messages[-1]["role"] == "user":
-                     st.session_state.messages[-1]["content"] = f"🎤 {result['user_transcript']}"
-
-            # Display Feedback from Interviewer
-            if result.get("feedback"):
-                feedback_data = result["feedback"]
-                # feedback_data is likely a dict or string depending on Gemini's JSON output
-                # Let's extract a friendly message.
-                feedback_text = ""
-                if isinstance(feedback_data, dict):
-                    feedback_text = feedback_data.get("feedback", "")
-                else:
-                    feedback_text = str(feedback_data)
-                
-                if feedback_text:
-                    st.session_state.messages.append({"role": "assistant", "content": f"**Feedback:** {feedback_text}"})
-
-            if result.get("question"):
-                st.session_state.messages.append({"role": "assistant", "content": result["question"], "audio_url": result.get("audio_url")})
-            
-            if result.get("is_finished"):
-                st.session_state.interview_active = False
-                st.session_state.messages.append({"role": "system", "content": "Interview Complete. Generating Report..."})
-                # Fetch Report
-                report_res = requests.get(f"{API_URL}/report/{st.session_state.session_id}")
-                if report_res.status_code == 200:
-                    report_data = report_res.json()
-                    st.session_state.final_report = report_data.get("report")
+    with chat_container:
+        with st.chat_message("user"):
+            user_placeholder = st.empty()
+            user_placeholder.write(st.session_state.messages[-1]["content"])
 
-            st.rerun()
+    # Render the turn as the backend streams it: transcript, feedback, then the question text
+    question_placeholder = None
+    question_text = ""
+    try:
+        with st.spinner("Interviewer is thinking..."):
+            for event in backend.chat_stream(st.session_state.session_id, text_input, audio_file):
+                if event["type"] == "transcript" and audio_file:
+                    # Replace the placeholder with what was heard
+                    st.session_state.messages[-1]["content"] = f"🎤 {event['text']}"
+                    user_placeholder.write(st.session_state.messages[-1]["content"])
+
+                elif event["type"] == "feedback":
+                    text = feedback_text(event["feedback"])
+                    if text:
+                        st.session_state.messages.append({"role": "assistant", "content": f"**Feedback:** {text}"})
+                        with chat_container:
+                            st.chat_message("assistant").write(f"**Feedback:** {text}")
+
+                elif event["type"] == "question_delta":
+                    if question_placeholder is None:
+                        with chat_container:
+                            question_placeholder = st.chat_message("assistant").empty()
+                    question_text += event["text"]
+                    question_placeholder.markdown(question_text + "▌")
 
-        except requests.exceptions.HTTPError as err:
-            # Try to get detailed error from backend
-            try:
-                error_detail = err.response.json().get("detail", err.response.text)
-                st.error(f"Backend Error: {error_detail}")
-            except:
-                st.error(f"HTTP Error: {err}")
-        except Exception as e:
-            st.error(f"Error sending message: {e}")
+                elif event["type"] == "question":
+                    if question_placeholder is not None:
+                        question_placeholder.markdown(event["text"])
+                    st.session_state.messages.append({"role": "assistant", "content": event["text"], "audio_url": event.get("audio_url")})
+
+                elif event["type"] == "done" and event["response"].get("is_finished"):
+                    st.session_state.interview_active = False
+                    st.session_state.report_pending = True
+                    st.session_state.messages.append({"role": "system", "content": "Interview Complete. Generating Report..."})
+
+        st.rerun()
+
+    except BackendError as err:
+        st.error(f"Backend Error: {err.detail}")
+    except Exception as e:
+        st.error(f"Error sending message: {e}")
 
 # --- Sidebar ---
 with st.sidebar:
@@ -189,21 +197,14 @@ with st.sidebar:
                             "difficulty": difficulty,
                             "max_follow_ups": max_follow_ups
                         }
-                        response = requests.post(f"{API_URL}/start_with_resume", data=data, files=files)
-                        response.raise_for_status()
-                        res_data = response.json()
+                        res_data = backend.start_with_resume(data, files)
                         
                         st.session_state.session_id = res_data["session_id"]
                         st.session_state.interview_active = True
                         st.session_state.messages = [{"role": "assistant", "content": res_data["first_question"]}]
                         st.rerun()
-                except requests.exceptions.HTTPError as e:
-                    error_msg = "Unknown Error"
-                    try:
-                        error_msg = e.response.json().get("detail", str(e))
-                    except:
-                        error_msg = str(e)
-                    st.error(f"Failed to start with resume: {error_msg}")
+                except BackendError as e:
+                    st.error(f"Failed to start with resume: {e.detail}")
                 except Exception as e:
                     st.error(f"Failed to start with resume: {e}")
             else:
@@ -227,16 +228,53 @@ st.title("AI Interview Session")
 # Chat Container
 chat_container = st.container()
 
+def render_message(msg, with_audio=True):
+    with st.chat_message(msg["role"]):
+        st.write(msg["content"])
+        if with_audio and msg.get("audio_url"):
+            render_audio(msg["audio_url"])
+
+def render_audio(audio_url):
+    # Autoplay once, for the newest question only; reruns show a silent player
+    autoplay = (
+        audio_url == latest_audio_url
+        and audio_url not in st.session_state.autoplayed
+    )
+    # The browser streams it straight from the backend (immutable, cacheable), not via Streamlit
+    st.audio(backend.absolute_url(audio_url), format="audio/mpeg", autoplay=autoplay)
+    if autoplay:
+        st.session_state.autoplayed.add(audio_url)
+
+messages = st.session_state.messages
+latest_audio_url = next((m["audio_url"] for m in reversed(messages) if m.get("audio_url")), None)
+older, recent = messages[:-RECENT_MESSAGES], messages[-RECENT_MESSAGES:]
+
 with chat_container:
-    for msg in st.session_state.messages:
-        with st.chat_message(msg["role"]):
-            st.write(msg["content"])
-            if msg.get("audio_url"):
-                # Construct full URL - ensure backend port is reachable
-                # In docker/prod this needs proper handling. 
-                # For local: http://localhost:8000 + url
-                audio_full_url = f"http://localhost:8000{msg['audio_url']}"
-                st.audio(audio_full_url, autoplay=True)
+    if older:
+        with st.expander(f"Earlier in this interview ({len(older)} messages)"):
+            pages = (len(older) + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+            page = pages
+            if pages > 1:
+                page = st.number_input("Page", min_value=1, max_value=pages, value=pages, key="history_page")
+            for msg in older[(page - 1) * HISTORY_PAGE_SIZE:page * HISTORY_PAGE_SIZE]:
+                render_message(msg, with_audio=False)
+    for msg in recent:
+        render_message(msg)
+
+# Report: generated in the background once the interview ends; poll until ready
+if st.session_state.report_pending:
+    with st.spinner("Generating your report..."):
+        try:
+            report = backend.wait_for_report(st.session_state.session_id, timeout=10)
+        except BackendError as err:
+            st.session_state.report_pending = False
+            st.error(f"Report generation failed: {err.detail}")
+        else:
+            if report:
+                st.session_state.final_report = report
+                st.session_state.report_pending = False
+            # Rerun between polls so the page stays interactive
+            st.rerun()
 
 # Input Area (Fixed at bottom)
 if st.session_state.interview_active:
@@ -267,9 +305,11 @@ if st.session_state.interview_active:
                     with st.spinner("Analyzing Video..."):
                         try:
                             video_files = {"video_file": ("video.mp4", uploaded_video, "video/mp4")}
-                            res = requests.post(f"{API_URL}/analyze_video", files=video_files)
-                            if res.status_code == 200:
-                                analysis = res.json().get("analysis")
+                            job = backend.submit_video(video_files)
+                            # Analysis runs as a background job; poll until it settles
+                            job = backend.wait_for_video_job(job["job_id"])
+                            if job["status"] == "completed":
+                                analysis = job.get("analysis")
                                 st.success("Video Analyzed!")
                                 st.info(analysis)
                                 # Append to chat as system note
@@ -0,0 +1,144 @@
+"""
+HTTP client for the TalentTalk Pro backend.
+
+One pooled `requests.Session` per API URL (keep-alive across Streamlit reruns),
+explicit connect/read timeouts on every call, and retries with backoff for
+connection errors and 502/503/504 on idempotent requests.
+"""
+import json
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CONNECT_TIMEOUT = 5 # seconds
+READ_TIMEOUT = 120 # LLM calls and transcription can be slow
+POOL_SIZE = 10
+RETRIES = 3
+
+class BackendError(Exception):
+    """The backend answered with an error (HTTP status or an error event in a stream)."""
+
+    def __init__(self, detail: str, status_code: Optional[int] = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+class BackendClient:
+    def __init__(self, api_url: str, pool_size: int = POOL_SIZE, retries: int = RETRIES):
+        self.api_url = api_url.rstrip("/")
+        parts = urlsplit(self.api_url)
+        self.base_url = f"{parts.scheme}://{parts.netloc}" # For backend-relative URLs like /api/v1/audio/...
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+        # POSTs are not idempotent: only retried when the connection was never made
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "DELETE"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # session_id -> (ETag, report): reruns revalidate instead of downloading the report again
+        self._reports: Dict[str, Tuple[str, str]] = {}
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.api_url}{path}", **kwargs)
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            response.close()
+            raise BackendError(str(detail), response.status_code)
+        return response
+
+    def absolute_url(self, url: str) -> str:
+        return url if urlsplit(url).scheme else f"{self.base_url}{url}"
+
+    # --- Interview ---
+
+    def start(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._request("POST", "/start", json=payload).json()
+
+    def start_with_resume(self, data: Dict[str, Any], files: Dict[str, Any]) -> Dict[str, Any]:
+        return self._request("POST", "/start_with_resume", data=data, files=files).json()
+
+    def chat(self, session_id: str, text_input: str = None, audio_file=None) -> Dict[str, Any]:
+        data, files = self._answer(session_id, text_input, audio_file)
+        return self._request("POST", "/chat", data=data, files=files).json()
+
+    def chat_stream(self, session_id: str, text_input: str = None, audio_file=None) -> Iterator[Dict[str, Any]]:
+        """Yields the events of POST /chat/stream as they arrive (transcript, feedback,
+        question_delta, question, done). Raises BackendError on an error event."""
+        data, files = self._answer(session_id, text_input, audio_file)
+        response = self._request("POST", "/chat/stream", data=data, files=files, stream=True)
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["type"] == "error":
+                    raise BackendError(event.get("detail", "Chat Error"))
+                yield event
+
+    @staticmethod
+    def _answer(session_id: str, text_input: str, audio_file):
+        data = {"session_id": session_id}
+        files = None
+        if audio_file:
+            files = {"audio_file": ("answer.wav", audio_file, "audio/wav")}
+        if text_input:
+            data["text_input"] = text_input
+        return data, files
+
+    def get_report(self, session_id: str) -> Optional[str]:
+        """The final report, or None while it is still being generated."""
+        cached = self._reports.get(session_id)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self._request("GET", f"/report/{session_id}", headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        report = response.json().get("report")
+        if report and response.headers.get("ETag"):
+            self._reports[session_id] = (response.headers["ETag"], report)
+        return report
+
+    def wait_for_report(self, session_id: str, timeout: float = 180, interval: float = 1.0, max_interval: float = 5.0) -> Optional[str]:
+        """Polls GET /report with backoff until the report is ready (None on timeout)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            report = self.get_report(session_id)
+            if report or time.monotonic() + interval > deadline:
+                return report
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+
+    # --- Video ---
+
+    def submit_video(self, files: Dict[str, Any]) -> Dict[str, Any]:
+        return self._request("POST", "/analyze_video", files=files).json()
+
+    def get_video_job(self, job_id: str) -> Dict[str, Any]:
+        return self._request("GET", f"/analyze_video/{job_id}").json()
+
+    def wait_for_video_job(self, job_id: str, timeout: float = 600, interval: float = 2.0) -> Dict[str, Any]:
+        """Polls the analysis job until it leaves queued/running (or the timeout passes)."""
+        deadline = time.monotonic() + timeout
+        job = self.get_video_job(job_id)
+        while job["status"] in ("queued", "running") and time.monotonic() < deadline:
+            time.sleep(interval)
+            job = self.get_video_job(job_id)
+        return job